@@ -0,0 +1,75 @@
+"""obj2gltf（Node.js サブプロセス）と native（Python/NumPy）変換の比較ベンチマーク。
+
+使い方:
+    uv run python -m benchmarks.compare_converters --sizes 1000 100000 --repeat 5
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+from src.infrastructure.converters.factory import create_converter
+
+
+# -- 格子状メッシュの OBJ を生成 --------------
+def write_grid_obj(path: str, quads: int):
+    side = max(int(quads**0.5), 1)
+    n = side + 1
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(n):
+            f.writelines(f"v {j} {i} 0\n" for j in range(n))
+        for i in range(n):
+            f.writelines(f"vt {j / side} {i / side}\n" for j in range(n))
+        f.write("vn 0 0 1\n")
+        for i in range(side):
+            for j in range(side):
+                a = i * n + j + 1
+                b, c, d = a + 1, a + n + 1, a + n
+                f.write(f"f {a}/{a}/1 {b}/{b}/1 {c}/{c}/1 {d}/{d}/1\n")
+    return side * side * 2
+
+
+def measure(backend: str, input_path: str, output_path: str, repeat: int):
+    converter = create_converter(backend)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        converter.convert(input_path, output_path, binary=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 50_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    backends = ["native"]
+    if shutil.which("obj2gltf"):
+        backends.append("obj2gltf")
+    else:
+        print("obj2gltf が見つからないため native のみ計測します")
+
+    print(f"{'backend':<10}{'triangles':>12}{'median[s]':>12}{'tri/s':>14}{'MB':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            input_path = os.path.join(tmp, f"grid_{size}.obj")
+            triangles = write_grid_obj(input_path, size)
+            for backend in backends:
+                output_path = os.path.join(tmp, f"grid_{size}_{backend}.glb")
+                median = statistics.median(
+                    measure(backend, input_path, output_path, args.repeat)
+                )
+                megabytes = os.path.getsize(output_path) / 1024**2
+                print(
+                    f"{backend:<10}{triangles:>12}{median:>12.3f}"
+                    f"{triangles / median:>14.0f}{megabytes:>8.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
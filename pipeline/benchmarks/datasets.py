@@ -0,0 +1,133 @@
+"""ベンチマーク用の合成 OBJ/MTL データセット。
+
+起伏のある格子メッシュを行ごとにマテリアルで塗り分けて書き出す。
+隣り合う 2 つの四角形を六角形 1 面にまとめることで n-gon の割合を変えられる
+（分割後の三角形数は変わらない）。
+"""
+
+import os
+from dataclasses import asdict, dataclass
+
+import numpy as np
+from PIL import Image
+
+# 1 回の書き込みにまとめる格子の行数
+ROWS_PER_BLOCK = 64
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    # triangles: 目安の三角形数（格子の一辺は偶数に切り上げる）
+    # materials: マテリアル数（格子を行方向の帯に分けて割り当てる）
+    # ngon_ratio: 六角形にまとめる四角形ペアの割合（0.0 - 1.0）
+    # textures: テクスチャを持つマテリアル数、texture_size: その一辺の画素数
+    triangles: int
+    materials: int = 1
+    ngon_ratio: float = 0.0
+    textures: int = 0
+    texture_size: int = 512
+    seed: int = 0
+
+    @property
+    def name(self) -> str:
+        return (
+            f"grid_{self.triangles}_m{self.materials}"
+            f"_n{round(self.ngon_ratio * 100)}_t{self.textures}"
+        )
+
+    @property
+    def side(self) -> int:
+        side = max(int((self.triangles / 2) ** 0.5), 2)
+        return side + side % 2
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, **asdict(self)}
+
+
+def _heights(x: np.ndarray, y: np.ndarray, side: int) -> np.ndarray:
+    return 0.05 * side * np.sin(x * 6.0 / side) * np.cos(y * 4.0 / side)
+
+
+def _write_vertices(f, side: int):
+    n = side + 1
+    for start in range(0, n, ROWS_PER_BLOCK):
+        y, x = np.mgrid[start : min(start + ROWS_PER_BLOCK, n), 0:n].astype(float)
+        block = np.stack([x, y, _heights(x, y, side)], axis=-1).reshape(-1, 3)
+        f.write("v %.4f %.4f %.4f\n" * len(block) % tuple(block.ravel()))
+    for start in range(0, n, ROWS_PER_BLOCK):
+        y, x = np.mgrid[start : min(start + ROWS_PER_BLOCK, n), 0:n].astype(float)
+        block = np.stack([x / side, y / side], axis=-1).reshape(-1, 2)
+        f.write("vt %.5f %.5f\n" * len(block) % tuple(block.ravel()))
+    f.write("vn 0 0 1\n")
+
+
+def _face_rows(side: int, rows: range, hexagons: np.ndarray) -> str:
+    # 1 行分の四角形ペア（左右 2 セル）を、四角形 2 面か六角形 1 面として書き出す
+    n = side + 1
+    lines = []
+    for i in rows:
+        a = i * n + np.arange(0, side, 2) + 1
+        b, c, d = a + 1, a + 2, a + n
+        e, f = d + 1, d + 2
+        is_hexagon = hexagons[i]
+        # 六角形は共線の頂点から分割が始まらないよう中央下の頂点 b から並べる
+        hexagon = np.stack([b, c, f, e, d, a], axis=1)[is_hexagon]
+        quads = np.concatenate(
+            [
+                np.stack([a, b, e, d], axis=1)[~is_hexagon],
+                np.stack([b, c, f, e], axis=1)[~is_hexagon],
+            ]
+        )
+        if len(hexagon):
+            lines.append(
+                "f %d/%d/1 %d/%d/1 %d/%d/1 %d/%d/1 %d/%d/1 %d/%d/1\n"
+                * len(hexagon)
+                % tuple(np.repeat(hexagon, 2, axis=1).ravel())
+            )
+        if len(quads):
+            lines.append(
+                "f %d/%d/1 %d/%d/1 %d/%d/1 %d/%d/1\n"
+                * len(quads)
+                % tuple(np.repeat(quads, 2, axis=1).ravel())
+            )
+    return "".join(lines)
+
+
+def _write_texture(path: str, size: int, rng: np.random.Generator):
+    pixels = rng.integers(0, 256, (size, size, 3), dtype=np.uint8)
+    Image.fromarray(pixels, "RGB").save(path, "PNG")
+
+
+def write_dataset(directory: str, spec: DatasetSpec) -> str:
+    """spec のデータセット（OBJ・MTL・テクスチャ）を書き出し、OBJ のパスを返す。"""
+    os.makedirs(directory, exist_ok=True)
+    rng = np.random.default_rng(spec.seed)
+    side = spec.side
+    materials = max(min(spec.materials, side), 1)
+    obj_path = os.path.join(directory, f"{spec.name}.obj")
+    mtl_name = f"{spec.name}.mtl"
+
+    with open(os.path.join(directory, mtl_name), "w", encoding="utf-8") as f:
+        for m in range(materials):
+            color = rng.random(3)
+            f.write(f"newmtl mat{m}\nKd {color[0]:.3f} {color[1]:.3f} {color[2]:.3f}\n")
+            if m < spec.textures:
+                texture = f"{spec.name}_tex{m}.png"
+                _write_texture(os.path.join(directory, texture), spec.texture_size, rng)
+                f.write(f"map_Kd {texture}\n")
+
+    hexagons = rng.random((side, side // 2)) < spec.ngon_ratio
+    bands = np.array_split(np.arange(side), materials)
+    with open(obj_path, "w", encoding="utf-8") as f:
+        f.write(f"mtllib {mtl_name}\n")
+        _write_vertices(f, side)
+        for m, band in enumerate(bands):
+            f.write(f"usemtl mat{m}\n")
+            for start in range(band[0], band[-1] + 1, ROWS_PER_BLOCK):
+                rows = range(start, min(start + ROWS_PER_BLOCK, band[-1] + 1))
+                f.write(_face_rows(side, rows, hexagons))
+    return obj_path
+
+
+def triangle_count(spec: DatasetSpec) -> int:
+    return spec.side * spec.side * 2
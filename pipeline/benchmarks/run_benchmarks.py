@@ -0,0 +1,284 @@
+"""合成データセットで変換経路ごとのスループット・ピークメモリ・出力サイズを計測する。
+
+ピークメモリは変換中に増えた RSS の最大値（obj2gltf の node プロセスを含む）。
+
+計測は 1 回ごとに新しいプロセスで行い、ピークメモリが他の計測に影響されないようにする。
+結果は JSON に書き出し、--baseline で以前の結果と比較して劣化を検出する。
+
+使い方:
+    uv run python -m benchmarks.run_benchmarks --preset default --output bench.json
+    uv run python -m benchmarks.run_benchmarks --baseline bench.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+from benchmarks.datasets import DatasetSpec, triangle_count, write_dataset
+
+# -- データセットのプリセット --------------
+PRESETS = {
+    "smoke": [
+        DatasetSpec(10_000),
+        DatasetSpec(10_000, materials=4, ngon_ratio=0.5, textures=2, texture_size=64),
+    ],
+    "default": [
+        DatasetSpec(10_000),
+        DatasetSpec(100_000, materials=8, ngon_ratio=0.3),
+        DatasetSpec(100_000, materials=4, textures=4),
+        DatasetSpec(1_000_000, materials=16, ngon_ratio=0.3),
+    ],
+    "large": [
+        DatasetSpec(1_000_000, materials=16, ngon_ratio=0.3, textures=4),
+        DatasetSpec(10_000_000, materials=32, ngon_ratio=0.3),
+    ],
+}
+
+# 計測前に 1 回実行しておく経路（ジオメトリキャッシュ・.mesh を作る）
+WARMUP_CASES = {"native_cached", "script_cached"}
+
+# 比較時に劣化とみなす変化率（スループットは低下、メモリ・サイズは増加）
+DEFAULT_THRESHOLD = 0.10
+
+
+def _output_bytes(output_path: str) -> int:
+    # LOD（model.lod1.glb …）も含めた出力の合計
+    stem, ext = os.path.splitext(output_path)
+    directory = os.path.dirname(output_path)
+    prefix = os.path.basename(stem)
+    return sum(
+        os.path.getsize(os.path.join(directory, name))
+        for name in os.listdir(directory)
+        if name.endswith(ext)
+        and (name == prefix + ext or name.startswith(prefix + ".lod"))
+    )
+
+
+# -- 変換経路（ワーカープロセスで実行） --------------
+def _run_backend(
+    backend: str, input_path: str, output_path: str, geometry_cache: bool = False
+):
+    from src.config.settings import settings
+    from src.infrastructure.converters.factory import create_converter
+
+    # ジオメトリキャッシュは出力先の隣に置き、native_cached 以外では使わない
+    settings.GEOMETRY_CACHE_ENABLED = geometry_cache
+    settings.GEOMETRY_CACHE_DIR = os.path.join(os.path.dirname(output_path), "geometry")
+    create_converter(backend).convert(input_path, output_path, binary=True)
+
+
+def _run_script(input_path: str, output_path: str, cached: bool = False):
+    # scripts/convert_obj_to_glb.py と同じ呼び出し順（既定の設定値）
+    # cached でなければ毎回 .mesh を作り直す（初回の実行と同じ解析・書き出しを計測する）
+    from pathlib import Path
+
+    from src.infrastructure.mesh.gltf_builder import write_model
+    from src.infrastructure.mesh.mesh_file import load_mesh, mesh_file_path
+    from src.infrastructure.mesh.mtl_parser import load_mtl_file
+
+    cache_dir = os.path.join(os.path.dirname(output_path), "mesh")
+    if not cached:
+        mesh_file_path(input_path, cache_dir).unlink(missing_ok=True)
+    mesh = load_mesh(input_path, workers=os.cpu_count() or 1, cache_dir=cache_dir)
+    obj_dir = Path(input_path).parent
+    mtl_data: dict[str, dict] = {}
+    for mtllib in mesh.mtllibs:
+        mtl_data.update(load_mtl_file(obj_dir / mtllib, obj_dir))
+    write_model(mesh.material_groups, mtl_data, output_path)
+
+
+def run_case(case: str, input_path: str, output_path: str) -> dict[str, Any]:
+    from src.infrastructure.monitoring.conversion_metrics import collect_metrics
+
+    with collect_metrics() as metrics:
+        start = time.perf_counter()
+        if case in ("script", "script_cached"):
+            _run_script(input_path, output_path, cached=case == "script_cached")
+        elif case == "native_cached":
+            # MTL だけを変更した再変換（OBJ の解析を省いて GLB を組み立て直す）
+            _run_backend("native", input_path, output_path, geometry_cache=True)
+        else:
+            _run_backend(case, input_path, output_path)
+        seconds = time.perf_counter() - start
+    return {
+        "seconds": seconds,
+        "peak_rss_growth_bytes": metrics.memory.peak_growth,
+        "output_bytes": _output_bytes(output_path),
+        "stages": {name: values["seconds"] for name, values in metrics.stages.items()},
+    }
+
+
+def measure(case: str, input_path: str, output_path: str, repeat: int):
+    runs = []
+    context = multiprocessing.get_context("spawn")
+    warmup = 1 if case in WARMUP_CASES else 0
+    for _ in range(warmup + repeat):
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            runs.append(pool.submit(run_case, case, input_path, output_path).result())
+    runs = runs[warmup:]
+    # 時間は中央値、ピークメモリは最大値を採る
+    median = statistics.median(run["seconds"] for run in runs)
+    typical = min(runs, key=lambda run: abs(run["seconds"] - median))
+    return {
+        "seconds": median,
+        "peak_rss_growth_bytes": max(run["peak_rss_growth_bytes"] for run in runs),
+        "output_bytes": runs[-1]["output_bytes"],
+        "stages": typical["stages"],
+    }
+
+
+def available_cases() -> list[str]:
+    cases = ["native", "native_cached", "script", "script_cached"]
+    if shutil.which("obj2gltf"):
+        cases.append("obj2gltf")
+    return cases
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(
+    specs: list[DatasetSpec], cases: list[str], repeat: int, workdir: str
+) -> dict[str, Any]:
+    results = []
+    for spec in specs:
+        input_path = write_dataset(os.path.join(workdir, spec.name), spec)
+        triangles = triangle_count(spec)
+        for case in cases:
+            output_path = os.path.join(workdir, spec.name, f"out_{case}.glb")
+            result = measure(case, input_path, output_path, repeat)
+            results.append(
+                {
+                    "dataset": spec.to_dict(),
+                    "case": case,
+                    "triangles": triangles,
+                    "input_bytes": os.path.getsize(input_path),
+                    "triangles_per_second": triangles / result["seconds"],
+                    **result,
+                }
+            )
+            print(_format_row(results[-1]), flush=True)
+    return {
+        "commit": _commit(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+# -- 結果の比較 --------------
+def compare(
+    current: dict[str, Any], baseline: dict[str, Any], threshold: float
+) -> list[str]:
+    """baseline に対して threshold を超えて劣化した項目を返す。"""
+    previous = {
+        (result["dataset"]["name"], result["case"]): result
+        for result in baseline["results"]
+    }
+    regressions = []
+    for result in current["results"]:
+        key = (result["dataset"]["name"], result["case"])
+        if key not in previous:
+            continue
+        before = previous[key]
+        changes = {
+            "triangles_per_second": before["triangles_per_second"]
+            / result["triangles_per_second"]
+            - 1,
+            # RSS を読めない環境（/proc が無い）では 0 になるため比較しない
+            "peak_rss_growth_bytes": (
+                result["peak_rss_growth_bytes"] / before["peak_rss_growth_bytes"] - 1
+                if before["peak_rss_growth_bytes"]
+                else 0.0
+            ),
+            "output_bytes": result["output_bytes"] / before["output_bytes"] - 1,
+        }
+        for metric, change in changes.items():
+            if change > threshold:
+                regressions.append(
+                    f"{key[0]} [{key[1]}] {metric}: "
+                    f"{before[metric]:.0f} → {result[metric]:.0f} ({change:+.1%})"
+                )
+    return regressions
+
+
+def _format_row(result: dict[str, Any]) -> str:
+    return (
+        f"{result['dataset']['name']:<32}{result['case']:<14}"
+        f"{result['triangles']:>12}{result['seconds']:>10.3f}"
+        f"{result['triangles_per_second']:>14.0f}"
+        f"{result['peak_rss_growth_bytes'] / 1024**2:>10.1f}"
+        f"{result['output_bytes'] / 1024**2:>10.2f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="default")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", help="プリセットの代わりに三角形数を指定"
+    )
+    parser.add_argument(
+        "--cases", nargs="+", help="計測する経路（既定: 利用可能な全て）"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="比較する以前の結果 JSON")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    specs = PRESETS[args.preset]
+    if args.sizes:
+        specs = [DatasetSpec(size, materials=4, ngon_ratio=0.3) for size in args.sizes]
+    cases = args.cases or available_cases()
+    # 出力先と同じファイルを比較対象にできるよう、計測前に読み込んでおく
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    print(
+        f"{'dataset':<32}{'case':<14}{'triangles':>12}{'median[s]':>10}"
+        f"{'tri/s':>14}{'peak +MB':>10}{'out MB':>10}"
+    )
+    with tempfile.TemporaryDirectory() as workdir:
+        report = run_benchmarks(specs, cases, args.repeat, workdir)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"結果を書き出しました: {args.output}")
+
+    if baseline is not None:
+        regressions = compare(report, baseline, args.threshold)
+        for regression in regressions:
+            print(f"劣化: {regression}")
+        if regressions:
+            sys.exit(1)
+        print("劣化は検出されませんでした")
+
+
+if __name__ == "__main__":
+    main()
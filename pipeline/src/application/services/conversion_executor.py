@@ -0,0 +1,122 @@
+import asyncio
+import itertools
+import math
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Callable, TypeVar
+
+from src.config.settings import settings
+
+T = TypeVar("T")
+
+# 呼び出し側の種類（同期 API・非同期ジョブ API）。待機中は SYNC を先に実行する
+SYNC = "sync"
+JOB = "job"
+_PRIORITY = {SYNC: 0, JOB: 1}
+
+
+class ConversionPoolFullError(Exception):
+    pass
+
+
+class ConversionExecutor:
+    """変換処理をイベントループ外のワーカースレッドで実行する。
+
+    同期 API と非同期ジョブ API は同じ max_workers 本のワーカーを共有し、
+    実行中と待機中の件数は呼び出し側の種類ごとに数える。種類ごとの上限
+    （max_workers + 待機上限）に達している場合は即座に ConversionPoolFullError を
+    送出し、呼び出し側でバックプレッシャーをかける。ジョブが溜まっていても
+    同期 API は自分の枠で受け付け、待機中のジョブより先に実行する。
+    """
+
+    def __init__(self, max_workers: int, max_queue: int = 0, max_job_queue: int = 0):
+        self.max_workers = max_workers
+        self.max_queues = {SYNC: max_queue, JOB: max_job_queue}
+        self._queue: queue.PriorityQueue = queue.PriorityQueue()
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+        self._in_flight = {SYNC: 0, JOB: 0}
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._work, name=f"conversion_{i}", daemon=True)
+            for i in range(max_workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    @property
+    def in_flight(self) -> int:
+        return sum(self._in_flight.values())
+
+    def submit(self, fn: Callable[..., T], *args, kind: str = SYNC) -> Future:
+        capacity = self.max_workers + self.max_queues[kind]
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("conversion executor is shut down")
+            if self._in_flight[kind] >= capacity:
+                raise ConversionPoolFullError(
+                    f"conversion pool is full ({capacity} {kind} jobs in flight)"
+                )
+            self._in_flight[kind] += 1
+        future: Future = Future()
+        future.add_done_callback(lambda _: self._release(kind))
+        self._queue.put((_PRIORITY[kind], next(self._order), future, fn, args))
+        return future
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def _work(self):
+        while True:
+            _, _, future, fn, args = self._queue.get()
+            if future is None:
+                return
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = fn(*args)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+    def _release(self, kind: str):
+        with self._lock:
+            self._in_flight[kind] -= 1
+
+    def shutdown(self, wait: bool = True):
+        # 受け付け済みの変換は実行してから各ワーカーを止める
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        for _ in self._threads:
+            self._queue.put((math.inf, next(self._order), None, None, None))
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+
+_executor: ConversionExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_conversion_executor() -> ConversionExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ConversionExecutor(
+                settings.CONVERSION_MAX_CONCURRENCY,
+                settings.CONVERSION_MAX_QUEUE,
+                settings.CONVERSION_JOB_MAX_QUEUE,
+            )
+        return _executor
+
+
+def shutdown_conversion_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+            _executor = None
@@ -0,0 +1,197 @@
+import logging
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Protocol
+
+import requests
+
+from src.application.services.conversion_executor import (
+    JOB,
+    ConversionExecutor,
+    get_conversion_executor,
+)
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[str, float], None]
+
+
+class ConversionOutput(Protocol):
+    converted_path: str
+    lods: list[dict[str, Any]]
+    metrics: dict[str, Any]
+
+
+ConversionTask = Callable[[ProgressCallback], ConversionOutput]
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+@dataclass
+class ConversionJob:
+    id: str
+    storage_path: str
+    output_format: str = "glb"
+    callback_url: str | None = None
+    status: str = QUEUED
+    stage: str | None = None
+    progress: float = 0.0
+    converted_path: str | None = None
+    lods: list[dict[str, Any]] = field(default_factory=list)
+    metrics: dict[str, Any] | None = None
+    error: str | None = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        # API レスポンスと完了通知（Webhook）で共通のペイロード
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "stage": self.stage,
+            "progress": self.progress,
+            "original_path": self.storage_path,
+            "converted_path": self.converted_path,
+            "format": self.output_format,
+            "lods": self.lods,
+            "metrics": self.metrics,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class ConversionJobManager:
+    """変換ジョブを受け付けて ID を返し、バックグラウンドで実行する。
+
+    実行は ConversionExecutor の有限プールに載せ、ジョブの状態と進捗は
+    メモリ上に保持する。完了したジョブは保持期間を過ぎると破棄する。
+    """
+
+    def __init__(
+        self,
+        executor: ConversionExecutor,
+        retention_seconds: float = 3600,
+        callback_timeout: float = 10.0,
+    ) -> None:
+        self.executor = executor
+        self.retention_seconds = retention_seconds
+        self.callback_timeout = callback_timeout
+        self._jobs: dict[str, ConversionJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        storage_path: str,
+        task: ConversionTask,
+        output_format: str = "glb",
+        callback_url: str | None = None,
+    ) -> ConversionJob:
+        job = ConversionJob(
+            id=uuid.uuid4().hex,
+            storage_path=storage_path,
+            output_format=output_format,
+            callback_url=callback_url,
+        )
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        try:
+            # 満杯の場合は ConversionPoolFullError をそのまま呼び出し側へ返す
+            self.executor.submit(self._run, job.id, task, kind=JOB)
+        except BaseException:
+            with self._lock:
+                del self._jobs[job.id]
+            raise
+        return self.get(job.id) or job
+
+    def get(self, job_id: str) -> ConversionJob | None:
+        with self._lock:
+            self._prune()
+            job = self._jobs.get(job_id)
+            return replace(job) if job else None
+
+    def _update(self, job_id: str, **changes) -> ConversionJob:
+        with self._lock:
+            job = self._jobs[job_id]
+            for key, value in changes.items():
+                setattr(job, key, value)
+            return replace(job)
+
+    def _run(self, job_id: str, task: ConversionTask):
+        self._update(job_id, status=RUNNING)
+
+        def on_progress(stage: str, progress: float):
+            self._update(job_id, stage=stage, progress=progress)
+
+        try:
+            result = task(on_progress)
+        except Exception as e:
+            logger.exception("conversion job %s failed", job_id)
+            job = self._update(
+                job_id, status=FAILED, error=str(e), finished_at=time.time()
+            )
+        else:
+            job = self._update(
+                job_id,
+                status=COMPLETED,
+                stage=None,
+                progress=1.0,
+                converted_path=result.converted_path,
+                lods=result.lods,
+                metrics=result.metrics,
+                finished_at=time.time(),
+            )
+        if job.callback_url:
+            self._notify(job, job.callback_url)
+
+    def _notify(self, job: ConversionJob, callback_url: str):
+        # 通知の失敗はジョブの結果に影響させない（ポーリングで取得可能）
+        try:
+            response = requests.post(
+                callback_url, json=job.to_dict(), timeout=self.callback_timeout
+            )
+            response.raise_for_status()
+        except requests.RequestException as e:
+            logger.warning("callback for job %s failed: %s", job.id, e)
+
+    def _prune(self):
+        deadline = time.time() - self.retention_seconds
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < deadline
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+_manager: ConversionJobManager | None = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> ConversionJobManager:
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            # 同期 API と同じワーカーで実行し、同時変換数の上限を共有する
+            # （待機上限は CONVERSION_JOB_MAX_QUEUE で同期 API とは別に数える）
+            _manager = ConversionJobManager(
+                get_conversion_executor(),
+                retention_seconds=settings.CONVERSION_JOB_RETENTION_SECONDS,
+                callback_timeout=settings.CONVERSION_JOB_CALLBACK_TIMEOUT,
+            )
+        return _manager
+
+
+def shutdown_job_manager():
+    # プールは shutdown_conversion_executor で停止する
+    global _manager
+    with _manager_lock:
+        _manager = None
@@ -1,41 +1,157 @@
+import logging
 import os
 import uuid
-from src.infrastructure.converters.obj2gltf_converter import Obj2GltfConverter
-from src.infrastructure.storage.minio_client import MinioClient
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable
+
+from src.config.settings import settings
+from src.infrastructure.converters.factory import (
+    create_converter,
+    texture_options_from_settings,
+)
+from src.infrastructure.mesh.paths import lod_output_path
+from src.infrastructure.monitoring.conversion_metrics import (
+    collect_metrics,
+    log_metrics,
+    stage,
+)
+from src.infrastructure.storage.conversion_cache import (
+    ConversionCache,
+    get_conversion_cache,
+)
+from src.infrastructure.storage.minio_client import MinioClient, get_storage_client
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ConversionResult:
+    converted_path: str
+    # 詳細度ごとの出力（level 0 は converted_path 自身）: level, path, triangles
+    lods: list[dict[str, Any]] = field(default_factory=list)
+    # 段階ごとの所要時間・バイト数とピークメモリ（conversion_metrics を参照）
+    metrics: dict[str, Any] = field(default_factory=dict)
 
 
 class ObjToGlbUseCase:
-    def __init__(self):
-        self.converter = Obj2GltfConverter()
-        self.storage = MinioClient()
+    def __init__(
+        self,
+        storage: MinioClient | None = None,
+        cache: ConversionCache | None = None,
+    ):
+        self.converter = create_converter()
+        self.storage = storage or get_storage_client()
+        self.cache = cache or get_conversion_cache()
         self.temp_dir = "temp"
 
-    def execute(self, storage_path: str) -> str:
+    def converter_options(self) -> dict[str, Any]:
+        # 出力に影響するオプション（変換結果キャッシュのキーに含める）
+        return {
+            "backend": settings.CONVERTER_BACKEND,
+            "format": "glb",
+            "quantize": settings.MESH_QUANTIZATION,
+            "optimize": settings.MESH_OPTIMIZATION,
+            "ear_clipping": settings.OBJ_EAR_CLIPPING,
+            "up_axis": settings.MODEL_UP_AXIS,
+            "scale": settings.MODEL_SCALE,
+            "lod_ratios": sorted(settings.MESH_LOD_RATIOS, reverse=True),
+            "lod_max_triangles": settings.MESH_LOD_MAX_TRIANGLES,
+            "textures": asdict(texture_options_from_settings()),
+        }
+
+    def execute(
+        self,
+        storage_path: str,
+        on_progress: Callable[[str, float], None] | None = None,
+    ) -> ConversionResult:
         # storage_path e.g., "userId/fileId/model.obj"
+        # on_progress(stage, progress) はジョブ API の進捗報告用（0.0 - 1.0）
+        report = on_progress or (lambda stage, progress: None)
+        with collect_metrics() as metrics:
+            result = self._execute(storage_path, report)
+        result.metrics = metrics.finish()
+        log_metrics(storage_path, result.metrics)
+        return result
+
+    def _execute(
+        self, storage_path: str, report: Callable[[str, float], None]
+    ) -> ConversionResult:
+        # New path: same directory as original, but .glb
+        remote_dir = os.path.dirname(storage_path)
+        base_name = os.path.splitext(os.path.basename(storage_path))[0]
+        new_storage_path = f"{remote_dir}/{base_name}.glb"
+
+        # 同じ入力・オプションの変換結果があればサーバー側コピーで済ませる
+        cache_key = self._cache_key(storage_path)
+        if cache_key and self.cache:
+            with stage("cache"):
+                cached = self.cache.restore(cache_key, new_storage_path)
+            if cached is not None:
+                report("cached", 1.0)
+                return self._result(new_storage_path, cached)
+
+        lods: list[dict[str, int]] = []
+        if hasattr(self.converter, "convert_stream"):
+            lods = self._convert_streaming(storage_path, new_storage_path, report)
+        else:
+            self._convert_local(storage_path, new_storage_path, report)
+
+        if cache_key and self.cache:
+            try:
+                self.cache.store(cache_key, new_storage_path, lods)
+            except Exception as e:
+                logger.warning("failed to cache %s: %s", new_storage_path, e)
+        return self._result(new_storage_path, lods)
 
+    @staticmethod
+    def _result(converted_path: str, lods: list[dict[str, int]]) -> ConversionResult:
+        return ConversionResult(
+            converted_path,
+            [
+                {**lod, "path": lod_output_path(converted_path, lod["level"])}
+                for lod in lods
+            ],
+        )
+
+    def _cache_key(self, storage_path: str) -> str | None:
+        if self.cache is None:
+            return None
+        try:
+            return self.cache.key_for(storage_path, self.converter_options())
+        except Exception as e:
+            logger.warning("failed to compute cache key for %s: %s", storage_path, e)
+            return None
+
+    def _convert_local(
+        self,
+        storage_path: str,
+        new_storage_path: str,
+        report: Callable[[str, float], None],
+    ):
         # Determine paths
         filename = os.path.basename(storage_path)
-        base_name = os.path.splitext(filename)[0]
         local_input_path = os.path.join(self.temp_dir, f"{uuid.uuid4()}_{filename}")
         local_output_path = os.path.splitext(local_input_path)[0] + ".glb"
 
         try:
             # 1. Download
-            self.storage.download_file(storage_path, local_input_path)
+            report("downloading", 0.0)
+            with stage("download") as values:
+                self.storage.download_file(storage_path, local_input_path)
+                values["bytes"] = os.path.getsize(local_input_path)
 
             # 2. Convert
-            self.converter.convert(local_input_path, local_output_path, binary=True)
+            report("converting", 0.2)
+            with stage("convert"):
+                self.converter.convert(local_input_path, local_output_path, binary=True)
 
             # 3. Upload
-            # New path: same directory as original, but .glb
-            remote_dir = os.path.dirname(storage_path)
-            new_storage_path = f"{remote_dir}/{base_name}.glb"
-
-            self.storage.upload_file(
-                new_storage_path, local_output_path, "model/gltf-binary"
-            )
-
-            return new_storage_path
+            report("uploading", 0.9)
+            with stage("upload") as values:
+                self.storage.upload_file(
+                    new_storage_path, local_output_path, "model/gltf-binary"
+                )
+                values["bytes"] = os.path.getsize(local_output_path)
 
         finally:
             # Cleanup
@@ -43,3 +159,36 @@ class ObjToGlbUseCase:
                 os.remove(local_input_path)
             if os.path.exists(local_output_path):
                 os.remove(local_output_path)
+
+    def _convert_streaming(
+        self,
+        storage_path: str,
+        new_storage_path: str,
+        report: Callable[[str, float], None],
+    ) -> list[dict[str, int]]:
+        # オブジェクトストレージ → パーサー → GLB ライター → オブジェクトストレージ
+        # と直接ストリーミングし、temp/ へのダウンロード・書き出しを行わない
+        # LOD は model.lod1.glb … として同じディレクトリに書き出す
+        report("converting", 0.0)
+        source_id = self._source_id(storage_path)
+        with self.storage.open_read(storage_path) as source:
+            with self.storage.open_write(new_storage_path) as sink:
+                return self.converter.convert_stream(
+                    source,
+                    sink,
+                    os.path.dirname(storage_path),
+                    self.storage.open_read,
+                    open_lod=lambda level: self.storage.open_write(
+                        lod_output_path(new_storage_path, level)
+                    ),
+                    source_id=source_id,
+                )
+
+    def _source_id(self, storage_path: str) -> str | None:
+        # ジオメトリキャッシュのキーにする OBJ 本体の ETag（MTL だけの更新では変わらない）
+        try:
+            etag = self.storage.etag(storage_path)
+        except Exception as e:
+            logger.warning("failed to stat %s: %s", storage_path, e)
+            return None
+        return f"etag:{etag}" if etag else None
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -9,6 +11,68 @@ class Settings(BaseSettings):
     MINIO_SECRET_KEY: str = "minioadmin"
     MINIO_BUCKET_NAME: str = "studio-view-assets"
     MINIO_SECURE: bool = False
+    # ストリーミングアップロードのパートサイズ（S3 の下限は 5 MiB）
+    MINIO_PART_SIZE: int = 16 * 1024 * 1024
+    # 共有接続プールのホストあたり最大接続数・タイムアウト（秒）・再試行回数
+    MINIO_POOL_MAXSIZE: int = 16
+    MINIO_CONNECT_TIMEOUT: float = 10.0
+    MINIO_READ_TIMEOUT: float = 300.0
+    MINIO_MAX_RETRIES: int = 5
+    # OBJ → GLB 変換バックエンド（"obj2gltf": Node.js CLI, "native": Python/NumPy）
+    CONVERTER_BACKEND: Literal["obj2gltf", "native"] = "obj2gltf"
+    # native 変換で KHR_mesh_quantization（座標 int16・法線 int8・UV uint16）を使う
+    MESH_QUANTIZATION: bool = False
+    # native 変換で頂点キャッシュ・overdraw・頂点フェッチ順の最適化を行う
+    MESH_OPTIMIZATION: bool = False
+    # native 変換で生成する LOD の三角形数の倍率（例: [0.5, 0.25, 0.125]、空なら生成しない）
+    # 各 LOD は model.lod1.glb … として変換結果と同じディレクトリに出力する
+    MESH_LOD_RATIOS: list[float] = []
+    # これを超える三角形数のメッシュは LOD を生成せず、警告を記録する（0 で無制限）
+    MESH_LOD_MAX_TRIANGLES: int = 200000
+    # native 変換で 64 MiB 以上の OBJ をローカルファイルから解析するときのプロセス数
+    # （1 の場合は単一プロセス。ストリーミング変換では使わない）
+    OBJ_PARSE_WORKERS: int = 1
+    # 凹んだ多角形を扇形ではなく耳刈り法で三角形分割する
+    OBJ_EAR_CLIPPING: bool = False
+    # 元データの上方向の軸と単位の倍率（例: Z 軸が上・mm 単位なら "Z" と 0.001）
+    # 頂点は書き換えず、GLB のルートノードの matrix として出力する
+    MODEL_UP_AXIS: Literal["X", "Y", "Z"] = "Y"
+    MODEL_SCALE: float = 1.0
+    # native 変換のテクスチャ変換（長辺の上限 px・0 で縮小しない、出力形式）
+    # TEXTURE_FORMAT は "original" / "webp"（EXT_texture_webp）/ "ktx2"
+    # （KHR_texture_basisu、toktx が無い環境では webp）
+    TEXTURE_MAX_SIZE: int = 0
+    TEXTURE_FORMAT: Literal["original", "webp", "ktx2"] = "original"
+    TEXTURE_QUALITY: int = 85
+    # ミップマップ向けに 2 のべき乗サイズへ揃える
+    TEXTURE_POWER_OF_TWO: bool = True
+    # テクスチャ変換のワーカープロセス数（0 の場合は CPU 数）
+    TEXTURE_WORKERS: int = 0
+    # obj2gltf 常駐ワーカー数（0 の場合はジョブごとにプロセスを起動）
+    OBJ2GLTF_POOL_SIZE: int = 0
+    OBJ2GLTF_MAX_JOBS_PER_WORKER: int = 100
+    OBJ2GLTF_MAX_WORKER_RSS_MB: int = 1024
+    # 常駐ワーカー 1 ジョブあたりの応答待ち上限秒数（超えたらワーカーを終了、0 で無制限）
+    OBJ2GLTF_JOB_TIMEOUT: float = 600.0
+    # 同時に実行する変換数（同期 API・ジョブ API 共通）と、同期 API が別枠で待機できる件数（超過分は 503）
+    CONVERSION_MAX_CONCURRENCY: int = 2
+    CONVERSION_MAX_QUEUE: int = 8
+    # 非同期ジョブ API（/conversion/jobs）の待機上限・結果保持期間・通知タイムアウト
+    CONVERSION_JOB_MAX_QUEUE: int = 100
+    CONVERSION_JOB_RETENTION_SECONDS: int = 3600
+    CONVERSION_JOB_CALLBACK_TIMEOUT: float = 10.0
+    # 変換結果キャッシュ（MinIO の prefix に GLB、索引はローカル SQLite）
+    # CONVERSION_CACHE_HASH は "etag"（MinIO の ETag）か "sha256"（内容を読んで計算）
+    CONVERSION_CACHE_ENABLED: bool = True
+    CONVERSION_CACHE_PREFIX: str = "cache/glb"
+    CONVERSION_CACHE_DB: str = "cache/conversion_cache.sqlite3"
+    CONVERSION_CACHE_MAX_BYTES: int = 10 * 1024**3
+    CONVERSION_CACHE_HASH: Literal["etag", "sha256"] = "etag"
+    # native 変換のジオメトリキャッシュ（OBJ の内容ごとに重複除去済みの配列をローカルに保存）
+    # MTL・テクスチャだけが変わった再変換では OBJ を解析せずに GLB を組み立て直す
+    GEOMETRY_CACHE_ENABLED: bool = True
+    GEOMETRY_CACHE_DIR: str = "cache/geometry"
+    GEOMETRY_CACHE_MAX_BYTES: int = 20 * 1024**3
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
@@ -0,0 +1,60 @@
+import atexit
+import threading
+
+from src.config.settings import settings
+from src.infrastructure.converters.native_converter import NativeObjConverter
+from src.infrastructure.converters.obj2gltf_converter import Obj2GltfConverter
+from src.infrastructure.converters.obj2gltf_pool import Obj2GltfWorkerPool
+from src.infrastructure.mesh.obj_transform import model_matrix
+from src.infrastructure.mesh.texture_transcoder import TextureOptions, get_texture_pool
+from src.infrastructure.storage.geometry_cache import get_geometry_cache
+
+_pool: Obj2GltfWorkerPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_obj2gltf_pool() -> Obj2GltfWorkerPool | None:
+    # OBJ2GLTF_POOL_SIZE が 0 の場合はプールを使わずジョブごとに起動する
+    global _pool
+    if settings.OBJ2GLTF_POOL_SIZE <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = Obj2GltfWorkerPool(
+                settings.OBJ2GLTF_POOL_SIZE,
+                max_jobs_per_worker=settings.OBJ2GLTF_MAX_JOBS_PER_WORKER,
+                max_worker_rss_mb=settings.OBJ2GLTF_MAX_WORKER_RSS_MB,
+                job_timeout=settings.OBJ2GLTF_JOB_TIMEOUT or None,
+            )
+            atexit.register(_pool.close)
+        return _pool
+
+
+def texture_options_from_settings() -> TextureOptions:
+    return TextureOptions(
+        max_size=settings.TEXTURE_MAX_SIZE,
+        format=settings.TEXTURE_FORMAT,
+        quality=settings.TEXTURE_QUALITY,
+        power_of_two=settings.TEXTURE_POWER_OF_TWO,
+    )
+
+
+def create_converter(backend: str | None = None):
+    backend = backend or settings.CONVERTER_BACKEND
+    if backend == "native":
+        texture_options = texture_options_from_settings()
+        return NativeObjConverter(
+            quantize=settings.MESH_QUANTIZATION,
+            optimize=settings.MESH_OPTIMIZATION,
+            lod_ratios=settings.MESH_LOD_RATIOS,
+            lod_max_triangles=settings.MESH_LOD_MAX_TRIANGLES,
+            texture_options=texture_options,
+            texture_pool=get_texture_pool() if texture_options.enabled else None,
+            parse_workers=settings.OBJ_PARSE_WORKERS,
+            ear_clipping=settings.OBJ_EAR_CLIPPING,
+            transform=model_matrix(settings.MODEL_UP_AXIS, settings.MODEL_SCALE),
+            geometry_cache=get_geometry_cache(),
+        )
+    if backend == "obj2gltf":
+        return Obj2GltfConverter(get_obj2gltf_pool())
+    raise ValueError(f"unknown converter backend: {backend}")
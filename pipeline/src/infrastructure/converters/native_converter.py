@@ -0,0 +1,261 @@
+import logging
+import os
+from concurrent.futures import Executor
+from contextlib import AbstractContextManager
+from pathlib import Path, PurePosixPath
+from typing import Any, BinaryIO, Callable
+
+import numpy as np
+
+from src.infrastructure.mesh.gltf_builder import MaterialGroups, build_gltf
+from src.infrastructure.mesh.mesh_file import MESH_SUFFIX, read_mesh_file
+from src.infrastructure.mesh.mesh_optimizer import optimize_material_groups
+from src.infrastructure.mesh.mtl_parser import Opener, load_mtl_file
+from src.infrastructure.mesh.obj_parser import ObjData, build_material_groups, parse_obj
+from src.infrastructure.mesh.paths import lod_output_path
+from src.infrastructure.mesh.simplifier import build_lods, triangle_count
+from src.infrastructure.mesh.texture_transcoder import (
+    TextureOptions,
+    TextureTranscoder,
+)
+from src.infrastructure.monitoring.conversion_metrics import stage
+from src.infrastructure.storage.geometry_cache import GeometryCache, file_sha256
+
+logger = logging.getLogger(__name__)
+
+
+class _CountingStream:
+    # ストリーム変換で読み書きしたバイト数を計測用に数える
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        self.bytes = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.stream.read(size)
+        self.bytes += len(data)
+        return data
+
+    def write(self, data) -> int:
+        written = self.stream.write(data)
+        self.bytes += memoryview(data).nbytes
+        return written
+
+
+class NativeObjConverter:
+    """obj2gltf を起動せず、プロセス内で OBJ(+MTL) を glTF/GLB に変換する。"""
+
+    def __init__(
+        self,
+        quantize: bool = False,
+        optimize: bool = False,
+        lod_ratios: list[float] | None = None,
+        lod_max_triangles: int = 0,
+        texture_options: TextureOptions | None = None,
+        texture_pool: Executor | None = None,
+        parse_workers: int = 1,
+        ear_clipping: bool = False,
+        transform: np.ndarray | None = None,
+        geometry_cache: GeometryCache | None = None,
+    ) -> None:
+        # quantize: KHR_mesh_quantization 形式で頂点属性を整数化して出力する
+        # optimize: 頂点キャッシュ・overdraw・頂点フェッチ順に並べ替える
+        # lod_ratios: LOD1 以降の三角形数の倍率（例: [0.5, 0.25]）
+        # lod_max_triangles: これを超える三角形数のメッシュは LOD を生成しない（0 で無制限）
+        # texture_options: テクスチャの縮小・形式変換（texture_pool で並列実行）
+        # parse_workers: ファイルからの変換で OBJ を解析するプロセス数
+        # ear_clipping: 凹多角形を耳刈り法で三角形分割する
+        # transform: ルートノードに置く 4x4 行列（上方向の軸・単位の変換）
+        # geometry_cache: 同じ OBJ の再変換で解析・重複除去・最適化・LOD 生成を省く
+        self.quantize = quantize
+        self.optimize = optimize
+        self.lod_ratios = sorted(lod_ratios or [], reverse=True)
+        self.lod_max_triangles = lod_max_triangles
+        self.texture_options = texture_options or TextureOptions()
+        self.texture_pool = texture_pool
+        self.parse_workers = parse_workers
+        self.ear_clipping = ear_clipping
+        self.transform = transform
+        self.geometry_cache = geometry_cache
+
+    def _transcoder(self) -> TextureTranscoder | None:
+        # 変換結果は LOD 間で共有するため、変換 1 回につき 1 つ作る
+        if not self.texture_options.enabled:
+            return None
+        return TextureTranscoder(self.texture_options, self.texture_pool)
+
+    def _material_groups(self, obj: ObjData) -> MaterialGroups:
+        with stage("dedupe"):
+            groups = build_material_groups(obj, self.ear_clipping)
+        if self.optimize:
+            with stage("optimize"):
+                groups, _ = optimize_material_groups(groups)
+        return groups
+
+    def _levels(self, groups: MaterialGroups) -> list[MaterialGroups]:
+        levels = [groups]
+        if not self.lod_ratios:
+            return levels
+        triangles = triangle_count(groups)
+        if self.lod_max_triangles and triangles > self.lod_max_triangles:
+            # 簡略化は三角形数に比例して時間がかかるため、大きなメッシュでは省く
+            logger.warning(
+                "skipping LOD generation: %d triangles exceeds the limit of %d",
+                triangles,
+                self.lod_max_triangles,
+            )
+            return levels
+        with stage("lod"):
+            for lod in build_lods(groups, self.lod_ratios):
+                if self.optimize:
+                    lod, _ = optimize_material_groups(lod)
+                levels.append(lod)
+        return levels
+
+    def _geometry_options(self, lods: bool) -> dict[str, Any]:
+        # ジオメトリキャッシュの配列に影響するオプション
+        # （量子化・テクスチャ・transform は GLB の組み立て時に適用するため含めない）
+        return {
+            "ear_clipping": self.ear_clipping,
+            "optimize": self.optimize,
+            "lod_ratios": self.lod_ratios if lods else [],
+            "lod_max_triangles": self.lod_max_triangles if lods else 0,
+        }
+
+    def _geometry(
+        self, read: Callable[[], ObjData], source_id: str | None, lods: bool
+    ) -> tuple[list[str], list[MaterialGroups]]:
+        # mtllib の一覧と LOD ごとのマテリアル別配列を返す
+        # source_id（OBJ の内容ハッシュ・ETag）がキャッシュにあれば read() を呼ばない
+        # キャッシュに保存した場合は .mesh の memmap を返し、解析結果の配列は解放する
+        # （OBJ の解析・重複除去・LOD 生成の間はメッシュ全体がメモリに載る）
+        key = None
+        if self.geometry_cache is not None and source_id is not None:
+            key = self.geometry_cache.key_for(source_id, self._geometry_options(lods))
+            with stage("geometry_load"):
+                cached = self.geometry_cache.load(key)
+            if cached is not None:
+                return cached
+        obj = read()
+        groups = self._material_groups(obj)
+        levels = self._levels(groups) if lods else [groups]
+        if self.geometry_cache is not None and key is not None:
+            try:
+                with stage("geometry_store"):
+                    levels = self.geometry_cache.store(key, obj.mtllibs, levels)
+            except OSError as e:
+                logger.warning("failed to store geometry cache: %s", e)
+        return obj.mtllibs, levels
+
+    def _mesh_file_geometry(
+        self, input_path: str
+    ) -> tuple[list[str], list[MaterialGroups]]:
+        # 解析済みの .mesh（mesh_file）は memmap で開き、テキストの解析を省く
+        # 属性は GLB の書き出し時にブロックごとに変換されるため、メモリに載らない
+        # 大きさのメッシュも変換できる（最適化・LOD 生成を行う場合は除く）
+        with stage("parse") as values:
+            mesh = read_mesh_file(input_path)
+            values["bytes"] = os.path.getsize(input_path)
+        groups = mesh.material_groups
+        if self.optimize:
+            with stage("optimize"):
+                groups, _ = optimize_material_groups(groups)
+        return mesh.mtllibs, self._levels(groups)
+
+    def convert(self, input_path: str, output_path: str, binary: bool = True):
+        # input_path は OBJ か、解析済みの .mesh（mtllib は同じディレクトリから読む）
+        obj_dir = Path(input_path).parent
+
+        def read() -> ObjData:
+            with stage("parse") as values:
+                obj = parse_obj(input_path, workers=self.parse_workers)
+                values["bytes"] = os.path.getsize(input_path)
+            return obj
+
+        try:
+            if Path(input_path).suffix == MESH_SUFFIX:
+                mtllibs, levels = self._mesh_file_geometry(input_path)
+            else:
+                source_id = None
+                if self.geometry_cache is not None:
+                    with stage("hash"):
+                        source_id = file_sha256(input_path)
+                mtllibs, levels = self._geometry(read, source_id, lods=True)
+            mtl_data: dict[str, dict] = {}
+            for mtllib in mtllibs:
+                mtl_data.update(load_mtl_file(obj_dir / mtllib, obj_dir))
+            # LOD は出力ファイルと同じ場所に model.lod1.glb … として書き出す
+            transcoder = self._transcoder()
+            for level, groups in enumerate(levels):
+                writer = build_gltf(
+                    groups,
+                    mtl_data,
+                    quantize=self.quantize,
+                    transcoder=transcoder,
+                    transform=self.transform,
+                )
+                path = lod_output_path(output_path, level)
+                with stage("write") as values:
+                    if binary:
+                        writer.write(path)
+                    else:
+                        writer.write_gltf(path)
+                    values["bytes"] = os.path.getsize(path)
+        except (OSError, ValueError, IndexError) as e:
+            raise Exception(f"native conversion failed: {e}") from e
+
+        return output_path
+
+    def convert_stream(
+        self,
+        source: BinaryIO,
+        sink: BinaryIO,
+        obj_dir: str,
+        opener: Opener,
+        open_lod: Callable[[int], AbstractContextManager[BinaryIO]] | None = None,
+        source_id: str | None = None,
+    ) -> list[dict[str, int]]:
+        # 一時ファイルを経由せず、ストリームから読み込んで GLB をストリームへ書き出す
+        # （MTL・テクスチャは obj_dir からの相対名で opener を使って開く）
+        # LOD は open_lod(level) が返す書き込み先へ出力し、各レベルの三角形数を返す
+        # （LOD を生成しない場合はファイル変換と同じく空）
+        # source_id（ETag 等）がジオメトリキャッシュにあれば source は読まない
+        # 出力側のメモリは一定だが、source の解析中はメッシュ全体がメモリに載る
+        base = PurePosixPath(obj_dir)
+
+        def read() -> ObjData:
+            with stage("parse") as values:
+                counting = _CountingStream(source)
+                obj = parse_obj(counting)  # type: ignore[arg-type]
+                values["bytes"] = counting.bytes
+            return obj
+
+        try:
+            mtllibs, levels = self._geometry(read, source_id, lods=bool(open_lod))
+            mtl_data: dict[str, dict] = {}
+            for mtllib in mtllibs:
+                mtl_data.update(load_mtl_file(base / mtllib, base, opener))
+
+            transcoder = self._transcoder()
+            lods = []
+            for level, level_groups in enumerate(levels):
+                writer = build_gltf(
+                    level_groups,
+                    mtl_data,
+                    opener=opener,
+                    quantize=self.quantize,
+                    transcoder=transcoder,
+                    transform=self.transform,
+                )
+                with stage("write") as values:
+                    if level == 0:
+                        output = _CountingStream(sink)
+                        writer.write_to(output)  # type: ignore[arg-type]
+                    else:
+                        with open_lod(level) as lod_sink:  # type: ignore[misc]
+                            output = _CountingStream(lod_sink)
+                            writer.write_to(output)  # type: ignore[arg-type]
+                    values["bytes"] = output.bytes
+                lods.append({"level": level, "triangles": triangle_count(level_groups)})
+            return lods if len(lods) > 1 else []
+        except (OSError, ValueError, IndexError) as e:
+            raise Exception(f"native conversion failed: {e}") from e
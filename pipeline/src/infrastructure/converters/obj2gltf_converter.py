@@ -1,8 +1,17 @@
 import subprocess
 
+from src.infrastructure.converters.obj2gltf_pool import Obj2GltfWorkerPool
+
 
 class Obj2GltfConverter:
+    def __init__(self, pool: Obj2GltfWorkerPool | None = None):
+        # プールが渡された場合は常駐ワーカーで変換し、ジョブごとの Node 起動を省く
+        self.pool = pool
+
     def convert(self, input_path: str, output_path: str, binary: bool = True):
+        if self.pool is not None:
+            return self.pool.convert(input_path, output_path, binary)
+
         cmd = ["obj2gltf", "-i", input_path, "-o", output_path]
         if binary:
             cmd.append("--binary")
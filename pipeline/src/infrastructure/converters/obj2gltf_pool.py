@@ -0,0 +1,178 @@
+import json
+import os
+import queue
+import subprocess
+import threading
+from pathlib import Path
+
+from src.infrastructure.monitoring.conversion_metrics import track_process
+
+WORKER_SCRIPT = Path(__file__).with_name("obj2gltf_worker.js")
+
+
+def _node_env() -> dict[str, str]:
+    # グローバルインストールされた obj2gltf を require できるようにする
+    env = os.environ.copy()
+    if "NODE_PATH" not in env:
+        try:
+            result = subprocess.run(
+                ["npm", "root", "-g"], capture_output=True, text=True, check=True
+            )
+            env["NODE_PATH"] = result.stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            pass
+    return env
+
+
+class Obj2GltfWorker:
+    def __init__(self, command: list[str], env: dict[str, str] | None = None):
+        self.process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+            env=env,
+        )
+        self.jobs = 0
+        self.rss = 0
+        self.timed_out = False
+
+    def run(self, job: dict, timeout: float | None = None) -> dict:
+        # timeout 秒以内に応答が無ければプロセスを終了させる（readline は EOF で戻る）
+        assert self.process.stdin and self.process.stdout
+        timer = threading.Timer(timeout, self._expire) if timeout else None
+        self.timed_out = False
+        try:
+            self.process.stdin.write(json.dumps(job) + "\n")
+            self.process.stdin.flush()
+            if timer:
+                timer.start()
+            line = self.process.stdout.readline()
+        except (BrokenPipeError, OSError) as e:
+            raise Exception(f"obj2gltf worker failed: {e}") from e
+        finally:
+            if timer:
+                timer.cancel()
+        if self.timed_out:
+            raise TimeoutError(f"obj2gltf worker timed out after {timeout} seconds")
+        if not line:
+            raise Exception("obj2gltf worker exited unexpectedly")
+
+        reply = json.loads(line)
+        self.jobs += 1
+        self.rss = int(reply.get("rss", 0))
+        return reply
+
+    def _expire(self):
+        self.timed_out = True
+        self.process.kill()
+
+    def is_alive(self) -> bool:
+        return self.process.poll() is None
+
+    def close(self):
+        if self.process.stdin:
+            self.process.stdin.close()
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        if self.process.stdout:
+            self.process.stdout.close()
+
+
+class Obj2GltfWorkerPool:
+    """obj2gltf ライブラリを読み込み済みの Node.js ワーカーを常駐させるプール。
+
+    ワーカーは初回利用時に起動し、一定件数のジョブを処理するか RSS が上限を
+    超えた時点で破棄して次の利用時に起動し直す。job_timeout 秒以内に応答しない
+    ワーカーは終了させ、同様に起動し直す。
+    """
+
+    def __init__(
+        self,
+        size: int,
+        max_jobs_per_worker: int = 100,
+        max_worker_rss_mb: int = 1024,
+        job_timeout: float | None = None,
+        command: list[str] | None = None,
+    ):
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.job_timeout = job_timeout
+        self.max_worker_rss = max_worker_rss_mb * 1024 * 1024
+        self.command = command or ["node", str(WORKER_SCRIPT)]
+        self._env = _node_env() if command is None else None
+        self._idle: queue.Queue[Obj2GltfWorker | None] = queue.Queue()
+        self._workers: set[Obj2GltfWorker] = set()
+        self._lock = threading.Lock()
+        self._next_id = 0
+        for _ in range(size):
+            self._idle.put(None)
+
+    def convert(self, input_path: str, output_path: str, binary: bool = True):
+        worker = self._acquire()
+        # 常駐ワーカーの RSS の増加も変換のピークメモリに含める
+        track_process(worker.process.pid)
+        try:
+            with self._lock:
+                self._next_id += 1
+                job_id = self._next_id
+            reply = worker.run(
+                {
+                    "id": job_id,
+                    "input": input_path,
+                    "output": output_path,
+                    "binary": binary,
+                },
+                timeout=self.job_timeout,
+            )
+        except Exception:
+            self._discard(worker)
+            self._idle.put(None)
+            raise
+        self._release(worker)
+
+        if not reply.get("ok"):
+            raise Exception(f"obj2gltf failed: {reply.get('error')}")
+        return output_path
+
+    def _acquire(self) -> Obj2GltfWorker:
+        worker = self._idle.get()
+        if worker is not None and worker.is_alive():
+            return worker
+        if worker is not None:
+            self._discard(worker)
+        try:
+            worker = Obj2GltfWorker(self.command, self._env)
+        except BaseException:
+            # 起動に失敗しても枠は返す（返さないと以降の変換が待ち続ける）
+            self._idle.put(None)
+            raise
+        with self._lock:
+            self._workers.add(worker)
+        return worker
+
+    def _release(self, worker: Obj2GltfWorker):
+        if (
+            worker.jobs >= self.max_jobs_per_worker
+            or worker.rss > self.max_worker_rss
+            or not worker.is_alive()
+        ):
+            self._discard(worker)
+            self._idle.put(None)
+        else:
+            self._idle.put(worker)
+
+    def _discard(self, worker: Obj2GltfWorker):
+        with self._lock:
+            self._workers.discard(worker)
+        worker.close()
+
+    def close(self):
+        with self._lock:
+            workers = list(self._workers)
+            self._workers.clear()
+        for worker in workers:
+            worker.close()
@@ -0,0 +1,32 @@
+// obj2gltf を 1 度だけ読み込み、stdin の JSON 行ごとに変換ジョブを処理する常駐ワーカー
+// 入力: {"id": ..., "input": "...", "output": "...", "binary": true}
+// 出力: {"id": ..., "ok": true|false, "error": "...", "rss": <bytes>}
+const fs = require("fs");
+const readline = require("readline");
+const obj2gltf = require("obj2gltf");
+
+// stdout はジョブ応答専用にする
+console.log = console.error;
+const logger = (message) => process.stderr.write(`${message}\n`);
+
+function reply(message) {
+  const rss = process.memoryUsage().rss;
+  process.stdout.write(`${JSON.stringify({ ...message, rss })}\n`);
+}
+
+async function main() {
+  const lines = readline.createInterface({ input: process.stdin, crlfDelay: Infinity });
+  for await (const line of lines) {
+    if (!line.trim()) continue;
+    const job = JSON.parse(line);
+    try {
+      const result = await obj2gltf(job.input, { binary: job.binary, logger });
+      fs.writeFileSync(job.output, job.binary ? result : JSON.stringify(result));
+      reply({ id: job.id, ok: true });
+    } catch (error) {
+      reply({ id: job.id, ok: false, error: String((error && error.message) || error) });
+    }
+  }
+}
+
+main();
@@ -0,0 +1,55 @@
+import os
+from collections import deque
+
+import numpy as np
+
+
+def padding(length: int, alignment: int) -> int:
+    # length の後ろに必要な詰め物のバイト数（alignment の倍数に揃える）
+    return -length % alignment
+
+
+def _iov_max() -> int:
+    try:
+        return max(os.sysconf("SC_IOV_MAX"), 16)
+    except (AttributeError, ValueError, OSError):
+        return 1024
+
+
+def _fileno(file) -> int | None:
+    try:
+        return file.fileno()
+    except (AttributeError, OSError):
+        return None
+
+
+def write_buffers(file, buffers: list[memoryview]):
+    # 連結せずに各バッファをそのまま書き出す
+    # （writev 非対応環境やファイル記述子を持たないストリームは逐次 write）
+    fd = _fileno(file) if hasattr(os, "writev") else None
+    if fd is None:
+        for buffer in buffers:
+            file.write(buffer)
+        return
+
+    file.flush()
+    batch_size = _iov_max()
+    pending = deque(buffer for buffer in buffers if buffer.nbytes)
+    while pending:
+        batch = [pending[i] for i in range(min(batch_size, len(pending)))]
+        written = os.writev(fd, batch)
+        while written:
+            head = pending[0]
+            if written >= head.nbytes:
+                written -= head.nbytes
+                pending.popleft()
+            else:
+                pending[0] = head[written:]
+                written = 0
+
+
+def as_bytes(data) -> memoryview:
+    # ndarray はリトルエンディアンの連続配列に揃え、バイト列のビューとして返す
+    if isinstance(data, np.ndarray):
+        data = np.ascontiguousarray(data, dtype=data.dtype.newbyteorder("<"))
+    return memoryview(data).cast("B")
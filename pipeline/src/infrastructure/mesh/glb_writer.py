@@ -0,0 +1,228 @@
+import base64
+import json
+import struct
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Iterator
+
+import numpy as np
+
+from src.infrastructure.mesh.binary_io import as_bytes, padding, write_buffers
+
+GLB_MAGIC = 0x46546C67
+GLB_VERSION = 2
+CHUNK_JSON = 0x4E4F534A
+CHUNK_BIN = 0x004E4942
+
+ARRAY_BUFFER = 34962
+ELEMENT_ARRAY_BUFFER = 34963
+
+COMPONENT_TYPES = {
+    np.dtype(np.int8): 5120,
+    np.dtype(np.uint8): 5121,
+    np.dtype(np.int16): 5122,
+    np.dtype(np.uint16): 5123,
+    np.dtype(np.uint32): 5125,
+    np.dtype(np.float32): 5126,
+}
+ACCESSOR_TYPES = {1: "SCALAR", 2: "VEC2", 3: "VEC3", 4: "VEC4", 16: "MAT4"}
+
+_ALIGNMENT = 4
+_ZEROS = bytes(_ALIGNMENT)
+
+# StreamedArray を変換・書き出しする 1 ブロックの大きさ（出力側のバイト数）
+STREAM_BLOCK_SIZE = 4 * 1024 * 1024
+
+
+class StreamedArray:
+    """書き出し時にブロックごとに変換して BIN チャンクへ書き込む配列。
+
+    量子化・インデックスの型の詰め直しなどの変換結果は全体を作らず、
+    レイアウトの計算（min/max）と書き出しのそれぞれで元の配列（.mesh の
+    memmap 等）をブロック単位で変換する。長さと dtype は変換前に決まっている
+    必要がある。
+    """
+
+    def __init__(
+        self,
+        source: np.ndarray,
+        convert: Callable[[np.ndarray], np.ndarray],
+        dtype,
+        width: int | None = None,
+        block_size: int = STREAM_BLOCK_SIZE,
+    ):
+        self.source = source
+        self.convert = convert
+        self.dtype = np.dtype(dtype)
+        self.shape = (len(source),) if width is None else (len(source), width)
+        self.ndim = len(self.shape)
+        self.nbytes = int(np.prod(self.shape)) * self.dtype.itemsize
+        row_bytes = self.dtype.itemsize * (width or 1)
+        self.block_rows = max(block_size // row_bytes, 1)
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def blocks(self) -> Iterator[np.ndarray]:
+        for start in range(0, len(self), self.block_rows):
+            block = self.convert(self.source[start : start + self.block_rows])
+            if block.dtype != self.dtype or block.shape[1:] != self.shape[1:]:
+                raise ValueError(
+                    f"streamed block {block.dtype}{block.shape} does not match "
+                    f"{self.dtype}{self.shape}"
+                )
+            yield block
+
+
+def _bounds(
+    array: "np.ndarray | StreamedArray", components: int
+) -> tuple[np.ndarray, np.ndarray]:
+    # components 列目までの最小・最大（StreamedArray はブロックごとに求める）
+    blocks = array.blocks() if isinstance(array, StreamedArray) else [array]
+    lows, highs = [], []
+    for block in blocks:
+        values = block if block.ndim == 1 else block[:, :components]
+        lows.append(values.min(axis=0))
+        highs.append(values.max(axis=0))
+    return np.min(lows, axis=0), np.max(highs, axis=0)
+
+
+def _write_parts(file, parts: "list[memoryview | StreamedArray]"):
+    # メモリ上のバッファはまとめて書き出し、StreamedArray はブロックごとに変換して書く
+    pending: list[memoryview] = []
+    for part in parts:
+        if isinstance(part, StreamedArray):
+            write_buffers(file, pending)
+            pending = []
+            for block in part.blocks():
+                write_buffers(file, [as_bytes(block)])
+        else:
+            pending.append(part)
+    write_buffers(file, pending)
+
+
+class GlbWriter:
+    """glTF の JSON と型付き配列から GLB を組み立てる。
+
+    追加された配列は参照のまま保持し、書き出し時に 1 つの bytearray へ
+    連結せずファイルへ直接書き込むため、ピークメモリはペイロード程度に収まる。
+    StreamedArray は追加時に長さ・min/max だけを求めて（1 パス目）、書き出し時に
+    ブロックごとに変換しながら書き込む（2 パス目）。元の配列が .mesh の memmap
+    であれば、メモリに載らない大きさのメッシュも一定のメモリで書き出せる。
+    """
+
+    def __init__(self, gltf: dict[str, Any]):
+        self.gltf = gltf
+        self.gltf.setdefault("accessors", [])
+        self.gltf.setdefault("bufferViews", [])
+        self._views: list[memoryview | StreamedArray] = []
+        self._byte_length = 0
+
+    @property
+    def byte_length(self) -> int:
+        return self._byte_length
+
+    def add_buffer_view(
+        self, data, target: int | None = None, byte_stride: int | None = None
+    ) -> int:
+        view = data if isinstance(data, StreamedArray) else as_bytes(data)
+        pad = padding(self._byte_length, _ALIGNMENT)
+        if pad:
+            self._views.append(memoryview(_ZEROS[:pad]))
+            self._byte_length += pad
+
+        buffer_view: dict[str, Any] = {
+            "buffer": 0,
+            "byteOffset": self._byte_length,
+            "byteLength": view.nbytes,
+        }
+        if byte_stride is not None:
+            buffer_view["byteStride"] = byte_stride
+        if target is not None:
+            buffer_view["target"] = target
+        self._views.append(view)
+        self._byte_length += view.nbytes
+
+        self.gltf["bufferViews"].append(buffer_view)
+        return len(self.gltf["bufferViews"]) - 1
+
+    def add_accessor(
+        self,
+        array: np.ndarray | StreamedArray,
+        target: int | None = None,
+        bounds: bool = False,
+        normalized: bool = False,
+        components: int | None = None,
+    ) -> int:
+        # components が列数より少ない場合、残りの列は 4 バイト境界に揃えるための
+        # 詰め物として byteStride で読み飛ばす
+        width = 1 if array.ndim == 1 else array.shape[1]
+        components = components or width
+        byte_stride = None
+        if components != width:
+            byte_stride = width * array.dtype.itemsize
+        accessor: dict[str, Any] = {
+            "bufferView": self.add_buffer_view(array, target, byte_stride),
+            "componentType": COMPONENT_TYPES[array.dtype],
+            "count": len(array),
+            "type": ACCESSOR_TYPES[components],
+        }
+        if normalized:
+            accessor["normalized"] = True
+        if bounds and len(array):
+            low, high = _bounds(array, components)
+            accessor["min"] = np.atleast_1d(low).tolist()
+            accessor["max"] = np.atleast_1d(high).tolist()
+
+        self.gltf["accessors"].append(accessor)
+        return len(self.gltf["accessors"]) - 1
+
+    def write(self, output_path: str | Path):
+        with open(output_path, "wb") as file:
+            self.write_to(file)
+        return output_path
+
+    def write_to(self, file: BinaryIO):
+        # ファイル以外の書き込み先（オブジェクトストレージへのアップロード等）にも書ける
+        if self._byte_length:
+            self.gltf["buffers"] = [{"byteLength": self._byte_length}]
+        json_bytes = json.dumps(self.gltf, separators=(",", ":")).encode("utf-8")
+        json_bytes += b" " * padding(len(json_bytes), _ALIGNMENT)
+        bin_pad = padding(self._byte_length, _ALIGNMENT)
+        bin_length = self._byte_length + bin_pad
+
+        file_length = 12 + 8 + len(json_bytes)
+        if bin_length:
+            file_length += 8 + bin_length
+
+        parts: list[memoryview | StreamedArray] = [
+            memoryview(struct.pack("<III", GLB_MAGIC, GLB_VERSION, file_length)),
+            memoryview(struct.pack("<II", len(json_bytes), CHUNK_JSON)),
+            memoryview(json_bytes),
+        ]
+        if bin_length:
+            parts.append(memoryview(struct.pack("<II", bin_length, CHUNK_BIN)))
+            parts.extend(self._views)
+            parts.append(memoryview(_ZEROS[:bin_pad]))
+
+        _write_parts(file, parts)
+
+    def _payload(self) -> Iterator[memoryview]:
+        for view in self._views:
+            if isinstance(view, StreamedArray):
+                yield from (as_bytes(block) for block in view.blocks())
+            else:
+                yield view
+
+    def write_gltf(self, output_path: str | Path):
+        # .gltf（JSON）出力。バッファは data URI として埋め込む
+        if self._byte_length:
+            encoded = base64.b64encode(b"".join(self._payload())).decode("ascii")
+            self.gltf["buffers"] = [
+                {
+                    "byteLength": self._byte_length,
+                    "uri": f"data:application/octet-stream;base64,{encoded}",
+                }
+            ]
+        with open(output_path, "w", encoding="utf-8") as file:
+            json.dump(self.gltf, file, separators=(",", ":"))
+        return output_path
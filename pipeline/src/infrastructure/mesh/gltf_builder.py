@@ -0,0 +1,381 @@
+import hashlib
+import itertools
+import logging
+import mmap
+from pathlib import Path
+from typing import Any, Iterable
+
+import numpy as np
+
+from src.infrastructure.mesh.glb_writer import (
+    ARRAY_BUFFER,
+    ELEMENT_ARRAY_BUFFER,
+    GlbWriter,
+    StreamedArray,
+)
+from src.infrastructure.mesh.mtl_parser import Opener
+from src.infrastructure.mesh.quantization import (
+    KHR_MESH_QUANTIZATION,
+    PositionQuantization,
+    index_dtype,
+    quantize_normals,
+    texcoords_in_unit_range,
+    unorm16_texcoords,
+)
+from src.infrastructure.mesh.texture_transcoder import (
+    TEXTURE_EXTENSIONS,
+    TextureTranscoder,
+)
+from src.infrastructure.monitoring.conversion_metrics import stage
+
+logger = logging.getLogger(__name__)
+
+GENERATOR = "Python OBJ to GLB Converter"
+DEFAULT_SAMPLER = {"magFilter": 9729, "minFilter": 9987}
+
+MaterialGroups = dict[str, dict[str, np.ndarray]]
+
+
+# -- テクスチャ画像の読み込み --------------
+def _mime_type(filepath: str | Path, data) -> str:
+    # 拡張子よりも先頭のシグネチャを優先する（拡張子の誤りに強くする）
+    head = bytes(memoryview(data)[:12])
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    return "image/png" if str(filepath).lower().endswith(".png") else "image/jpeg"
+
+
+def _read_local(filepath: str) -> bytes | mmap.mmap:
+    # ローカルファイルはメモリマップし、GLB 書き出し時にページから直接書き込む
+    with open(filepath, "rb") as f:
+        if not f.seek(0, 2):
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def read_image(
+    filepath: str | Path, opener: Opener | None = None
+) -> tuple[bytes | mmap.mmap, str] | None:
+    """テクスチャ画像の内容と MIME タイプを返す（読めない場合は None）。"""
+    try:
+        if opener is None:
+            data = _read_local(str(filepath))
+        else:
+            with opener(str(filepath)) as f:
+                data = f.read()
+    except FileNotFoundError:
+        logger.warning("texture file not found: %s", filepath)
+        return None
+    except OSError as e:
+        logger.error("failed to read texture file %s: %s", filepath, e)
+        return None
+    return data, _mime_type(filepath, data)
+
+
+class TextureTable:
+    """画像を BIN チャンクの bufferView として追加し、テクスチャ番号を返す。
+
+    同じファイルは 1 度だけ読み、内容が同じ画像（別名のコピー等）は
+    SHA-256 で判定して 1 つの image・texture を共有する。transcoder を
+    渡すと、読み込んだ画像をまとめて縮小・再エンコードしてから埋め込む。
+    """
+
+    def __init__(
+        self,
+        writer: GlbWriter,
+        opener: Opener | None = None,
+        transcoder: TextureTranscoder | None = None,
+    ):
+        self.writer = writer
+        self.opener = opener
+        self.transcoder = transcoder
+        self._digests: dict[str, str | None] = {}
+        self._images: dict[str, tuple[Any, str]] = {}
+        self._textures: dict[str, int] = {}
+
+    def load(self, filepaths: Iterable[str | Path]):
+        # 変換をプロセスプールで並列に行えるよう、先に全画像を読んでおく
+        loaded = {}
+        for filepath in filepaths:
+            key = str(filepath)
+            if key in self._digests:
+                continue
+            image = read_image(filepath, self.opener)
+            if image is None:
+                self._digests[key] = None
+                continue
+            digest = hashlib.sha256(image[0]).hexdigest()
+            self._digests[key] = digest
+            if digest not in self._images:
+                loaded[digest] = image
+        if self.transcoder is not None and loaded:
+            results = self.transcoder.transcode_all(
+                (digest, data, mime_type)
+                for digest, (data, mime_type) in loaded.items()
+            )
+            loaded = {digest: results[digest] for digest in loaded}
+        self._images.update(loaded)
+
+    def texture_for(self, filepath: str | Path) -> int | None:
+        self.load([filepath])
+        digest = self._digests[str(filepath)]
+        if digest is None:
+            return None
+        if digest not in self._textures:
+            self._textures[digest] = self._add(*self._images[digest])
+        return self._textures[digest]
+
+    def _add(self, data, mime_type: str) -> int:
+        gltf = self.writer.gltf
+        gltf.setdefault("images", []).append(
+            {"bufferView": self.writer.add_buffer_view(data), "mimeType": mime_type}
+        )
+        image = len(gltf["images"]) - 1
+        texture: dict[str, Any] = {"sampler": 0}
+        extension = TEXTURE_EXTENSIONS.get(mime_type)
+        if extension is None:
+            texture["source"] = image
+        else:
+            # WebP・KTX2 は代替画像を持たないため拡張を必須にする
+            texture["extensions"] = {extension: {"source": image}}
+            _require_extension(gltf, extension)
+        gltf.setdefault("textures", []).append(texture)
+        return len(gltf["textures"]) - 1
+
+
+def _require_extension(gltf: dict[str, Any], extension: str):
+    for key in ("extensionsUsed", "extensionsRequired"):
+        extensions = gltf.setdefault(key, [])
+        if extension not in extensions:
+            extensions.append(extension)
+
+
+# -- マテリアルとテクスチャ --------------
+def _add_materials(
+    gltf: dict[str, Any],
+    mtl_data: dict[str, dict],
+    material_groups: MaterialGroups,
+    textures: TextureTable,
+) -> dict[str, int]:
+    material_map = {}
+    for name, props in mtl_data.items():
+        gltf_mat = {
+            "pbrMetallicRoughness": props["pbrMetallicRoughness"].copy(),
+            "emissiveFactor": props["emissiveFactor"].copy(),
+            "alphaMode": props["alphaMode"],
+            "doubleSided": props["doubleSided"],
+        }
+
+        if "texture_path" in props:
+            texture = textures.texture_for(props["texture_path"])
+            if texture is not None:
+                gltf_mat["pbrMetallicRoughness"]["baseColorTexture"] = {
+                    "index": texture
+                }
+
+        material_map[name] = len(gltf["materials"])
+        gltf["materials"].append(gltf_mat)
+
+    # MTL に定義の無いマテリアルは既定の白っぽいマテリアルを割り当てる
+    for name in material_groups:
+        if name not in material_map:
+            material_map[name] = len(gltf["materials"])
+            gltf["materials"].append(
+                {
+                    "pbrMetallicRoughness": {"baseColorFactor": [0.8, 0.8, 0.8, 1.0]},
+                    "doubleSided": True,
+                }
+            )
+    return material_map
+
+
+# -- プリミティブ --------------
+# 変換後の属性・インデックスは StreamedArray とし、GLB の書き出し時に
+# ブロックごとに作る（元の配列が memmap ならメッシュ全体をメモリに載せない）
+def _compact_indices(indices: np.ndarray) -> np.ndarray | StreamedArray:
+    dtype = index_dtype(indices)
+    if dtype == indices.dtype:
+        return indices
+    return StreamedArray(indices, lambda block: block.astype(dtype), dtype)
+
+
+def _add_primitive(
+    writer: GlbWriter,
+    group: dict[str, np.ndarray],
+    material: int,
+    quantization: PositionQuantization | None = None,
+):
+    if quantization is None:
+        attributes = {
+            "POSITION": writer.add_accessor(
+                group["vertices"], ARRAY_BUFFER, bounds=True
+            )
+        }
+        if group["normals"].size:
+            attributes["NORMAL"] = writer.add_accessor(group["normals"], ARRAY_BUFFER)
+        if group["texcoords"].size:
+            attributes["TEXCOORD_0"] = writer.add_accessor(
+                group["texcoords"], ARRAY_BUFFER
+            )
+    else:
+        attributes = _add_quantized_attributes(writer, group, quantization)
+    return {
+        "attributes": attributes,
+        "material": material,
+        "indices": writer.add_accessor(
+            _compact_indices(group["indices"]), ELEMENT_ARRAY_BUFFER, bounds=True
+        ),
+    }
+
+
+def _add_quantized_attributes(
+    writer: GlbWriter,
+    group: dict[str, np.ndarray],
+    quantization: PositionQuantization,
+) -> dict[str, int]:
+    # KHR_mesh_quantization: 座標 int16、法線 int8（正規化）、UV uint16（正規化）
+    attributes = {
+        "POSITION": writer.add_accessor(
+            StreamedArray(group["vertices"], quantization.apply, np.int16, 4),
+            ARRAY_BUFFER,
+            bounds=True,
+            components=3,
+        )
+    }
+    if group["normals"].size:
+        attributes["NORMAL"] = writer.add_accessor(
+            StreamedArray(group["normals"], quantize_normals, np.int8, 4),
+            ARRAY_BUFFER,
+            normalized=True,
+            components=3,
+        )
+    if group["texcoords"].size:
+        if texcoords_in_unit_range(group["texcoords"]):
+            attributes["TEXCOORD_0"] = writer.add_accessor(
+                StreamedArray(group["texcoords"], unorm16_texcoords, np.uint16, 2),
+                ARRAY_BUFFER,
+                normalized=True,
+            )
+        else:
+            attributes["TEXCOORD_0"] = writer.add_accessor(
+                group["texcoords"], ARRAY_BUFFER
+            )
+    return attributes
+
+
+# -- ルートノードの変換 --------------
+def transformed_bounds(
+    minimum, maximum, matrix: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    # 箱の 8 隅だけを変換して軸平行な範囲を求める（頂点は走査しない）
+    corners = np.array(list(itertools.product(*zip(minimum, maximum))), dtype=float)
+    points = corners @ matrix[:3, :3].T + matrix[:3, 3]
+    return points.min(axis=0), points.max(axis=0)
+
+
+def _node_matrix(node: dict[str, Any]) -> np.ndarray:
+    matrix = np.diag([*node.get("scale", [1.0, 1.0, 1.0]), 1.0])
+    matrix[:3, 3] = node.get("translation", [0.0, 0.0, 0.0])
+    return matrix
+
+
+def _add_root_transform(gltf: dict[str, Any], matrix: np.ndarray):
+    # 上方向・単位の変換はメッシュのノードを子に持つルートノードの matrix に置き、
+    # 頂点データはそのまま残す。accessor の min/max も元の座標系のまま
+    # （glTF の仕様どおり）で、シーン全体の範囲は extras.bounds に記録する
+    mesh_node = gltf["nodes"][0]
+    root: dict[str, Any] = {
+        "name": "root",
+        # glTF の matrix は列優先
+        "matrix": matrix.T.ravel().tolist(),
+        "children": [1],
+    }
+    accessors = [
+        gltf["accessors"][primitive["attributes"]["POSITION"]]
+        for primitive in gltf["meshes"][0]["primitives"]
+    ]
+    if accessors:
+        minimum = np.min([accessor["min"][:3] for accessor in accessors], axis=0)
+        maximum = np.max([accessor["max"][:3] for accessor in accessors], axis=0)
+        lo, hi = transformed_bounds(minimum, maximum, matrix @ _node_matrix(mesh_node))
+        root["extras"] = {"bounds": {"min": lo.tolist(), "max": hi.tolist()}}
+    gltf["nodes"] = [root, mesh_node]
+
+
+def build_gltf(
+    material_groups: MaterialGroups,
+    mtl_data: dict[str, dict],
+    generator: str = GENERATOR,
+    opener: Opener | None = None,
+    quantize: bool = False,
+    transcoder: TextureTranscoder | None = None,
+    transform: np.ndarray | None = None,
+) -> GlbWriter:
+    gltf: dict[str, Any] = {
+        "asset": {"version": "2.0", "generator": generator},
+        "scene": 0,
+        "scenes": [{"nodes": [0]}],
+        "nodes": [{"mesh": 0}],
+        "meshes": [{"primitives": []}],
+        "materials": [],
+        "textures": [],
+        "images": [],
+        "samplers": [DEFAULT_SAMPLER.copy()],
+        "accessors": [],
+        "bufferViews": [],
+        "buffers": [],
+    }
+    # テクスチャは JSON に埋め込まず、頂点データより前に BIN チャンクへ置く
+    writer = GlbWriter(gltf)
+    textures = TextureTable(writer, opener, transcoder)
+    with stage("textures"):
+        textures.load(
+            props["texture_path"]
+            for props in mtl_data.values()
+            if "texture_path" in props
+        )
+    material_map = _add_materials(gltf, mtl_data, material_groups, textures)
+
+    quantization = None
+    if quantize:
+        quantization = PositionQuantization.fit(
+            group["vertices"] for group in material_groups.values()
+        )
+    if quantization is not None:
+        gltf["nodes"][0].update(quantization.node_transform())
+        _require_extension(gltf, KHR_MESH_QUANTIZATION)
+
+    primitives = gltf["meshes"][0]["primitives"]
+    for name, group in material_groups.items():
+        if group["indices"].size:
+            primitives.append(
+                _add_primitive(writer, group, material_map[name], quantization)
+            )
+    if transform is not None:
+        _add_root_transform(gltf, transform)
+    return writer
+
+
+def write_model(
+    material_groups: MaterialGroups,
+    mtl_data: dict[str, dict],
+    output_path: str | Path,
+    binary: bool = True,
+    generator: str = GENERATOR,
+    quantize: bool = False,
+    transcoder: TextureTranscoder | None = None,
+    transform: np.ndarray | None = None,
+):
+    writer = build_gltf(
+        material_groups,
+        mtl_data,
+        generator,
+        quantize=quantize,
+        transcoder=transcoder,
+        transform=transform,
+    )
+    if binary:
+        return writer.write(output_path)
+    return writer.write_gltf(output_path)
@@ -0,0 +1,204 @@
+import hashlib
+import json
+import os
+import struct
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from src.infrastructure.mesh.binary_io import as_bytes, padding, write_buffers
+from src.infrastructure.mesh.gltf_builder import MaterialGroups
+from src.infrastructure.mesh.obj_parser import build_material_groups, parse_obj
+
+# 解析済みメッシュの中間形式（.mesh）
+#   ヘッダー（32 バイト）: magic, version, マテリアル表の長さ, 配列領域の先頭, ファイル長
+#   マテリアル表: UTF-8 JSON（mtllib・メタデータ・LOD ごとのマテリアル別配列の位置）
+#   配列領域: float32 / uint32 のリトルエンディアン配列を 16 バイト境界に並べる
+MESH_MAGIC = b"SVMESH\0\0"
+MESH_VERSION = 1
+MESH_SUFFIX = ".mesh"
+ALIGNMENT = 16
+_HEADER = struct.Struct("<8sIIQQ")
+
+# 属性ごとの要素型（これ以外の属性も float32 として保存する）
+_DTYPES = {"indices": np.dtype("<u4")}
+_DEFAULT_DTYPE = np.dtype("<f4")
+
+
+@dataclass
+class MeshFile:
+    # levels: LOD ごとのマテリアル別配列（レベル 0 が元のメッシュ、読み取り専用の memmap）
+    levels: list[MaterialGroups]
+    mtllibs: list[str] = field(default_factory=list)
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def material_groups(self) -> MaterialGroups:
+        return self.levels[0] if self.levels else {}
+
+
+def _layout(
+    levels: list[MaterialGroups], start: int
+) -> tuple[list[list[dict[str, Any]]], list[np.ndarray], int]:
+    # 各配列の位置を start から 16 バイト境界に詰めて決め、(表, 配列, 終端) を返す
+    table = []
+    arrays = []
+    offset = start
+    for groups in levels:
+        entries = []
+        for material, group in groups.items():
+            positions = {}
+            for name, values in group.items():
+                values = np.ascontiguousarray(
+                    values, dtype=_DTYPES.get(name, _DEFAULT_DTYPE)
+                )
+                offset += padding(offset, ALIGNMENT)
+                positions[name] = {
+                    "dtype": values.dtype.str,
+                    "shape": list(values.shape),
+                    "offset": offset,
+                }
+                arrays.append(values)
+                offset += values.nbytes
+            entries.append({"material": material, "arrays": positions})
+        table.append(entries)
+    return table, arrays, offset
+
+
+def write_mesh_file(
+    path: str | Path,
+    levels: list[MaterialGroups],
+    mtllibs: list[str] | None = None,
+    metadata: dict[str, Any] | None = None,
+) -> Path:
+    """LOD ごとのマテリアル別配列を .mesh 形式で書き出す。
+
+    配列の位置はマテリアル表の長さに依存するため、表を 16 バイト単位に
+    切り上げた長さが変わらなくなるまで配置し直す。書き込みは同じディレクトリの
+    一時ファイルに行い、完了後に置き換える。
+    """
+    path = Path(path)
+    table_length = 0
+    while True:
+        start = _HEADER.size + table_length
+        table, arrays, end = _layout(levels, start)
+        encoded = json.dumps(
+            {"mtllibs": mtllibs or [], "metadata": metadata or {}, "levels": table},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+        if len(encoded) + padding(len(encoded), ALIGNMENT) == table_length:
+            break
+        table_length = len(encoded) + padding(len(encoded), ALIGNMENT)
+    encoded += b" " * (table_length - len(encoded))
+
+    buffers = [
+        memoryview(_HEADER.pack(MESH_MAGIC, MESH_VERSION, table_length, start, end)),
+        memoryview(encoded),
+    ]
+    offset = start
+    for values in arrays:
+        pad = padding(offset, ALIGNMENT)
+        buffers.append(memoryview(bytes(pad)))
+        if values.nbytes:
+            buffers.append(as_bytes(values))
+        offset += pad + values.nbytes
+
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=f".{path.name}.", suffix=".tmp", dir=path.parent
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write_buffers(f, buffers)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return path
+
+
+def read_mesh_file(path: str | Path) -> MeshFile:
+    """.mesh 形式を np.memmap で開き、各配列をコピーせずにビューとして返す。"""
+    data = np.memmap(path, dtype=np.uint8, mode="r")
+    if data.size < _HEADER.size:
+        raise ValueError(f"not a mesh file: {path}")
+    magic, version, table_length, start, end = _HEADER.unpack(
+        data[: _HEADER.size].tobytes()
+    )
+    if magic != MESH_MAGIC:
+        raise ValueError(f"not a mesh file: {path}")
+    if version != MESH_VERSION:
+        raise ValueError(f"unsupported mesh file version {version}: {path}")
+    if end != data.size or start != _HEADER.size + table_length:
+        raise ValueError(f"truncated mesh file: {path}")
+    index = json.loads(data[_HEADER.size : start].tobytes())
+
+    levels = []
+    for entries in index["levels"]:
+        groups = {}
+        for entry in entries:
+            group = {}
+            for name, position in entry["arrays"].items():
+                dtype = np.dtype(position["dtype"])
+                shape = tuple(position["shape"])
+                offset = position["offset"]
+                nbytes = dtype.itemsize * int(np.prod(shape))
+                if offset % ALIGNMENT or offset + nbytes > end:
+                    raise ValueError(f"corrupt mesh file: {path}")
+                group[name] = data[offset : offset + nbytes].view(dtype).reshape(shape)
+            groups[entry["material"]] = group
+        levels.append(groups)
+    return MeshFile(levels, index["mtllibs"], index["metadata"])
+
+
+# -- OBJ ごとの .mesh --------------
+def mesh_file_path(obj_path: str | Path, cache_dir: str | Path | None = None) -> Path:
+    # 既定は OBJ の隣（model.obj → model.mesh）
+    # cache_dir を指定した場合は OBJ の絶対パスごとに別名でそこへ置く
+    obj_path = Path(obj_path)
+    if cache_dir is None:
+        return obj_path.with_suffix(MESH_SUFFIX)
+    digest = hashlib.sha1(str(obj_path.resolve()).encode("utf-8")).hexdigest()
+    return Path(cache_dir) / f"{obj_path.stem}-{digest[:12]}{MESH_SUFFIX}"
+
+
+def _source_metadata(obj_path: Path, ear_clipping: bool) -> dict[str, Any]:
+    stat = obj_path.stat()
+    return {
+        "source": {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns},
+        "ear_clipping": ear_clipping,
+    }
+
+
+def load_mesh(
+    obj_path: str | Path,
+    ear_clipping: bool = False,
+    workers: int = 1,
+    cache_dir: str | Path | None = None,
+) -> MeshFile:
+    """OBJ の解析結果を返す。対応する .mesh が最新ならテキストを解析せずに開く。
+
+    .mesh が無いか、OBJ のサイズ・更新時刻・分割方法が記録と異なる場合は
+    解析してマテリアル別配列を作り、次回のために .mesh を書き出す。
+    """
+    obj_path = Path(obj_path)
+    path = mesh_file_path(obj_path, cache_dir)
+    metadata = _source_metadata(obj_path, ear_clipping)
+    try:
+        mesh = read_mesh_file(path)
+        if mesh.metadata == metadata:
+            return mesh
+    except (OSError, ValueError, KeyError):
+        pass
+    obj = parse_obj(obj_path, workers=workers)
+    groups = build_material_groups(obj, ear_clipping)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_mesh_file(path, [groups], obj.mtllibs, metadata)
+    except OSError:
+        # 書き込めないディレクトリでは毎回解析する
+        return MeshFile([groups], obj.mtllibs, metadata)
+    return read_mesh_file(path)
@@ -0,0 +1,226 @@
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CACHE_SIZE = 16
+
+
+# -- 頂点キャッシュ効率（ACMR） --------------
+def acmr(indices: np.ndarray, cache_size: int = CACHE_SIZE) -> float:
+    """FIFO 頂点キャッシュを模擬した三角形あたりの平均キャッシュミス数。"""
+    triangles = len(indices) // 3
+    if not triangles:
+        return 0.0
+    # FIFO では misses が cache_size 回進むと追い出されるため、挿入時点の
+    # ミス回数だけ覚えておけばキャッシュ内かどうか判定できる
+    inserted: dict[int, int] = {}
+    misses = 0
+    for vertex in indices.tolist():
+        stamp = inserted.get(vertex)
+        if stamp is None or misses - stamp >= cache_size:
+            inserted[vertex] = misses
+            misses += 1
+    return misses / triangles
+
+
+# -- Tipsify（頂点キャッシュ向けの三角形並べ替え） --------------
+def _adjacency(triangles: np.ndarray, vertex_count: int):
+    corners = triangles.ravel()
+    order = np.argsort(corners, kind="stable")
+    offsets = np.zeros(vertex_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(corners, minlength=vertex_count), out=offsets[1:])
+    return (order // 3).tolist(), offsets.tolist()
+
+
+class _Tipsify:
+    """Tipsify の走査状態。扇の出力と次の扇の中心の選択を分けて持つ。"""
+
+    def __init__(self, triangles: np.ndarray, vertex_count: int, cache_size: int):
+        self.triangles = triangles.tolist()
+        self.adjacency, self.offsets = _adjacency(triangles, vertex_count)
+        self.live = np.bincount(triangles.ravel(), minlength=vertex_count).tolist()
+        self.stamps = [0] * vertex_count
+        self.emitted = [False] * len(self.triangles)
+        self.dead_end: list[int] = []
+        self.order: list[int] = []
+        self.vertex_count = vertex_count
+        self.cache_size = cache_size
+        self.stamp = cache_size + 1
+        self.cursor = 0
+
+    def emit_fan(self, fan: int) -> list[int]:
+        # fan を共有する未出力の三角形を出力し、その頂点（次の中心の候補）を返す
+        candidates = []
+        for t in self.adjacency[self.offsets[fan] : self.offsets[fan + 1]]:
+            if self.emitted[t]:
+                continue
+            self.emitted[t] = True
+            self.order.append(t)
+            for v in self.triangles[t]:
+                self.dead_end.append(v)
+                candidates.append(v)
+                self.live[v] -= 1
+                if self.stamp - self.stamps[v] > self.cache_size:
+                    self.stamps[v] = self.stamp
+                    self.stamp += 1
+        return candidates
+
+    def best_candidate(self, candidates: list[int]) -> int:
+        # キャッシュに残っていて、使い切れる頂点を優先する
+        fan, best = -1, -1
+        for v in candidates:
+            if self.live[v] <= 0:
+                continue
+            age = self.stamp - self.stamps[v]
+            priority = age if age + 2 * self.live[v] <= self.cache_size else 0
+            if priority > best:
+                fan, best = v, priority
+        return fan
+
+    def skip_dead_end(self) -> int:
+        # 候補が無ければ直近に出力した頂点のうち、まだ使う三角形が残るもの
+        while self.dead_end:
+            v = self.dead_end.pop()
+            if self.live[v] > 0:
+                return v
+        return -1
+
+    def next_unused(self) -> int:
+        # それも無ければ頂点番号順に、未出力の三角形を持つ頂点
+        while self.cursor < self.vertex_count and self.live[self.cursor] <= 0:
+            self.cursor += 1
+        return self.cursor if self.cursor < self.vertex_count else -1
+
+
+def optimize_vertex_cache(
+    indices: np.ndarray, vertex_count: int, cache_size: int = CACHE_SIZE
+) -> tuple[np.ndarray, np.ndarray]:
+    """Tipsify (Sander et al. 2007) で三角形を並べ替える。
+
+    戻り値は並べ替えたインデックスと、キャッシュが途切れた位置（クラスタの
+    先頭三角形番号）。クラスタは overdraw 最適化の単位として使う。
+    """
+    triangles = indices.reshape(-1, 3)
+    state = _Tipsify(triangles, vertex_count, cache_size)
+    clusters = [0] if len(triangles) else []
+    fan = 0 if len(triangles) else -1
+    while fan >= 0:
+        fan = state.best_candidate(state.emit_fan(fan))
+        if fan >= 0:
+            continue
+        # キャッシュが途切れたので新しいクラスタを始める
+        fan = state.skip_dead_end()
+        if fan < 0:
+            fan = state.next_unused()
+        if fan >= 0:
+            clusters.append(len(state.order))
+
+    reordered = triangles[np.asarray(state.order, dtype=np.int64)]
+    return reordered.ravel(), np.asarray(clusters, dtype=np.int64)
+
+
+# -- Overdraw（外向きのクラスタを先に描画） --------------
+def optimize_overdraw(
+    indices: np.ndarray, positions: np.ndarray, clusters: np.ndarray
+) -> np.ndarray:
+    """クラスタ単位で、メッシュ中心から外を向くものほど先に描くよう並べる。
+
+    クラスタ内の順序は保つため、頂点キャッシュ効率はほぼ変わらない。
+    """
+    triangles = indices.reshape(-1, 3)
+    if len(clusters) <= 1:
+        return indices
+    corners = positions[triangles].astype(np.float64)
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    areas = np.linalg.norm(normals, axis=1)
+    centroids = corners.mean(axis=1)
+
+    cluster_of = np.repeat(
+        np.arange(len(clusters)), np.diff(np.append(clusters, len(triangles)))
+    )
+    weight = np.maximum(np.bincount(cluster_of, weights=areas), 1e-30)
+    cluster_normal = np.column_stack(
+        [np.bincount(cluster_of, weights=normals[:, i]) for i in range(3)]
+    )
+    cluster_center = (
+        np.column_stack(
+            [np.bincount(cluster_of, weights=centroids[:, i] * areas) for i in range(3)]
+        )
+        / weight[:, None]
+    )
+    mesh_center = (centroids * areas[:, None]).sum(axis=0) / max(areas.sum(), 1e-30)
+
+    score = np.einsum("ij,ij->i", cluster_center - mesh_center, cluster_normal)
+    cluster_order = np.argsort(-score, kind="stable")
+    triangle_order = np.argsort(
+        np.argsort(cluster_order, kind="stable")[cluster_of], kind="stable"
+    )
+    return triangles[triangle_order].ravel()
+
+
+# -- 頂点フェッチ順 --------------
+def optimize_vertex_fetch(
+    group: dict[str, np.ndarray],
+) -> dict[str, np.ndarray]:
+    """インデックスから初めて参照される順に頂点を並べ直す（未使用頂点は除く）。"""
+    indices = group["indices"]
+    unique, first = np.unique(indices, return_index=True)
+    used = unique[np.argsort(first, kind="stable")]
+    remap = np.zeros(len(group["vertices"]), dtype=np.int64)
+    remap[used] = np.arange(len(used))
+
+    result = {
+        key: values[used] if len(values) else values
+        for key, values in group.items()
+        if key != "indices"
+    }
+    result["indices"] = remap[indices].astype(indices.dtype)
+    return result
+
+
+# -- まとめて最適化 --------------
+def optimize_group(
+    group: dict[str, np.ndarray], cache_size: int = CACHE_SIZE
+) -> tuple[dict[str, np.ndarray], dict[str, float]]:
+    indices = group["indices"]
+    before = acmr(indices, cache_size)
+    reordered, clusters = optimize_vertex_cache(
+        indices, len(group["vertices"]), cache_size
+    )
+    reordered = optimize_overdraw(reordered, group["vertices"], clusters)
+    optimized = optimize_vertex_fetch({**group, "indices": reordered})
+    after = acmr(reordered, cache_size)
+    return optimized, {"acmr_before": before, "acmr_after": after}
+
+
+def optimize_material_groups(
+    material_groups: dict[str, dict[str, np.ndarray]],
+    cache_size: int = CACHE_SIZE,
+) -> tuple[dict[str, dict[str, np.ndarray]], dict[str, float]]:
+    optimized = {}
+    triangles = 0
+    before = after = 0.0
+    for name, group in material_groups.items():
+        if not group["indices"].size:
+            optimized[name] = group
+            continue
+        optimized[name], stats = optimize_group(group, cache_size)
+        count = len(group["indices"]) // 3
+        triangles += count
+        before += stats["acmr_before"] * count
+        after += stats["acmr_after"] * count
+
+    report = {
+        "triangles": triangles,
+        "acmr_before": before / triangles if triangles else 0.0,
+        "acmr_after": after / triangles if triangles else 0.0,
+    }
+    logger.info(
+        "vertex cache optimization: %d triangles, ACMR %.3f -> %.3f",
+        triangles,
+        report["acmr_before"],
+        report["acmr_after"],
+    )
+    return optimized, report
@@ -0,0 +1,76 @@
+import os
+from pathlib import Path, PurePath
+from typing import Any, BinaryIO, Callable, ContextManager, Iterable
+
+# 相対パス（オブジェクト名）からバイナリストリームを開く関数。存在しない場合は
+# FileNotFoundError を送出する（既定はローカルファイルの open）
+Opener = Callable[[str], ContextManager[BinaryIO]]
+
+
+def default_material() -> dict[str, Any]:
+    return {
+        "pbrMetallicRoughness": {
+            "baseColorFactor": [0.8, 0.8, 0.8, 1.0],
+            "metallicFactor": 0.0,
+            "roughnessFactor": 0.8,
+        },
+        "emissiveFactor": [0.0, 0.0, 0.0],
+        "alphaMode": "OPAQUE",
+        "doubleSided": True,
+    }
+
+
+def _set_alpha(material: dict[str, Any], alpha: float):
+    material["pbrMetallicRoughness"]["baseColorFactor"][3] = alpha
+    if alpha < 1.0:
+        material["alphaMode"] = "BLEND"
+
+
+def _apply_statement(material: dict[str, Any], parts: list[str], obj_dir: Path):
+    cmd = parts[0]
+    pbr = material["pbrMetallicRoughness"]
+    if cmd == "Kd":
+        pbr["baseColorFactor"][:3] = [float(p) for p in parts[1:4]]
+    elif cmd == "Ke":
+        material["emissiveFactor"] = [float(p) for p in parts[1:4]]
+    elif cmd == "Ns":
+        shininess = float(parts[1])
+        pbr["roughnessFactor"] = (2 / (shininess + 2)) ** 0.5
+    elif cmd == "d":
+        _set_alpha(material, float(parts[1]))
+    elif cmd == "Tr":
+        _set_alpha(material, 1.0 - float(parts[1]))
+    elif cmd == "map_Kd":
+        material["texture_path"] = obj_dir / " ".join(parts[1:])
+
+
+def parse_mtl(lines: Iterable[str], obj_dir: str | PurePath) -> dict[str, dict]:
+    materials: dict[str, dict] = {}
+    current = None
+    for line in lines:
+        parts = line.strip().split()
+        if not parts:
+            continue
+        if parts[0] == "newmtl":
+            current = materials[parts[1]] = default_material()
+        elif current is not None:
+            _apply_statement(current, parts, Path(obj_dir))
+    return materials
+
+
+# -- MTL ファイル読込み（テクスチャ・発光対応） --------------
+def load_mtl_file(
+    mtl_file: str | PurePath, obj_dir: str | PurePath, opener: Opener | None = None
+) -> dict[str, dict]:
+    if opener is not None:
+        try:
+            with opener(str(mtl_file)) as stream:
+                text = stream.read().decode("utf-8")
+        except FileNotFoundError:
+            return {}
+        return parse_mtl(text.splitlines(), obj_dir)
+
+    if not mtl_file or not os.path.exists(mtl_file):
+        return {}
+    with open(mtl_file, "r", encoding="utf-8") as file:
+        return parse_mtl(file, obj_dir)
@@ -0,0 +1,627 @@
+import mmap
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable, Iterator
+
+import numpy as np
+
+CHUNK_SIZE = 16 * 1024 * 1024
+# これより小さいファイルはプロセス起動の方が高くつくため並列化しない
+PARALLEL_MIN_BYTES = 64 * 1024 * 1024
+
+_TAB = 0x09
+_NL = 0x0A
+_CR = 0x0D
+_SPACE = 0x20
+_SLASH = 0x2F
+
+# 行の種類（classify_lines の戻り値）
+LINE_OTHER, LINE_V, LINE_VT, LINE_VN, LINE_F, LINE_KEYWORD = range(6)
+
+
+@dataclass
+class ObjData:
+    # 頂点属性 (float32)。テクスチャ座標は glTF 向けに V を反転済み
+    positions: np.ndarray
+    texcoords: np.ndarray
+    normals: np.ndarray
+    # 面の頂点ごとの (v, vt, vn) インデックス。1 始まりの絶対値、0 は未指定
+    corners: np.ndarray
+    face_sizes: np.ndarray
+    face_materials: np.ndarray
+    material_names: list[str] = field(default_factory=lambda: ["default"])
+    mtllibs: list[str] = field(default_factory=list)
+
+
+# -- バイト列の一括処理ヘルパー --------------
+def _gather(buf: np.ndarray, starts: np.ndarray, stops: np.ndarray):
+    lengths = stops - starts
+    offsets = np.cumsum(lengths) - lengths
+    index = np.arange(int(lengths.sum())) + np.repeat(starts - offsets, lengths)
+    return buf[index], offsets
+
+
+def _token_starts(data: np.ndarray) -> np.ndarray:
+    solid = data > _SPACE
+    first = solid.copy()
+    first[1:] &= ~solid[:-1]
+    return first
+
+
+def read_values(buf, starts, stops) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # 行ごとの数値を連結した配列と、各行の数値の個数・先頭位置を返す
+    data, offsets = _gather(buf, starts, stops)
+    counts = np.add.reduceat(_token_starts(data), offsets, dtype=np.int64)
+    values = np.fromstring(data.tobytes(), dtype=np.float64, sep=" ")
+    if values.size != counts.sum():
+        raise ValueError("malformed vertex record in OBJ file")
+    return values, counts, np.cumsum(counts) - counts
+
+
+def _parse_floats(buf, starts, stops, width: int) -> np.ndarray:
+    values, counts, base = read_values(buf, starts, stops)
+    if (counts < width).any():
+        raise ValueError("malformed vertex record in OBJ file")
+    if (counts == width).all():
+        return values.reshape(-1, width)
+    return values[base[:, None] + np.arange(width)]
+
+
+def parse_faces(buf, starts, stops):
+    # f 行の頂点指定を解析し、角ごとの (v, vt, vn) 番号（省略は 0）と面ごとの角数を返す
+    data, offsets = _gather(buf, starts, stops)
+    first = _token_starts(data)
+    face_sizes = np.add.reduceat(first, offsets, dtype=np.int64)
+    token_ids = np.cumsum(first) - 1
+    n_tokens = int(face_sizes.sum())
+
+    # "v", "v/vt", "v//vn", "v/vt/vn" の書式をスラッシュの並びから判定する
+    slash = data == _SLASH
+    following = np.empty_like(data)
+    following[:-1] = data[1:]
+    following[-1] = _NL
+    slashes = np.bincount(token_ids[slash], minlength=n_tokens)
+    double = np.bincount(token_ids[slash & (following == _SLASH)], minlength=n_tokens)
+    trailing = np.bincount(token_ids[slash & (following <= _SPACE)], minlength=n_tokens)
+
+    data[slash] = _SPACE
+    numbers = np.fromstring(data.tobytes(), dtype=np.int64, sep=" ")
+    per_corner = slashes + 1 - double - trailing
+    if numbers.size != per_corner.sum():
+        raise ValueError("malformed face record in OBJ file")
+    base = np.cumsum(per_corner) - per_corner
+
+    has_vt = (slashes >= 1) & (double == 0) & ~((slashes == 1) & (trailing == 1))
+    has_vn = (slashes == 2) & (trailing == 0)
+    corners = np.zeros((n_tokens, 3), dtype=np.int64)
+    corners[:, 0] = numbers[base]
+    corners[has_vt, 1] = numbers[base[has_vt] + 1]
+    corners[has_vn, 2] = numbers[base[has_vn] + per_corner[has_vn] - 1]
+    return corners, face_sizes
+
+
+def split_lines(chunk: bytes):
+    # 改行で終わるブロックを行に分け、各行の先頭（インデントを除く）と末尾を返す
+    # （CR・タブは空白に置き換えたコピーを返す）
+    buf = np.frombuffer(chunk, dtype=np.uint8).copy()
+    buf[(buf == _CR) | (buf == _TAB)] = _SPACE
+    ends = np.flatnonzero(buf == _NL)
+    starts = np.empty_like(ends)
+    if ends.size:
+        starts[0] = 0
+        starts[1:] = ends[:-1] + 1
+    while True:
+        indent = (buf[starts] == _SPACE) & (starts < ends)
+        if not indent.any():
+            break
+        starts[indent] += 1
+    return buf, starts, ends
+
+
+def classify_lines(buf: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    # split_lines の各行の種類（LINE_*）を返す
+    last = buf.size - 1
+    c0 = buf[starts]
+    c1 = buf[np.minimum(starts + 1, last)]
+    c2 = buf[np.minimum(starts + 2, last)]
+    long_enough = (ends - starts) > 2
+
+    kinds = np.full(starts.size, LINE_OTHER, dtype=np.int8)
+    kinds[(c0 == ord("v")) & (c1 == _SPACE)] = LINE_V
+    kinds[(c0 == ord("v")) & (c1 == ord("t")) & (c2 == _SPACE) & long_enough] = LINE_VT
+    kinds[(c0 == ord("v")) & (c1 == ord("n")) & (c2 == _SPACE) & long_enough] = LINE_VN
+    kinds[(c0 == ord("f")) & (c1 == _SPACE)] = LINE_F
+    kinds[(c0 == ord("u")) | (c0 == ord("m"))] = LINE_KEYWORD
+    return kinds
+
+
+# -- チャンク単位のパーサー --------------
+class _ObjChunkParser:
+    """OBJ を改行で区切ったブロック単位で読み進める。
+
+    inherit_material=True の場合はファイル途中から読む前提で、最初の usemtl
+    までの面を -1（直前の範囲のマテリアルを引き継ぐ）とし、負の（相対）
+    インデックスだった位置を relative に記録する（並列パースの結合用）。
+    """
+
+    def __init__(self, inherit_material: bool = False) -> None:
+        self.positions: list[np.ndarray] = []
+        self.texcoords: list[np.ndarray] = []
+        self.normals: list[np.ndarray] = []
+        self.corners: list[np.ndarray] = []
+        self.face_sizes: list[np.ndarray] = []
+        self.face_materials: list[np.ndarray] = []
+        self.counts = {LINE_V: 0, LINE_VT: 0, LINE_VN: 0}
+        self.material_names = ["default"]
+        self.material_ids = {"default": 0}
+        self.current_material = -1 if inherit_material else 0
+        self.mtllibs: list[str] = []
+        self.relative: list[np.ndarray] | None = [] if inherit_material else None
+
+    def feed(self, chunk: bytes) -> None:
+        buf, starts, ends = split_lines(chunk)
+        if ends.size == 0:
+            return
+
+        kinds = classify_lines(buf, starts, ends)
+        line_no = np.arange(starts.size)
+        material_lines, material_seq = self._read_keywords(buf, starts, ends, kinds)
+
+        for kind, prefix, width, target in (
+            (LINE_V, 2, 3, self.positions),
+            (LINE_VT, 3, 2, self.texcoords),
+            (LINE_VN, 3, 3, self.normals),
+        ):
+            mask = kinds == kind
+            if mask.any():
+                values = _parse_floats(
+                    buf, starts[mask] + prefix, ends[mask] + 1, width
+                )
+                if kind == LINE_VT:
+                    values[:, 1] = 1.0 - values[:, 1]
+                target.append(values.astype(np.float32))
+
+        faces = kinds == LINE_F
+        if faces.any():
+            corners, sizes = parse_faces(buf, starts[faces] + 2, ends[faces] + 1)
+            face_lines = line_no[faces]
+            if self.relative is not None:
+                self.relative.append(corners < 0)
+            for column, kind in enumerate((LINE_V, LINE_VT, LINE_VN)):
+                self._resolve_relative(
+                    corners[:, column], sizes, face_lines, kinds, kind
+                )
+            self.corners.append(corners.astype(np.int32))
+            self.face_sizes.append(sizes.astype(np.int32))
+            self.face_materials.append(
+                material_seq[np.searchsorted(material_lines, face_lines)]
+            )
+        self.current_material = int(material_seq[-1])
+
+        for kind in self.counts:
+            self.counts[kind] += int(np.count_nonzero(kinds == kind))
+
+    def _read_keywords(self, buf, starts, ends, kinds):
+        material_lines = []
+        material_seq = [self.current_material]
+        for line in np.flatnonzero(kinds == LINE_KEYWORD).tolist():
+            text = buf[starts[line] : ends[line]].tobytes().decode("utf-8")
+            parts = text.split()
+            if len(parts) < 2:
+                continue
+            if parts[0] == "usemtl":
+                name = parts[1]
+                if name not in self.material_ids:
+                    self.material_ids[name] = len(self.material_names)
+                    self.material_names.append(name)
+                material_lines.append(line)
+                material_seq.append(self.material_ids[name])
+            elif parts[0] == "mtllib":
+                self.mtllibs.append(text.split(None, 1)[1].strip())
+        return np.array(material_lines, dtype=np.int64), np.array(
+            material_seq, dtype=np.int32
+        )
+
+    def _resolve_relative(self, column, sizes, face_lines, kinds, kind):
+        negative = column < 0
+        if not negative.any():
+            return
+        # 負のインデックスはその行までに定義された要素数からの相対位置
+        defined = np.flatnonzero(kinds == kind)
+        before = self.counts[kind] + np.searchsorted(defined, face_lines)
+        column[negative] += np.repeat(before, sizes)[negative] + 1
+
+    def result(self) -> ObjData:
+        return ObjData(
+            positions=_concat(self.positions, (0, 3), np.float32),
+            texcoords=_concat(self.texcoords, (0, 2), np.float32),
+            normals=_concat(self.normals, (0, 3), np.float32),
+            corners=_concat(self.corners, (0, 3), np.int32),
+            face_sizes=_concat(self.face_sizes, (0,), np.int32),
+            face_materials=_concat(self.face_materials, (0,), np.int32),
+            material_names=self.material_names,
+            mtllibs=self.mtllibs,
+        )
+
+
+def _concat(parts: list[np.ndarray], empty_shape, dtype) -> np.ndarray:
+    if not parts:
+        return np.empty(empty_shape, dtype=dtype)
+    return np.ascontiguousarray(np.concatenate(parts), dtype=dtype)
+
+
+# -- OBJ ファイル読込み --------------
+def parse_obj(
+    obj_file: str | Path | BinaryIO, chunk_size: int = CHUNK_SIZE, workers: int = 1
+) -> ObjData:
+    # パスの代わりに読み出し可能なストリーム（オブジェクトストレージの応答など）も受け付ける
+    # workers > 1 かつ十分大きいファイルはマルチプロセスで解析する（パス指定時のみ）
+    if isinstance(obj_file, (str, Path)):
+        if workers > 1 and os.path.getsize(obj_file) >= PARALLEL_MIN_BYTES:
+            return parse_obj_parallel(obj_file, workers, chunk_size)
+        with open(obj_file, "rb") as file:
+            return _parse_stream(file, chunk_size)
+    return _parse_stream(obj_file, chunk_size)
+
+
+def _parse_stream(file: BinaryIO, chunk_size: int) -> ObjData:
+    parser = _ObjChunkParser()
+    _feed_blocks(parser, iter(lambda: file.read(chunk_size), b""))
+    return parser.result()
+
+
+def _feed_blocks(parser: _ObjChunkParser, blocks: Iterable[bytes]):
+    for block in line_blocks(blocks):
+        parser.feed(block)
+
+
+def line_blocks(blocks: Iterable[bytes]) -> Iterator[bytes]:
+    # ブロックを改行位置で切り、行をまたぐ残りは次のブロックの先頭に回す
+    # （最後の行に改行が無い場合は補う）
+    remainder = b""
+    for block in blocks:
+        block = remainder + block
+        cut = block.rfind(b"\n") + 1
+        if cut == 0:
+            remainder = block
+            continue
+        yield block[:cut]
+        remainder = block[cut:]
+    if remainder:
+        yield remainder + b"\n"
+
+
+# -- マルチプロセス並列パース --------------
+def _split_ranges(data: mmap.mmap, parts: int) -> list[tuple[int, int]]:
+    # ほぼ等分した位置から次の改行までずらし、行の途中で切らないようにする
+    size = len(data)
+    bounds = [0]
+    for i in range(1, parts):
+        newline = data.find(b"\n", max(size * i // parts, bounds[-1]))
+        if newline < 0:
+            break
+        bounds.append(newline + 1)
+    bounds.append(size)
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+def _share(array: np.ndarray) -> tuple[str, tuple[int, ...], str]:
+    # 結果の配列は共有メモリに置き、名前・形状・型だけを親プロセスへ返す
+    shm = SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, array.dtype, buffer=shm.buf)[...] = array
+    shm.close()
+    return shm.name, array.shape, array.dtype.str
+
+
+def _parse_range(path: str, start: int, stop: int, chunk_size: int) -> dict[str, Any]:
+    parser = _ObjChunkParser(inherit_material=True)
+    with open(path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            _feed_blocks(
+                parser,
+                (
+                    data[offset : min(offset + chunk_size, stop)]
+                    for offset in range(start, stop, chunk_size)
+                ),
+            )
+    result = parser.result()
+    arrays = {
+        "positions": result.positions,
+        "texcoords": result.texcoords,
+        "normals": result.normals,
+        "corners": result.corners,
+        "face_sizes": result.face_sizes,
+        "face_materials": result.face_materials,
+        "relative": _concat(parser.relative or [], (0, 3), np.bool_),
+    }
+    return {
+        "arrays": {name: _share(array) for name, array in arrays.items()},
+        "material_names": result.material_names,
+        "current_material": parser.current_material,
+        "mtllibs": result.mtllibs,
+    }
+
+
+class _SharedArrays:
+    """ワーカーが共有メモリに置いた配列を参照し、最後に解放する。"""
+
+    def __init__(self, parts: list[dict[str, Any]]):
+        self._segments: list[SharedMemory] = []
+        self.arrays: list[dict[str, np.ndarray]] = []
+        for part in parts:
+            arrays = {}
+            for name, (shm_name, shape, dtype) in part["arrays"].items():
+                shm = SharedMemory(name=shm_name)
+                self._segments.append(shm)
+                arrays[name] = np.ndarray(shape, np.dtype(dtype), buffer=shm.buf)
+            self.arrays.append(arrays)
+
+    def release(self):
+        self.arrays = []
+        for shm in self._segments:
+            shm.close()
+            shm.unlink()
+        self._segments = []
+
+
+def _merge(parts: list[dict[str, Any]], shared: _SharedArrays) -> ObjData:
+    names = ["default"]
+    ids = {"default": 0}
+    current = 0
+    offsets = np.zeros(3, dtype=np.int64)
+    merged: dict[str, list[np.ndarray]] = {
+        name: []
+        for name in ("positions", "texcoords", "normals", "corners", "face_sizes")
+    }
+    face_materials = []
+    for part, arrays in zip(parts, shared.arrays):
+        # 範囲ごとのマテリアル番号を通し番号に振り直す（-1 は直前の範囲から継続）
+        local = np.empty(len(part["material_names"]) + 1, dtype=np.int32)
+        for i, name in enumerate(part["material_names"]):
+            local[i] = ids.setdefault(name, len(names))
+            if local[i] == len(names):
+                names.append(name)
+        local[-1] = current
+        face_materials.append(local[arrays["face_materials"]])
+        if part["current_material"] >= 0:
+            current = int(local[part["current_material"]])
+
+        # 負のインデックスは範囲内の件数で解決済みなので、前の範囲の件数を足す
+        corners = arrays["corners"].astype(np.int32)
+        relative = arrays["relative"]
+        for column in range(3):
+            corners[relative[:, column], column] += offsets[column]
+        merged["corners"].append(corners)
+        for name in ("positions", "texcoords", "normals", "face_sizes"):
+            merged[name].append(arrays[name])
+        offsets += [len(arrays[name]) for name in ("positions", "texcoords", "normals")]
+
+    return ObjData(
+        positions=_concat(merged["positions"], (0, 3), np.float32),
+        texcoords=_concat(merged["texcoords"], (0, 2), np.float32),
+        normals=_concat(merged["normals"], (0, 3), np.float32),
+        corners=_concat(merged["corners"], (0, 3), np.int32),
+        face_sizes=_concat(merged["face_sizes"], (0,), np.int32),
+        face_materials=_concat(face_materials, (0,), np.int32),
+        material_names=names,
+        mtllibs=[name for part in parts for name in part["mtllibs"]],
+    )
+
+
+def parse_obj_parallel(
+    path: str | Path, workers: int, chunk_size: int = CHUNK_SIZE
+) -> ObjData:
+    """ファイルを改行位置で workers 個の範囲に分け、プロセスごとに解析する。"""
+    path = os.fspath(path)
+    with open(path, "rb") as file:
+        if not os.fstat(file.fileno()).st_size:
+            return _ObjChunkParser().result()
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            ranges = _split_ranges(data, workers)
+
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=len(ranges), mp_context=context) as pool:
+        futures = [
+            pool.submit(_parse_range, path, start, stop, chunk_size)
+            for start, stop in ranges
+        ]
+        # 失敗したワーカーがあっても、他のワーカーの共有メモリは必ず解放する
+        parts = [future.result() for future in futures if not future.exception()]
+        shared = _SharedArrays(parts)
+        try:
+            for future in futures:
+                future.result()
+            return _merge(parts, shared)
+        finally:
+            shared.release()
+
+
+def _corner_keys(corners: np.ndarray, materials: np.ndarray) -> np.ndarray:
+    # (マテリアル, v, vt, vn) を 1 つの int64 に詰める（収まらない場合は 4 列のまま）
+    columns = [materials, corners[:, 0], corners[:, 1], corners[:, 2]]
+    widths = [
+        int(column.max()).bit_length() if column.size else 0 for column in columns
+    ]
+    if sum(widths) > 63 or any(column.size and column.min() < 0 for column in columns):
+        return np.column_stack(columns).astype(np.int64)
+    key = np.zeros(len(corners), dtype=np.int64)
+    for column, width in zip(columns, widths):
+        key = (key << width) | column.astype(np.int64)
+    return key
+
+
+def _dedupe_corners(corners: np.ndarray, materials: np.ndarray):
+    """同じ (マテリアル, v, vt, vn) の頂点をまとめ、グループ内の頂点番号を返す。
+
+    頂点番号はグループ内で最初に現れた順に振る。戻り値は各頂点の番号と、
+    グループごとの一意な頂点（最初に現れた面頂点の位置）。
+    """
+    keys = _corner_keys(corners, materials)
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    unique_materials = materials[first]
+    order = np.lexsort((first, unique_materials))
+    sorted_materials = unique_materials[order]
+    local = np.empty(len(first), dtype=np.int64)
+    local[order] = np.arange(len(order)) - np.searchsorted(
+        sorted_materials, sorted_materials
+    )
+
+    bounds = np.flatnonzero(np.diff(sorted_materials)) + 1
+    firsts = {
+        int(unique_materials[block[0]]): first[block]
+        for block in np.split(order, bounds)
+        if block.size
+    }
+    return local[inverse.ravel()], firsts
+
+
+# -- 多角形の三角形分割 --------------
+def _fan_template(size: int) -> np.ndarray:
+    # 頂点 0 を中心とした扇形: (0, 1, 2), (0, 2, 3), ...
+    i = np.arange(1, size - 1)
+    return np.column_stack([np.zeros_like(i), i, i + 1])
+
+
+def _concave_faces(points: np.ndarray) -> np.ndarray:
+    """(F, k, 3) の多角形のうち、凹んだ頂点を持つものを判定する。"""
+    following = np.roll(points, -1, axis=1)
+    # Newell 法で面の法線を求め、各頂点での折れ方向と比べる
+    normal = np.cross(points, following).sum(axis=1)
+    turns = np.cross(points - np.roll(points, 1, axis=1), following - points)
+    return (np.einsum("fkc,fc->fk", turns, normal) < 0).any(axis=1)
+
+
+def _ear_clip(points: np.ndarray) -> list[list[int]] | None:
+    """凹多角形を耳刈り法で三角形分割する（失敗した場合は None）。"""
+    normal = np.cross(points, np.roll(points, -1, axis=0)).sum(axis=0)
+    axis = int(np.argmax(np.abs(normal)))
+    # 法線の最も大きい軸を落として 2D に投影し、向きを反時計回りに揃える
+    uv = np.delete(points, axis, axis=1).astype(np.float64)
+    if normal[axis] * (1 if axis != 1 else -1) < 0:
+        uv[:, 0] = -uv[:, 0]
+
+    def cross(o, a, b) -> float:
+        return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+    remaining = list(range(len(points)))
+    triangles = []
+    while len(remaining) > 3:
+        count = len(remaining)
+        for k in range(count):
+            a, b, c = remaining[k - 1], remaining[k], remaining[(k + 1) % count]
+            if cross(uv[a], uv[b], uv[c]) <= 0:
+                continue
+            if any(
+                cross(uv[a], uv[b], uv[p]) >= 0
+                and cross(uv[b], uv[c], uv[p]) >= 0
+                and cross(uv[c], uv[a], uv[p]) >= 0
+                for p in remaining
+                if p not in (a, b, c)
+            ):
+                continue
+            triangles.append([a, b, c])
+            del remaining[k]
+            break
+        else:
+            return None
+    triangles.append(remaining)
+    return triangles
+
+
+def triangulate(
+    obj: ObjData, local: np.ndarray, ear_clipping: bool = False
+) -> tuple[np.ndarray, np.ndarray]:
+    """全ての面を頂点数ごとにまとめて三角形分割する。
+
+    戻り値は面の順に並んだ (T, 3) の頂点番号と、各三角形のマテリアル番号。
+    ear_clipping=True の場合、凹んだ多角形だけを耳刈り法で分割し直す。
+    """
+    sizes = obj.face_sizes.astype(np.int64)
+    counts = np.maximum(sizes - 2, 0)
+    face_starts = np.cumsum(sizes) - sizes
+    triangle_starts = np.cumsum(counts) - counts
+    triangles = np.empty((int(counts.sum()), 3), dtype=local.dtype)
+
+    for size in np.unique(sizes[sizes >= 3]).tolist():
+        faces = np.flatnonzero(sizes == size)
+        template = _fan_template(size)
+        corners = face_starts[faces, None, None] + template
+        if ear_clipping and size > 3:
+            _clip_concave(obj, corners, face_starts[faces], size)
+        rows = triangle_starts[faces, None] + np.arange(size - 2)
+        triangles[rows.ravel()] = local[corners.reshape(-1, 3)]
+    return triangles, np.repeat(obj.face_materials, counts)
+
+
+def _clip_concave(obj: ObjData, corners: np.ndarray, starts: np.ndarray, size: int):
+    # 凹多角形の扇形分割（corners）を耳刈り法の結果で置き換える
+    ring = starts[:, None] + np.arange(size)
+    points = obj.positions[obj.corners[ring, 0] - 1].astype(np.float64)
+    for face in np.flatnonzero(_concave_faces(points)).tolist():
+        clipped = _ear_clip(points[face])
+        if clipped is not None:
+            corners[face] = starts[face] + np.asarray(clipped)
+
+
+def build_material_groups(
+    obj: ObjData, ear_clipping: bool = False
+) -> dict[str, dict[str, np.ndarray]]:
+    if not obj.face_sizes.size:
+        return {}
+    corner_materials = np.repeat(obj.face_materials, obj.face_sizes)
+    local, firsts = _dedupe_corners(obj.corners, corner_materials)
+    triangles, triangle_materials = triangulate(obj, local, ear_clipping)
+
+    # マテリアルごとに三角形を振り分ける（面の順序と、初出のマテリアル順を保つ）
+    order = np.argsort(triangle_materials, kind="stable")
+    sorted_materials = triangle_materials[order]
+    bounds = np.flatnonzero(np.diff(sorted_materials)) + 1
+    by_material = {
+        int(triangle_materials[block[0]]): triangles[block]
+        for block in np.split(order, bounds)
+        if block.size
+    }
+    _, first_faces = np.unique(obj.face_materials, return_index=True)
+    appearance = obj.face_materials[np.sort(first_faces)].tolist()
+    return {
+        obj.material_names[material]: _gather_group(
+            obj, obj.corners[firsts[material]], by_material[material]
+        )
+        for material in appearance
+        if material in by_material
+    }
+
+
+def _gather_group(
+    obj: ObjData, table: np.ndarray, triangles: np.ndarray
+) -> dict[str, np.ndarray]:
+    table = table.astype(np.int64)
+    return {
+        "vertices": obj.positions[table[:, 0] - 1],
+        # 一部の角だけ法線が無い場合は +Z で埋める（長さ 0 の法線は glTF として不正）
+        "normals": _optional_attribute(obj.normals, table[:, 2], (0.0, 0.0, 1.0)),
+        "texcoords": _optional_attribute(obj.texcoords, table[:, 1]),
+        "indices": triangles.reshape(-1).astype(np.uint32),
+    }
+
+
+def _optional_attribute(
+    values: np.ndarray, index: np.ndarray, fill: tuple[float, ...] | None = None
+) -> np.ndarray:
+    # 番号の無い角は fill（省略時は 0）で埋める。どの角にも無ければ空の配列
+    present = index > 0
+    if not present.any():
+        return np.empty((0, values.shape[1]), dtype=np.float32)
+    result = np.zeros((index.size, values.shape[1]), dtype=np.float32)
+    if fill is not None:
+        result[~present] = fill
+    result[present] = values[index[present] - 1]
+    return result
+
+
+def load_obj_data(obj_file: str | Path) -> dict[str, dict[str, np.ndarray]]:
+    return build_material_groups(parse_obj(obj_file))
@@ -0,0 +1,300 @@
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+from src.infrastructure.mesh.obj_parser import (
+    LINE_F,
+    LINE_KEYWORD,
+    LINE_V,
+    LINE_VN,
+    LINE_VT,
+    classify_lines,
+    line_blocks,
+    parse_faces,
+    read_values,
+    split_lines,
+)
+
+# テクスチャ座標 (u, v, 1) に掛ける 3x3 行列
+FLIP_U = np.array([[-1.0, 0.0, 1.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]])
+FLIP_V = np.array([[1.0, 0.0, 0.0], [0.0, -1.0, 1.0], [0.0, 0.0, 1.0]])
+
+# 1 回に読み書きするバイト数（行の書き換えで一時的に数倍のメモリを使う）
+BLOCK_SIZE = 4 * 1024 * 1024
+
+# 書き換えた数値の書式（float32 を丸めずに往復できる桁数）
+NUMBER_FORMAT = " %.9g"
+
+
+# -- 変換行列 --------------
+def rotation_matrix(axis: str, degrees: float) -> np.ndarray:
+    # 90 度の倍数では sin/cos が丸め誤差の無い 0・±1 になるようにする
+    radians = np.radians(degrees)
+    c = float(np.round(np.cos(radians), 15))
+    s = float(np.round(np.sin(radians), 15))
+    rotations: dict[str, list[list[float]]] = {
+        "x": [[1, 0, 0], [0, c, -s], [0, s, c]],
+        "y": [[c, 0, s], [0, 1, 0], [-s, 0, c]],
+        "z": [[c, -s, 0], [s, c, 0], [0, 0, 1]],
+    }
+    matrix = np.eye(4)
+    matrix[:3, :3] = rotations[axis.lower()]
+    return matrix
+
+
+def scale_matrix(factor: float | Iterable[float]) -> np.ndarray:
+    return np.diag([*np.broadcast_to(np.asarray(factor, dtype=float), 3), 1.0])
+
+
+# 元データの上方向の軸 → glTF（+Y が上）へ向ける回転
+_UP_AXIS_ROTATIONS = {"x": ("z", 90), "y": ("y", 0), "z": ("x", -90)}
+
+
+def model_matrix(up_axis: str = "Y", scale: float = 1.0) -> np.ndarray | None:
+    """上方向の軸と単位の倍率を glTF の座標系に合わせる 4x4 行列を返す。
+
+    変換が不要（Y 軸が上・倍率 1）の場合は None を返す。
+    """
+    axis, degrees = _UP_AXIS_ROTATIONS[up_axis.lower()]
+    matrix = rotation_matrix(axis, degrees) @ scale_matrix(scale)
+    return None if np.array_equal(matrix, np.eye(4)) else matrix
+
+
+# -- ブロック単位の読み取り・書式化 --------------
+def _format_lines(keyword: str, values, counts, base) -> np.ndarray:
+    # 数値の個数ごとにまとめて書式化し、元の行順の bytes 配列で返す
+    lines = np.empty(len(counts), dtype=object)
+    for count in np.unique(counts).tolist():
+        rows = np.flatnonzero(counts == count)
+        block = values[base[rows, None] + np.arange(count)]
+        text = (keyword + NUMBER_FORMAT * count + "\n") * len(rows)
+        lines[rows] = (text % tuple(block.ravel().tolist())).encode().split(b"\n")[:-1]
+    return lines
+
+
+class _ObjRewriter:
+    """改行で区切ったブロックごとに v / vn / vt 行を書き換える。
+
+    書き換え対象の行だけを整形し直し、それ以外の行はそのまま残す。
+    """
+
+    def __init__(
+        self,
+        matrix: np.ndarray | None,
+        texcoord_ops: np.ndarray | None,
+        uv_matrices: list[np.ndarray],
+    ) -> None:
+        self.matrix = matrix
+        # 法線は逆転置行列で変換する（不均一なスケールでも面に垂直なまま）
+        self.normal_matrix = (
+            np.linalg.inv(matrix[:3, :3]).T if matrix is not None else None
+        )
+        self.texcoord_ops = texcoord_ops
+        self.uv_matrices = uv_matrices
+        self.texcoords = 0
+        self.stats = {"positions": 0, "normals": 0, "texcoords": 0}
+
+    def feed(self, chunk: bytes) -> bytes:
+        buf, starts, ends = split_lines(chunk)
+        kinds = classify_lines(buf, starts, ends)
+        replaced = []
+        if self.matrix is not None:
+            for kind, prefix, transform in (
+                (LINE_V, 2, self._positions),
+                (LINE_VN, 3, self._normals),
+            ):
+                rows = np.flatnonzero(kinds == kind)
+                if rows.size:
+                    values, counts, base = read_values(
+                        buf, starts[rows] + prefix, ends[rows] + 1
+                    )
+                    if (counts < 3).any():
+                        raise ValueError("malformed vertex record in OBJ file")
+                    columns = base[:, None] + np.arange(3)
+                    values[columns] = transform(values[columns])
+                    keyword = "v" if kind == LINE_V else "vn"
+                    replaced.append(
+                        (rows, _format_lines(keyword, values, counts, base))
+                    )
+
+        texcoord_rows = np.flatnonzero(kinds == LINE_VT)
+        if self.texcoord_ops is not None and texcoord_rows.size:
+            replaced.extend(self._texcoords(buf, starts, ends, texcoord_rows))
+        self.texcoords += texcoord_rows.size
+
+        if not replaced:
+            return chunk
+        lines = np.array(chunk.split(b"\n"), dtype=object)
+        for rows, formatted in replaced:
+            lines[rows] = formatted
+        return b"\n".join(lines.tolist())
+
+    def _positions(self, points: np.ndarray) -> np.ndarray:
+        assert self.matrix is not None
+        self.stats["positions"] += len(points)
+        result = points @ self.matrix[:3, :3].T + self.matrix[:3, 3]
+        w = points @ self.matrix[3, :3] + self.matrix[3, 3]
+        if not (w == 1).all():
+            result /= w[:, None]
+        return result
+
+    def _normals(self, normals: np.ndarray) -> np.ndarray:
+        assert self.normal_matrix is not None
+        self.stats["normals"] += len(normals)
+        result = normals @ self.normal_matrix.T
+        length = np.linalg.norm(result, axis=1)
+        nonzero = length > 0
+        result[nonzero] /= length[nonzero, None]
+        return result
+
+    def _texcoords(self, buf, starts, ends, rows):
+        assert self.texcoord_ops is not None
+        # vt の通し番号（0 始まり）から、その座標を使うマテリアルの操作を引く
+        index = self.texcoords + np.arange(rows.size)
+        ops = np.zeros(rows.size, dtype=np.int8)
+        known = index < len(self.texcoord_ops)
+        ops[known] = self.texcoord_ops[index[known]]
+        target = ops > 0
+        if not target.any():
+            return []
+        rows, ops = rows[target], ops[target]
+        values, counts, base = read_values(buf, starts[rows] + 3, ends[rows] + 1)
+        # u のみの行は v = 0 として 2 成分で書き出す
+        uv = np.zeros((rows.size, 3))
+        uv[:, 0] = values[base]
+        has_v = counts >= 2
+        uv[has_v, 1] = values[base[has_v] + 1]
+        uv[:, 2] = 1.0
+        for op in np.unique(ops).tolist():
+            selected = ops == op
+            uv[selected] = uv[selected] @ self.uv_matrices[op - 1].T
+        self.stats["texcoords"] += rows.size
+
+        out_counts = np.maximum(counts, 2)
+        out_base = np.cumsum(out_counts) - out_counts
+        out = np.zeros(int(out_counts.sum()))
+        out[out_base] = uv[:, 0]
+        out[out_base + 1] = uv[:, 1]
+        for k in range(2, int(counts.max(initial=2))):
+            has = counts > k
+            out[out_base[has] + k] = values[base[has] + k]
+        return [(rows, _format_lines("vt", out, out_counts, out_base))]
+
+
+# -- 1 パス目: マテリアルごとの UV 操作の対象を集める --------------
+def _texcoord_ops(
+    path: str | Path, material_ops: dict[str, int], block_size: int
+) -> np.ndarray:
+    # vt ごとに適用する操作番号（0 は操作なし、1 以降は material_ops の値）
+    # 複数のマテリアルから参照される vt は、後に現れた面の操作を適用する
+    ops = np.zeros(0, dtype=np.int8)
+    current = 0
+    texcoords = 0
+    with open(path, "rb") as file:
+        for chunk in line_blocks(iter(lambda: file.read(block_size), b"")):
+            buf, starts, ends = split_lines(chunk)
+            kinds = classify_lines(buf, starts, ends)
+            material_lines = []
+            op_seq = [current]
+            for line in np.flatnonzero(kinds == LINE_KEYWORD).tolist():
+                parts = buf[starts[line] : ends[line]].tobytes().decode("utf-8").split()
+                if len(parts) >= 2 and parts[0] == "usemtl":
+                    material_lines.append(line)
+                    op_seq.append(material_ops.get(parts[1], 0))
+            current = op_seq[-1]
+
+            face_lines = np.flatnonzero(kinds == LINE_F)
+            face_ops = np.array(op_seq, dtype=np.int8)[
+                np.searchsorted(material_lines, face_lines)
+            ]
+            target = face_ops > 0
+            if target.any():
+                face_lines, face_ops = face_lines[target], face_ops[target]
+                corners, sizes = parse_faces(
+                    buf, starts[face_lines] + 2, ends[face_lines] + 1
+                )
+                vt = corners[:, 1]
+                negative = vt < 0
+                if negative.any():
+                    defined = np.flatnonzero(kinds == LINE_VT)
+                    before = texcoords + np.searchsorted(defined, face_lines)
+                    vt[negative] += np.repeat(before, sizes)[negative] + 1
+                corner_ops = np.repeat(face_ops, sizes)
+                valid = vt > 0
+                if valid.any() and vt.max() > len(ops):
+                    grown = np.zeros(max(int(vt.max()), 2 * len(ops)), dtype=np.int8)
+                    grown[: len(ops)] = ops
+                    ops = grown
+                ops[vt[valid] - 1] = corner_ops[valid]
+            texcoords += int(np.count_nonzero(kinds == LINE_VT))
+    return ops
+
+
+def _backup(path: Path, backup_path: Path):
+    # 元のファイルを残したまま置き換えられるよう、ハードリンク（不可ならコピー）で残す
+    if backup_path.exists():
+        backup_path.unlink()
+    try:
+        os.link(path, backup_path)
+    except OSError:
+        shutil.copy2(path, backup_path)
+
+
+# -- 変換 --------------
+def transform_obj(
+    input_path: str | Path,
+    output_path: str | Path | None = None,
+    matrix: np.ndarray | None = None,
+    uv_transforms: dict[str, np.ndarray] | None = None,
+    backup_path: str | Path | None = None,
+    block_size: int = BLOCK_SIZE,
+) -> dict[str, int]:
+    """OBJ の座標を書き換え、変換した v / vn / vt の数を返す。
+
+    matrix（4x4）を v に、その逆転置を vn に適用し、uv_transforms の
+    マテリアルの面が使う vt に 3x3 行列を適用する。ファイルは block_size
+    ごとに読み書きし、同じディレクトリの一時ファイルを最後に置き換える
+    （output_path 省略時は入力を上書き）。
+    """
+    input_path = Path(input_path)
+    output_path = Path(output_path or input_path)
+    uv_transforms = uv_transforms or {}
+    texcoord_ops = None
+    if uv_transforms:
+        material_ops = {name: i + 1 for i, name in enumerate(uv_transforms)}
+        texcoord_ops = _texcoord_ops(input_path, material_ops, block_size)
+    rewriter = _ObjRewriter(
+        None if matrix is None else np.asarray(matrix, dtype=np.float64),
+        texcoord_ops,
+        [np.asarray(m, dtype=np.float64) for m in uv_transforms.values()],
+    )
+
+    fd, tmp_path = tempfile.mkstemp(
+        dir=output_path.parent, prefix=f".{output_path.name}.", suffix=".tmp"
+    )
+    try:
+        with open(input_path, "rb") as source, os.fdopen(fd, "wb") as sink:
+            size = os.fstat(source.fileno()).st_size
+            missing_newline = False
+            if size:
+                source.seek(size - 1)
+                missing_newline = source.read(1) != b"\n"
+                source.seek(0)
+            for block in line_blocks(iter(lambda: source.read(block_size), b"")):
+                sink.write(rewriter.feed(block))
+            if missing_newline:
+                # line_blocks が補った最後の改行を取り除く
+                sink.truncate(sink.tell() - 1)
+        shutil.copymode(input_path, tmp_path)
+        if backup_path is not None:
+            _backup(input_path, Path(backup_path))
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return rewriter.stats
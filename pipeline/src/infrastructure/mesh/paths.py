@@ -0,0 +1,10 @@
+import os
+
+
+def lod_output_path(path: str, level: int) -> str:
+    # model.glb → model.lod1.glb（レベル 0 は元のパス）
+    # ローカルのパスと MinIO のオブジェクト名の両方に使う
+    if level == 0:
+        return path
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.lod{level}{ext}"
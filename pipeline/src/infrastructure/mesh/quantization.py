@@ -0,0 +1,75 @@
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+
+KHR_MESH_QUANTIZATION = "KHR_mesh_quantization"
+
+_INT16_MAX = 32767
+_INT8_MAX = 127
+_UINT16_MAX = 65535
+
+
+# -- インデックス --------------
+def index_dtype(indices: np.ndarray) -> np.dtype:
+    # 最大値が収まる最小の型（各型の最大値はプリミティブリスタート用に使わない）
+    top = int(indices.max()) if indices.size else 0
+    if top < 0xFF:
+        return np.dtype(np.uint8)
+    if top < 0xFFFF:
+        return np.dtype(np.uint16)
+    return np.dtype(np.uint32)
+
+
+def compact_indices(indices: np.ndarray) -> np.ndarray:
+    return indices.astype(index_dtype(indices))
+
+
+# -- 頂点属性 --------------
+@dataclass
+class PositionQuantization:
+    """座標を int16 に量子化し、復元用の平行移動・拡大をノードに持たせる。
+
+    法線の向きが変わらないよう拡大率は 3 軸共通にする。
+    """
+
+    translation: np.ndarray
+    scale: float
+
+    @classmethod
+    def fit(cls, positions: Iterable[np.ndarray]) -> "PositionQuantization | None":
+        arrays = [p for p in positions if len(p)]
+        if not arrays:
+            return None
+        lo = np.min([p.min(axis=0) for p in arrays], axis=0).astype(np.float64)
+        hi = np.max([p.max(axis=0) for p in arrays], axis=0).astype(np.float64)
+        extent = float((hi - lo).max()) / 2
+        return cls((lo + hi) / 2, extent / _INT16_MAX if extent > 0 else 1.0)
+
+    def node_transform(self) -> dict[str, list[float]]:
+        return {
+            "translation": self.translation.tolist(),
+            "scale": [self.scale] * 3,
+        }
+
+    def apply(self, positions: np.ndarray) -> np.ndarray:
+        # 頂点属性は 4 バイト境界に揃える必要があるため 4 成分目を詰め物にする
+        values = np.rint((positions - self.translation) / self.scale)
+        quantized = np.zeros((len(positions), 4), dtype=np.int16)
+        quantized[:, :3] = np.clip(values, -_INT16_MAX, _INT16_MAX)
+        return quantized
+
+
+def quantize_normals(normals: np.ndarray) -> np.ndarray:
+    quantized = np.zeros((len(normals), 4), dtype=np.int8)
+    quantized[:, :3] = np.rint(np.clip(normals, -1.0, 1.0) * _INT8_MAX)
+    return quantized
+
+
+def texcoords_in_unit_range(texcoords: np.ndarray) -> bool:
+    # 正規化 uint16 は [0, 1] しか表せないため、範囲外（タイリング）の UV は量子化しない
+    return not texcoords.size or (texcoords.min() >= 0.0 and texcoords.max() <= 1.0)
+
+
+def unorm16_texcoords(texcoords: np.ndarray) -> np.ndarray:
+    return np.rint(texcoords * _UINT16_MAX).astype(np.uint16)
@@ -0,0 +1,263 @@
+import heapq
+
+import numpy as np
+
+from src.infrastructure.mesh.mesh_optimizer import optimize_vertex_fetch
+
+# 境界辺を保つための拘束平面の重み（面の二次誤差に対する倍率）
+BOUNDARY_WEIGHT = 10.0
+
+# 対称 4x4 行列の上三角 10 要素（xx, xy, xz, xw, yy, yz, yw, zz, zw, ww）
+_UPPER = ([0, 0, 0, 0, 1, 1, 1, 2, 2, 3], [0, 1, 2, 3, 1, 2, 3, 2, 3, 3])
+
+
+def _edge_keys(edges: np.ndarray, vertex_count: int) -> np.ndarray:
+    # 向きを無視した辺 (u, v) を 1 つの整数 min * n + max にまとめる
+    low = np.minimum(edges[:, 0], edges[:, 1]).astype(np.int64)
+    high = np.maximum(edges[:, 0], edges[:, 1]).astype(np.int64)
+    return low * vertex_count + high
+
+
+# -- 二次誤差（Quadric Error Metrics） --------------
+def _plane_quadrics(points: np.ndarray, normals: np.ndarray, weights: np.ndarray):
+    # 平面 n·x + d = 0 の二次誤差行列 K = p pᵀ（p = [n, d]）を重み付きで返す
+    planes = np.concatenate(
+        [normals, -np.einsum("ij,ij->i", normals, points)[:, None]], axis=1
+    )
+    return weights[:, None] * planes[:, _UPPER[0]] * planes[:, _UPPER[1]]
+
+
+def _vertex_quadrics(positions: np.ndarray, triangles: np.ndarray) -> np.ndarray:
+    corners = positions[triangles]
+    cross = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    length = np.linalg.norm(cross, axis=1)
+    valid = length > 0
+    normals = np.zeros_like(cross)
+    normals[valid] = cross[valid] / length[valid, None]
+    face_quadrics = _plane_quadrics(corners[:, 0], normals, length / 2)
+
+    quadrics = np.zeros((len(positions), 10))
+    for k in range(3):
+        np.add.at(quadrics, triangles[:, k], face_quadrics)
+
+    # 1 面にしか使われない辺（境界）には、面に垂直な拘束平面を加える
+    edges = np.concatenate(
+        [triangles[:, [0, 1]], triangles[:, [1, 2]], triangles[:, [2, 0]]]
+    )
+    face_of = np.tile(np.arange(len(triangles)), 3)
+    _, inverse, counts = np.unique(
+        _edge_keys(edges, len(positions)), return_inverse=True, return_counts=True
+    )
+    boundary = counts[inverse] == 1
+    if boundary.any():
+        a = positions[edges[boundary, 0]]
+        direction = positions[edges[boundary, 1]] - a
+        side = np.cross(direction, normals[face_of[boundary]])
+        side_length = np.linalg.norm(side, axis=1)
+        ok = side_length > 0
+        side[ok] /= side_length[ok, None]
+        weight = BOUNDARY_WEIGHT * np.einsum("ij,ij->i", direction, direction) * ok
+        boundary_quadrics = _plane_quadrics(a, side, weight)
+        np.add.at(quadrics, edges[boundary, 0], boundary_quadrics)
+        np.add.at(quadrics, edges[boundary, 1], boundary_quadrics)
+    return quadrics
+
+
+def _error(q: list[float], p: tuple[float, float, float]) -> float:
+    x, y, z = p
+    error = (
+        q[0] * x * x
+        + 2 * q[1] * x * y
+        + 2 * q[2] * x * z
+        + 2 * q[3] * x
+        + q[4] * y * y
+        + 2 * q[5] * y * z
+        + 2 * q[6] * y
+        + q[7] * z * z
+        + 2 * q[8] * z
+        + q[9]
+    )
+    return error if error > 0 else 0.0
+
+
+def _errors(quadrics: np.ndarray, points: np.ndarray) -> np.ndarray:
+    # _error を配列でまとめて計算する（演算順は _error と同じ）
+    q = quadrics.T
+    x, y, z = points.T
+    error = (
+        q[0] * x * x
+        + 2 * q[1] * x * y
+        + 2 * q[2] * x * z
+        + 2 * q[3] * x
+        + q[4] * y * y
+        + 2 * q[5] * y * z
+        + 2 * q[6] * y
+        + q[7] * z * z
+        + 2 * q[8] * z
+        + q[9]
+    )
+    return np.maximum(error, 0.0)
+
+
+def _normal(a, b, c) -> tuple[float, float, float]:
+    ux, uy, uz = b[0] - a[0], b[1] - a[1], b[2] - a[2]
+    vx, vy, vz = c[0] - a[0], c[1] - a[1], c[2] - a[2]
+    return (uy * vz - uz * vy, uz * vx - ux * vz, ux * vy - uy * vx)
+
+
+def _edge_candidates(
+    points: np.ndarray, quadrics: np.ndarray, welded: np.ndarray
+) -> list[tuple[float, int, int, int, int]]:
+    # 全ての辺の縮約候補を _Simplifier._candidate と同じ規則で配列演算によりまとめて作る
+    edges = np.concatenate([welded[:, [0, 1]], welded[:, [1, 2]], welded[:, [2, 0]]])
+    u, v = np.divmod(np.unique(_edge_keys(edges, len(points))), len(points))
+    quadric = quadrics[u] + quadrics[v]
+    to_v = _errors(quadric, points[v])
+    to_u = _errors(quadric, points[u])
+    forward = to_v <= to_u
+    source = np.where(forward, u, v).tolist()
+    target = np.where(forward, v, u).tolist()
+    cost = np.where(forward, to_v, to_u).tolist()
+    return [(c, s, t, 0, 0) for c, s, t in zip(cost, source, target)]
+
+
+# -- 辺の縮約による簡略化 --------------
+class _Simplifier:
+    """座標で溶接した頂点上で half-edge collapse を繰り返す。
+
+    縮約先は辺の端点のいずれか（誤差の小さい方）なので、法線や UV は補間せず
+    既存の頂点をそのまま使える。面の向きが反転する縮約は行わない。
+    """
+
+    def __init__(self, group: dict[str, np.ndarray]):
+        self.dtype = group["indices"].dtype
+        triangles = group["indices"].reshape(-1, 3).astype(np.int64)
+        unique, weld = np.unique(
+            group["vertices"].astype(np.float64), axis=0, return_inverse=True
+        )
+        weld = weld.ravel()
+        welded = weld[triangles]
+        quadrics = _vertex_quadrics(unique, welded)
+        self.weld: list[int] = weld.tolist()
+        self.points: list[tuple] = [tuple(p) for p in unique.tolist()]
+        self.quadrics: list[list[float]] = quadrics.tolist()
+        self.faces: list[list[int]] = triangles.tolist()
+
+        alive = (
+            (welded[:, 0] != welded[:, 1])
+            & (welded[:, 1] != welded[:, 2])
+            & (welded[:, 2] != welded[:, 0])
+        )
+        self.alive: list[bool] = alive.tolist()
+        self.adjacent: list[set[int]] = [set() for _ in range(len(unique))]
+        for f, w in zip(np.flatnonzero(alive).tolist(), welded[alive].tolist()):
+            for a in w:
+                self.adjacent[a].add(f)
+        self.removed = [False] * len(unique)
+        self.version = [0] * len(unique)
+        self.face_count = int(alive.sum())
+        self.heap = _edge_candidates(unique, quadrics, welded[alive])
+        heapq.heapify(self.heap)
+
+    def _candidate(self, u: int, v: int) -> tuple[float, int, int, int, int]:
+        # 辺 (u, v) を誤差の小さい向きに縮約する候補（版数で古い候補を判別する）
+        quadric = [a + b for a, b in zip(self.quadrics[u], self.quadrics[v])]
+        to_v = _error(quadric, self.points[v])
+        to_u = _error(quadric, self.points[u])
+        source, target, cost = (u, v, to_v) if to_v <= to_u else (v, u, to_u)
+        return (cost, source, target, self.version[source], self.version[target])
+
+    def _flips(self, u: int, v: int, faces: set[int]) -> bool:
+        points, weld = self.points, self.weld
+        moved = points[v]
+        for f in faces:
+            corners = [points[weld[a]] for a in self.faces[f]]
+            before = _normal(*corners)
+            corners = [
+                moved if weld[a] == u else p for a, p in zip(self.faces[f], corners)
+            ]
+            after = _normal(*corners)
+            if before[0] * after[0] + before[1] * after[1] + before[2] * after[2] <= 0:
+                return True
+        return False
+
+    def _collapse(self, u: int, v: int) -> bool:
+        shared = self.adjacent[u] & self.adjacent[v]
+        moving = self.adjacent[u] - shared
+        if not shared or self._flips(u, v, moving):
+            return False
+
+        # 消える面の u 側の頂点を、同じ面の v 側の頂点（属性付き）へ置き換える
+        weld = self.weld
+        replace: dict[int, int] = {}
+        for f in shared:
+            face = self.faces[f]
+            welded = [weld[a] for a in face]
+            replace[face[welded.index(u)]] = face[welded.index(v)]
+            self.alive[f] = False
+            for w in welded:
+                if w != u:
+                    self.adjacent[w].discard(f)
+        fallback = next(iter(replace.values()))
+        for f in moving:
+            face = self.faces[f]
+            for k, a in enumerate(face):
+                if weld[a] == u:
+                    face[k] = replace.get(a, fallback)
+            self.adjacent[v].add(f)
+
+        self.face_count -= len(shared)
+        self.adjacent[u] = set()
+        self.removed[u] = True
+        self.quadrics[v] = [a + b for a, b in zip(self.quadrics[v], self.quadrics[u])]
+        self.version[v] += 1
+        neighbors = {weld[a] for f in self.adjacent[v] for a in self.faces[f]}
+        neighbors.discard(v)
+        for n in neighbors:
+            heapq.heappush(self.heap, self._candidate(n, v))
+        return True
+
+    def run(self, target_faces: int) -> np.ndarray:
+        while self.face_count > target_faces and self.heap:
+            _, u, v, version_u, version_v = heapq.heappop(self.heap)
+            if self.removed[u] or self.removed[v]:
+                continue
+            if version_u != self.version[u] or version_v != self.version[v]:
+                continue
+            self._collapse(u, v)
+        faces = [face for f, face in enumerate(self.faces) if self.alive[f]]
+        return np.asarray(faces, dtype=self.dtype).reshape(-1)
+
+
+def simplify_group(
+    group: dict[str, np.ndarray], ratios: list[float]
+) -> list[dict[str, np.ndarray]]:
+    """三角形数がおよそ ratios の各倍率になるまで段階的に簡略化する。
+
+    縮約は 1 回の実行で進め、倍率の大きい順に途中結果を取り出して返す。
+    """
+    triangles = len(group["indices"]) // 3
+    if not triangles:
+        return [group for _ in ratios]
+    simplifier = _Simplifier(group)
+    return [
+        {**group, "indices": simplifier.run(max(int(triangles * ratio), 1))}
+        for ratio in sorted(ratios, reverse=True)
+    ]
+
+
+# -- LOD チェーン --------------
+def build_lods(
+    material_groups: dict[str, dict[str, np.ndarray]], ratios: list[float]
+) -> list[dict[str, dict[str, np.ndarray]]]:
+    """マテリアルグループごとに簡略化し、詳細度の高い順に LOD を返す。"""
+    levels: list[dict[str, dict[str, np.ndarray]]] = [{} for _ in ratios]
+    for name, group in material_groups.items():
+        for level, simplified in zip(levels, simplify_group(group, ratios)):
+            # 縮約で使われなくなった頂点を除き、参照順に並べ直す
+            level[name] = optimize_vertex_fetch(simplified)
+    return levels
+
+
+def triangle_count(material_groups: dict[str, dict[str, np.ndarray]]) -> int:
+    return sum(len(group["indices"]) // 3 for group in material_groups.values())
@@ -0,0 +1,171 @@
+import io
+import logging
+import multiprocessing
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+from PIL import Image
+
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+WEBP = "image/webp"
+KTX2 = "image/ktx2"
+EXT_TEXTURE_WEBP = "EXT_texture_webp"
+KHR_TEXTURE_BASISU = "KHR_texture_basisu"
+# 画像の MIME タイプ → テクスチャに必要な glTF 拡張
+TEXTURE_EXTENSIONS = {WEBP: EXT_TEXTURE_WEBP, KTX2: KHR_TEXTURE_BASISU}
+
+KTX2_ENCODER = "toktx"
+
+
+@dataclass(frozen=True)
+class TextureOptions:
+    # max_size: 長辺の上限（0 の場合は縮小しない）
+    # format: "original"（元の形式のまま）/ "webp" / "ktx2"（toktx が無ければ webp）
+    # power_of_two: ミップマップ生成に適した 2 のべき乗サイズに揃える
+    max_size: int = 0
+    format: str = "original"
+    quality: int = 85
+    power_of_two: bool = True
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 or self.format != "original"
+
+
+def ktx2_encoder_available() -> bool:
+    return shutil.which(KTX2_ENCODER) is not None
+
+
+# -- 画像ごとの変換（ワーカープロセスで実行） --------------
+def _floor_power_of_two(value: int) -> int:
+    return 1 << (max(value, 1).bit_length() - 1)
+
+
+def _target_size(width: int, height: int, options: TextureOptions):
+    scale = 1.0
+    if options.max_size > 0 and max(width, height) > options.max_size:
+        scale = options.max_size / max(width, height)
+    size = (max(round(width * scale), 1), max(round(height * scale), 1))
+    if options.power_of_two:
+        size = (_floor_power_of_two(size[0]), _floor_power_of_two(size[1]))
+    return size
+
+
+def _encode_ktx2(image: Image.Image) -> bytes:
+    # Basis Universal（ETC1S）+ ミップマップで KTX2 に変換する
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "texture.png")
+        output = os.path.join(tmp, "texture.ktx2")
+        image.save(source, "PNG")
+        subprocess.run(
+            [KTX2_ENCODER, "--t2", "--encode", "etc1s", "--genmipmap", output, source],
+            check=True,
+            capture_output=True,
+        )
+        with open(output, "rb") as f:
+            return f.read()
+
+
+def transcode_image(
+    data: bytes, mime_type: str, options: TextureOptions
+) -> tuple[bytes, str]:
+    """画像を縮小・再エンコードし、変換後の内容と MIME タイプを返す。
+
+    縮小も形式変換も不要な場合は入力をそのまま返す。
+    """
+    with Image.open(io.BytesIO(data)) as source:
+        size = _target_size(source.width, source.height, options)
+        target_format = options.format
+        if target_format == "ktx2" and not ktx2_encoder_available():
+            target_format = "webp"
+        if size == source.size and target_format == "original":
+            return data, mime_type
+
+        image = source.convert("RGBA" if "A" in source.getbands() else "RGB")
+        if size != source.size:
+            image = image.resize(size, Image.Resampling.LANCZOS)
+
+    if target_format == "ktx2":
+        return _encode_ktx2(image), KTX2
+    output = io.BytesIO()
+    if target_format == "webp":
+        image.save(output, "WEBP", quality=options.quality, method=4)
+        return output.getvalue(), WEBP
+    if mime_type == "image/png":
+        image.save(output, "PNG", optimize=True)
+    else:
+        image.convert("RGB").save(output, "JPEG", quality=options.quality)
+    return output.getvalue(), mime_type
+
+
+# -- 変換ステージ --------------
+class TextureTranscoder:
+    """モデル内のテクスチャをプロセスプールで並列に変換する。
+
+    画像のエンコードは CPU 律速のため、スレッドではなくプロセスに分散する。
+    同じ内容の画像（LOD ごとの再構築等）は 1 度だけ変換する。
+    """
+
+    def __init__(self, options: TextureOptions, executor: Executor | None = None):
+        self.options = options
+        self.executor = executor
+        self._results: dict[str, tuple[Any, str]] = {}
+
+    def transcode_all(
+        self, images: Iterable[tuple[str, Any, str]]
+    ) -> dict[str, tuple[Any, str]]:
+        # images: (内容ハッシュ, 内容, MIME タイプ)
+        pending = [image for image in images if image[0] not in self._results]
+        futures = {}
+        for digest, data, mime_type in pending:
+            if self.executor is not None and len(pending) > 1:
+                futures[digest] = self.executor.submit(
+                    transcode_image, bytes(data), mime_type, self.options
+                )
+        for digest, data, mime_type in pending:
+            try:
+                if digest in futures:
+                    self._results[digest] = futures[digest].result()
+                else:
+                    self._results[digest] = transcode_image(
+                        bytes(data), mime_type, self.options
+                    )
+            except Exception as e:
+                # 変換できない画像は元の形式のまま埋め込む
+                logger.warning("failed to transcode texture: %s", e)
+                self._results[digest] = (data, mime_type)
+        return self._results
+
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def get_texture_pool() -> ProcessPoolExecutor:
+    # TEXTURE_WORKERS が 0 の場合は CPU 数に合わせる
+    # （スレッドから起動するため fork ではなく spawn でワーカーを作る）
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.TEXTURE_WORKERS or os.cpu_count(),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def shutdown_texture_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
@@ -0,0 +1,188 @@
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from prometheus_client import Histogram
+
+logger = logging.getLogger(__name__)
+
+_BYTE_BUCKETS = tuple(float(1 << shift) for shift in range(10, 36, 2))
+
+STAGE_SECONDS = Histogram(
+    "conversion_stage_seconds",
+    "Time spent in each conversion stage",
+    ["stage"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600),
+)
+STAGE_BYTES = Histogram(
+    "conversion_stage_bytes",
+    "Bytes read or written by each conversion stage",
+    ["stage"],
+    buckets=_BYTE_BUCKETS,
+)
+CONVERSION_SECONDS = Histogram(
+    "conversion_seconds",
+    "Total conversion time",
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800),
+)
+PEAK_RSS_GROWTH_BYTES = Histogram(
+    "conversion_peak_rss_growth_bytes",
+    "Peak resident set size growth during a conversion, including worker processes",
+    buckets=_BYTE_BUCKETS,
+)
+
+# 変換中に RSS を読む間隔（秒）
+RSS_SAMPLE_INTERVAL = 0.05
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def current_rss_bytes(pid: int | None = None) -> int:
+    # /proc/<pid>/statm の 2 列目（常駐ページ数）。/proc が無い環境（macOS 等）や
+    # 終了済みのプロセスでは 0 を返す
+    try:
+        with open(f"/proc/{pid or 'self'}/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+class RssSampler:
+    """変換中の RSS を一定間隔で読み、開始時点からの増加量の最大値を記録する。
+
+    パイプラインのプロセスに加え、track で登録したプロセス（常駐の node ワーカー等）の
+    登録時点からの増加分も合算する。同じプロセス内で並行して実行中の変換の分も含まれる。
+    """
+
+    def __init__(self, interval: float = RSS_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.peak_growth = 0
+        self._baselines: dict[int | None, int] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def track(self, pid: int | None):
+        rss = current_rss_bytes(pid)
+        with self._lock:
+            self._baselines.setdefault(pid, rss)
+
+    def sample(self):
+        with self._lock:
+            baselines = list(self._baselines.items())
+        growth = sum(current_rss_bytes(pid) - base for pid, base in baselines)
+        self.peak_growth = max(self.peak_growth, growth)
+
+    def start(self):
+        self.track(None)
+        self._thread = threading.Thread(
+            target=self._run, name="rss_sampler", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self.sample()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.sample()
+
+
+class ConversionMetrics:
+    """1 回の変換の段階ごとの所要時間・バイト数を集計する。
+
+    同じ段階を複数回計測した場合（LOD ごとの書き出し等）は合算する。
+    """
+
+    def __init__(self) -> None:
+        self.stages: dict[str, dict[str, float]] = {}
+        self.memory = RssSampler()
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[dict[str, float]]:
+        # 呼び出し側は yield された dict に bytes 等の値を追加できる
+        values: dict[str, float] = {}
+        start = time.perf_counter()
+        try:
+            yield values
+        finally:
+            values["seconds"] = time.perf_counter() - start
+            self.add(name, **values)
+
+    def add(self, name: str, **values: float):
+        entry = self.stages.setdefault(name, {})
+        for key, value in values.items():
+            entry[key] = entry.get(key, 0) + value
+
+    def finish(self) -> dict[str, Any]:
+        # Prometheus のヒストグラムに記録し、レスポンス・ログ用の dict を返す
+        total = time.perf_counter() - self._started
+        peak = self.memory.peak_growth
+        for name, values in self.stages.items():
+            if "seconds" in values:
+                STAGE_SECONDS.labels(name).observe(values["seconds"])
+            if "bytes" in values:
+                STAGE_BYTES.labels(name).observe(values["bytes"])
+        CONVERSION_SECONDS.observe(total)
+        PEAK_RSS_GROWTH_BYTES.observe(peak)
+        return {
+            "total_seconds": total,
+            "peak_rss_growth_bytes": peak,
+            "stages": {name: dict(values) for name, values in self.stages.items()},
+        }
+
+
+# -- 変換中の計測先 --------------
+# 変換を実行するスレッド内で設定し、コンバーター等の下位層からも段階を記録できるようにする
+_current: contextvars.ContextVar[ConversionMetrics | None] = contextvars.ContextVar(
+    "conversion_metrics", default=None
+)
+
+
+@contextmanager
+def collect_metrics() -> Iterator[ConversionMetrics]:
+    # 計測中は RSS を別スレッドで読み続ける（finish() の前に止める）
+    metrics = ConversionMetrics()
+    token = _current.set(metrics)
+    metrics.memory.start()
+    try:
+        yield metrics
+    finally:
+        metrics.memory.stop()
+        _current.reset(token)
+
+
+def track_process(pid: int):
+    # 変換を実行中のスレッドから呼ぶと、子プロセスの RSS の増加もピークに含める
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.memory.track(pid)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[dict[str, float]]:
+    # 計測中でなければ何も記録しない
+    metrics = _current.get()
+    if metrics is None:
+        yield {}
+        return
+    with metrics.stage(name) as values:
+        yield values
+
+
+def log_metrics(storage_path: str, metrics: dict[str, Any]):
+    logger.info(
+        json.dumps(
+            {"event": "conversion_metrics", "storage_path": storage_path, **metrics}
+        )
+    )
@@ -0,0 +1,213 @@
+import hashlib
+import json
+import logging
+import os
+import posixpath
+import sqlite3
+import threading
+import time
+from typing import Any
+
+from src.config.settings import settings
+from src.infrastructure.mesh.paths import lod_output_path
+from src.infrastructure.storage.minio_client import MinioClient, get_storage_client
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    object_name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL,
+    lods TEXT NOT NULL DEFAULT '[]'
+)
+"""
+
+
+class ConversionCache:
+    """入力の内容ハッシュと変換オプションをキーに、変換済み GLB を再利用する。
+
+    キャッシュ本体は MinIO の CONVERSION_CACHE_PREFIX 以下に置き、索引
+    （サイズ・最終利用時刻・LOD の三角形数）はローカルの SQLite に持つ。ヒット時はサーバー側
+    コピーで出力先に配置し、合計サイズが上限を超えると古い順に削除する。
+    """
+
+    def __init__(
+        self,
+        storage: MinioClient,
+        db_path: str,
+        prefix: str = "cache/glb",
+        max_bytes: int = 10 * 1024**3,
+        hash_mode: str = "etag",
+    ) -> None:
+        self.storage = storage
+        self.prefix = prefix.strip("/")
+        self.max_bytes = max_bytes
+        self.hash_mode = hash_mode
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        with self._db:
+            self._db.execute(_SCHEMA)
+            # LOD 対応前に作られた索引には lods 列を追加する
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(entries)")}
+            if "lods" not in columns:
+                self._db.execute(
+                    "ALTER TABLE entries ADD COLUMN lods TEXT NOT NULL DEFAULT '[]'"
+                )
+
+    # -- キャッシュキー --------------
+    def key_for(self, storage_path: str, options: dict[str, Any]) -> str:
+        # MTL・テクスチャも結果に影響するため、同じディレクトリの入力も含めて
+        # ハッシュする（出力の .glb とキャッシュ自身は除く）
+        remote_dir = posixpath.dirname(storage_path)
+        inputs = []
+        for name, etag in self.storage.list_etags(
+            f"{remote_dir}/" if remote_dir else ""
+        ):
+            if name.endswith(".glb") or name.startswith(f"{self.prefix}/"):
+                continue
+            if name == storage_path and self.hash_mode == "sha256":
+                etag = self.storage.sha256(name)
+            inputs.append((posixpath.relpath(name, remote_dir or "."), etag))
+        payload = {
+            "source": posixpath.basename(storage_path),
+            "inputs": sorted(inputs),
+            "options": options,
+        }
+        encoded = json.dumps(payload, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _object_name(self, key: str) -> str:
+        return f"{self.prefix}/{key}.glb"
+
+    @staticmethod
+    def _levels(lods: list[dict[str, int]]) -> list[int]:
+        # level 0 は常に存在する（LOD 情報のない変換でも本体は保存する）
+        return sorted({0, *(lod["level"] for lod in lods)})
+
+    # -- 参照・登録 --------------
+    def restore(self, key: str, destination: str) -> list[dict[str, int]] | None:
+        # ヒット時は LOD も含めて destination の隣に配置し、各レベルの情報を返す
+        with self._lock:
+            row = self._db.execute(
+                "SELECT object_name, lods FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            self._miss()
+            return None
+        object_name, lods = row[0], json.loads(row[1])
+        try:
+            for level in self._levels(lods):
+                self.storage.copy(
+                    lod_output_path(object_name, level),
+                    lod_output_path(destination, level),
+                )
+        except FileNotFoundError:
+            # 索引だけ残っている（他のレプリカが削除した等）場合は作り直す
+            self._delete(key)
+            self._miss()
+            return None
+        with self._lock, self._db:
+            self.hits += 1
+            self._db.execute(
+                "UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key)
+            )
+        return lods
+
+    def _miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def store(self, key: str, source: str, lods: list[dict[str, int]] | None = None):
+        lods = lods or []
+        object_name = self._object_name(key)
+        size = sum(
+            self.storage.copy(
+                lod_output_path(source, level), lod_output_path(object_name, level)
+            )
+            for level in self._levels(lods)
+        )
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (key, object_name, size, time.time(), json.dumps(lods)),
+            )
+        self._evict()
+
+    def _delete(self, key: str):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def _evict(self):
+        # 合計サイズが上限以下になるまで最終利用時刻の古いものから削除する
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT key, object_name, size, lods FROM entries "
+                "ORDER BY last_used DESC"
+            ).fetchall()
+        total = 0
+        for key, object_name, size, lods in rows:
+            total += size
+            if total <= self.max_bytes:
+                continue
+            for level in self._levels(json.loads(lods)):
+                name = lod_output_path(object_name, level)
+                try:
+                    self.storage.remove(name)
+                except Exception as e:
+                    logger.warning("failed to remove cached %s: %s", name, e)
+            self._delete(key)
+            with self._lock:
+                self.evictions += 1
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            entries, total = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": entries,
+                "bytes": total,
+                "max_bytes": self.max_bytes,
+            }
+
+    def close(self):
+        self._db.close()
+
+
+_cache: ConversionCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_conversion_cache() -> ConversionCache | None:
+    # CONVERSION_CACHE_ENABLED が False の場合はキャッシュを使わない
+    global _cache
+    if not settings.CONVERSION_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ConversionCache(
+                get_storage_client(),
+                settings.CONVERSION_CACHE_DB,
+                prefix=settings.CONVERSION_CACHE_PREFIX,
+                max_bytes=settings.CONVERSION_CACHE_MAX_BYTES,
+                hash_mode=settings.CONVERSION_CACHE_HASH,
+            )
+        return _cache
+
+
+def close_conversion_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is not None:
+            _cache.close()
+            _cache = None
@@ -0,0 +1,133 @@
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+from src.config.settings import settings
+from src.infrastructure.mesh.gltf_builder import MaterialGroups
+from src.infrastructure.mesh.mesh_file import (
+    MESH_SUFFIX,
+    MESH_VERSION,
+    read_mesh_file,
+    write_mesh_file,
+)
+
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def file_sha256(path: str | Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class GeometryCache:
+    """OBJ の内容をキーに、重複除去済みのマテリアル別頂点・インデックス配列を保存する。
+
+    MTL・テクスチャだけを変えた再変換では OBJ を解析せず、保存した .mesh
+    （mesh_file を参照）を np.memmap で開いて GLB を組み立て直す。エントリは
+    キーごとに 1 ファイルで、合計サイズが上限を超えると最終利用時刻の古いものから
+    削除する。
+    """
+
+    def __init__(self, directory: str | Path, max_bytes: int = 20 * 1024**3) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    # -- キャッシュキー --------------
+    @staticmethod
+    def key_for(source_id: str, options: dict[str, Any]) -> str:
+        # source_id は OBJ 本体の内容ハッシュ（ストレージ上のオブジェクトなら ETag）
+        # options には配列の内容に影響する変換オプションだけを含める
+        # 保存形式の版も含め、形式を変えたら古いエントリを参照しないようにする
+        payload = {"source": source_id, "options": options, "version": MESH_VERSION}
+        encoded = json.dumps(payload, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{MESH_SUFFIX}"
+
+    # -- 参照・登録 --------------
+    def load(self, key: str) -> tuple[list[str], list[MaterialGroups]] | None:
+        # ヒット時は mtllib の一覧と、LOD ごとのマテリアル別配列（読み取り専用の memmap）を返す
+        path = self._path(key)
+        try:
+            mesh = read_mesh_file(path)
+            # 更新時刻を最終利用時刻として使う
+            os.utime(path)
+        except (OSError, ValueError, KeyError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return mesh.mtllibs, mesh.levels
+
+    def store(
+        self, key: str, mtllibs: list[str], levels: list[MaterialGroups]
+    ) -> list[MaterialGroups]:
+        # 一時ファイルに書き出してから置き換えるため、書きかけのエントリは参照されない
+        # 書き出した配列を memmap で開き直して返す（呼び出し側は元の配列を解放できる）
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stored = read_mesh_file(write_mesh_file(self._path(key), levels, mtllibs))
+        self._evict()
+        return stored.levels
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        # (最終利用時刻, サイズ, パス) の一覧（書き込み中の一時ファイルは除く）
+        entries = []
+        for path in self.directory.glob(f"*{MESH_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _evict(self):
+        # 合計サイズが上限以下になるまで最終利用時刻の古いものから削除する
+        total = 0
+        for _, size, entry in sorted(self._entries(), reverse=True):
+            total += size
+            if total <= self.max_bytes:
+                continue
+            entry.unlink(missing_ok=True)
+            with self._lock:
+                self.evictions += 1
+
+    def stats(self) -> dict[str, int]:
+        entries = self._entries() if self.directory.exists() else []
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(entries),
+                "bytes": sum(size for _, size, _ in entries),
+                "max_bytes": self.max_bytes,
+            }
+
+
+_cache: GeometryCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_geometry_cache() -> GeometryCache | None:
+    # GEOMETRY_CACHE_ENABLED が False の場合はキャッシュを使わない
+    global _cache
+    if not settings.GEOMETRY_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = GeometryCache(
+                settings.GEOMETRY_CACHE_DIR, max_bytes=settings.GEOMETRY_CACHE_MAX_BYTES
+            )
+        return _cache
@@ -1,17 +1,180 @@
+import hashlib
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, cast
+
+import certifi
+import urllib3
 from minio import Minio
+from minio.commonconfig import ComposeSource
+from minio.error import S3Error
+from urllib3.util import Retry, Timeout
+
 from src.config.settings import settings
 
+_EOF = object()
+
+
+class _PartStream:
+    """put_object に渡す読み出し側。ObjectWriter から受け取ったパートを返す。"""
+
+    def __init__(self, max_parts: int):
+        self.parts: queue.Queue = queue.Queue(max_parts)
+        self._pending = memoryview(b"")
+        self._eof = False
+
+    def read(self, size: int = -1) -> bytes:
+        while not self._pending:
+            if self._eof:
+                return b""
+            item = self.parts.get()
+            if item is _EOF:
+                self._eof = True
+                return b""
+            if isinstance(item, BaseException):
+                # 書き込み側の失敗を put_object に伝えてマルチパートを中断させる
+                raise item
+            self._pending = memoryview(item)
+        if size < 0:
+            size = len(self._pending)
+        data = bytes(self._pending[:size])
+        self._pending = self._pending[size:]
+        return data
+
+
+class ObjectWriter:
+    """書き込まれたデータをパート単位でマルチパートアップロードする。
+
+    アップロードは別スレッドの put_object が行い、受け渡しキューの長さで
+    メモリ上に保持するパート数を制限する（最大でおよそ part_size * 3）。
+    """
+
+    def __init__(
+        self,
+        client: Minio,
+        bucket: str,
+        object_name: str,
+        content_type: str,
+        part_size: int,
+    ) -> None:
+        self.part_size = part_size
+        self._stream = _PartStream(max_parts=1)
+        self._buffer = bytearray()
+        self._error: BaseException | None = None
+        self._done = threading.Event()
+        self._thread = threading.Thread(
+            target=self._upload,
+            args=(client, bucket, object_name, content_type),
+            name=f"minio-upload-{object_name}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _upload(self, client: Minio, bucket: str, object_name: str, content_type):
+        try:
+            client.put_object(
+                bucket,
+                object_name,
+                cast(BinaryIO, self._stream),
+                length=-1,
+                part_size=self.part_size,
+                content_type=content_type,
+            )
+        except BaseException as e:
+            self._error = e
+        finally:
+            self._done.set()
+
+    def _put(self, item):
+        while True:
+            if self._done.is_set():
+                raise IOError(f"upload stopped: {self._error}") from self._error
+            try:
+                self._stream.parts.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        view = memoryview(data).cast("B")
+        offset = 0
+        while offset < view.nbytes:
+            take = min(self.part_size - len(self._buffer), view.nbytes - offset)
+            self._buffer += view[offset : offset + take]
+            offset += take
+            if len(self._buffer) == self.part_size:
+                self._put(bytes(self._buffer))
+                self._buffer.clear()
+        return view.nbytes
+
+    def close(self):
+        if self._buffer:
+            self._put(bytes(self._buffer))
+            self._buffer.clear()
+        self._put(_EOF)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def abort(self, error: BaseException):
+        if not self._done.is_set():
+            try:
+                self._put(error)
+            except IOError:
+                pass
+        self._thread.join()
+
+
+def create_http_client() -> urllib3.PoolManager:
+    # 接続は HTTP/1.1 keep-alive でプールに戻され、リクエスト間で再利用される
+    return urllib3.PoolManager(
+        maxsize=settings.MINIO_POOL_MAXSIZE,
+        timeout=Timeout(
+            connect=settings.MINIO_CONNECT_TIMEOUT, read=settings.MINIO_READ_TIMEOUT
+        ),
+        retries=Retry(
+            total=settings.MINIO_MAX_RETRIES,
+            backoff_factor=0.2,
+            status_forcelist=[500, 502, 503, 504],
+        ),
+        cert_reqs="CERT_REQUIRED",
+        ca_certs=os.environ.get("SSL_CERT_FILE") or certifi.where(),
+    )
+
 
 class MinioClient:
-    def __init__(self):
+    def __init__(self, http_client: urllib3.PoolManager | None = None):
+        self.http_client = http_client or create_http_client()
         self.client = Minio(
             f"{settings.MINIO_ENDPOINT}:{settings.MINIO_PORT}",
             access_key=settings.MINIO_ACCESS_KEY,
             secret_key=settings.MINIO_SECRET_KEY,
             secure=settings.MINIO_SECURE,
+            http_client=self.http_client,
         )
         self.bucket = settings.MINIO_BUCKET_NAME
 
+    def connection_stats(self) -> dict[str, float]:
+        # 新規接続数とリクエスト数の差分が keep-alive による再利用回数
+        pools = [self.http_client.pools[key] for key in self.http_client.pools.keys()]
+        requests = sum(pool.num_requests for pool in pools)
+        connections = sum(pool.num_connections for pool in pools)
+        return {
+            "pools": len(pools),
+            "requests": requests,
+            "connections": connections,
+            "reused": max(requests - connections, 0),
+            "reuse_ratio": 1 - connections / requests if requests else 0.0,
+        }
+
+    def close(self):
+        self.http_client.clear()
+
     def download_file(self, object_name: str, file_path: str):
         self.client.fget_object(self.bucket, object_name, file_path)
 
@@ -21,3 +184,100 @@ class MinioClient:
         self.client.fput_object(
             self.bucket, object_name, file_path, content_type=content_type
         )
+
+    # -- オブジェクト操作 --------------
+    # 存在しないオブジェクトはローカルファイルと同様に FileNotFoundError とする
+    def _missing_as_file_not_found(self, object_name: str, error: S3Error):
+        if error.code == "NoSuchKey":
+            raise FileNotFoundError(object_name) from error
+        raise error
+
+    def list_etags(self, prefix: str) -> list[tuple[str, str]]:
+        return [
+            (obj.object_name, obj.etag)
+            for obj in self.client.list_objects(self.bucket, prefix=prefix)
+            if obj.object_name and obj.etag and not obj.is_dir
+        ]
+
+    def etag(self, object_name: str) -> str:
+        try:
+            stat = self.client.stat_object(self.bucket, object_name)
+        except S3Error as e:
+            self._missing_as_file_not_found(object_name, e)
+        return stat.etag or ""
+
+    def sha256(self, object_name: str) -> str:
+        digest = hashlib.sha256()
+        with self.open_read(object_name) as stream:
+            while block := stream.read(settings.MINIO_PART_SIZE):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def copy(self, source: str, destination: str) -> int:
+        # サーバー側コピー（5 GiB を超える場合は compose がマルチパートで行う）
+        try:
+            size = self.client.stat_object(self.bucket, source).size or 0
+            self.client.compose_object(
+                self.bucket, destination, [ComposeSource(self.bucket, source)]
+            )
+        except S3Error as e:
+            self._missing_as_file_not_found(source, e)
+        return size
+
+    def remove(self, object_name: str):
+        self.client.remove_object(self.bucket, object_name)
+
+    # -- ストリーミング I/O --------------
+    @contextmanager
+    def open_read(self, object_name: str) -> Iterator:
+        try:
+            response = self.client.get_object(self.bucket, object_name)
+        except S3Error as e:
+            self._missing_as_file_not_found(object_name, e)
+        try:
+            yield response
+        finally:
+            response.close()
+            response.release_conn()
+
+    @contextmanager
+    def open_write(
+        self,
+        object_name: str,
+        content_type: str = "model/gltf-binary",
+        part_size: int | None = None,
+    ) -> Iterator[ObjectWriter]:
+        writer = ObjectWriter(
+            self.client,
+            self.bucket,
+            object_name,
+            content_type,
+            part_size or settings.MINIO_PART_SIZE,
+        )
+        try:
+            yield writer
+        except BaseException as e:
+            writer.abort(e)
+            raise
+        writer.close()
+
+
+_storage: MinioClient | None = None
+_storage_lock = threading.Lock()
+
+
+def get_storage_client() -> MinioClient:
+    # アプリケーション全体で 1 つのクライアント（接続プール）を共有する
+    global _storage
+    with _storage_lock:
+        if _storage is None:
+            _storage = MinioClient()
+        return _storage
+
+
+def close_storage_client():
+    global _storage
+    with _storage_lock:
+        if _storage is not None:
+            _storage.close()
+            _storage = None
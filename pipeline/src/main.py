@@ -1,11 +1,37 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from src.presentation.routers import conversion, health
+from src.presentation.routers import conversion, health, metrics
 from src.config.settings import settings
+from src.application.services.conversion_executor import (
+    shutdown_conversion_executor,
+)
+from src.application.services.job_manager import shutdown_job_manager
+from src.infrastructure.mesh.texture_transcoder import shutdown_texture_pool
+from src.infrastructure.storage.conversion_cache import close_conversion_cache
+from src.infrastructure.storage.minio_client import (
+    close_storage_client,
+    get_storage_client,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # MinIO クライアント（接続プール）は起動時に 1 つだけ作成して共有する
+    get_storage_client()
+    yield
+    shutdown_conversion_executor()
+    shutdown_job_manager()
+    shutdown_texture_pool()
+    close_conversion_cache()
+    close_storage_client()
+
 
 app = FastAPI(
     title="Studio View Pipeline",
     version="1.0.0",
     description="3Dモデル変換パイプライン API",
+    lifespan=lifespan,
 )
 
 
@@ -20,12 +46,14 @@ def get_info():
             "docs": "/docs",
             "health": "/health/",
             "conversion": "/conversion",
+            "metrics": "/metrics",
         },
     }
 
 
 app.include_router(health.router, prefix="/health", tags=["health"])
 app.include_router(conversion.router, prefix="/conversion", tags=["conversion"])
+app.include_router(metrics.router, tags=["metrics"])
 
 if __name__ == "__main__":
     import uvicorn
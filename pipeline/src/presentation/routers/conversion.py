@@ -1,19 +1,78 @@
-from fastapi import APIRouter, HTTPException
-from src.presentation.schemas.request import ConversionRequest, ConversionResponse
+from functools import partial
+
+from fastapi import APIRouter, Depends, HTTPException
+from src.presentation.schemas.request import (
+    ConversionJobRequest,
+    ConversionJobResponse,
+    ConversionRequest,
+    ConversionResponse,
+    LodLevel,
+)
 from src.application.usecases.obj_to_glb_usecase import ObjToGlbUseCase
+from src.application.services.conversion_executor import (
+    ConversionExecutor,
+    ConversionPoolFullError,
+    get_conversion_executor,
+)
+from src.application.services.job_manager import ConversionJobManager, get_job_manager
+from src.infrastructure.storage.minio_client import MinioClient, get_storage_client
 
 router = APIRouter()
 
 
 @router.post("/obj2glb", response_model=ConversionResponse)
-async def convert_obj_to_glb(request: ConversionRequest):
-    usecase = ObjToGlbUseCase()
+async def convert_obj_to_glb(
+    request: ConversionRequest,
+    executor: ConversionExecutor = Depends(get_conversion_executor),
+    storage: MinioClient = Depends(get_storage_client),
+):
+    usecase = ObjToGlbUseCase(storage)
     try:
-        converted_path = usecase.execute(request.storage_path)
+        # 変換はブロッキング処理のためイベントループ外で実行する
+        result = await executor.run(usecase.execute, request.storage_path)
         return ConversionResponse(
             original_path=request.storage_path,
-            converted_path=converted_path,
-            format="glb",
+            converted_path=result.converted_path,
+            format=request.output_format,
+            lods=[LodLevel(**lod) for lod in result.lods],
+            metrics=result.metrics,
+        )
+    except ConversionPoolFullError as e:
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": "5"}
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+# -- 非同期ジョブ API --------------
+@router.post("/jobs", response_model=ConversionJobResponse, status_code=202)
+def submit_conversion_job(
+    request: ConversionJobRequest,
+    manager: ConversionJobManager = Depends(get_job_manager),
+    storage: MinioClient = Depends(get_storage_client),
+):
+    usecase = ObjToGlbUseCase(storage)
+    try:
+        job = manager.submit(
+            request.storage_path,
+            partial(usecase.execute, request.storage_path),
+            output_format=request.output_format,
+            callback_url=str(request.callback_url) if request.callback_url else None,
+        )
+    except ConversionPoolFullError as e:
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": "5"}
+        )
+    return ConversionJobResponse(**job.to_dict())
+
+
+@router.get("/jobs/{job_id}", response_model=ConversionJobResponse)
+def get_conversion_job(
+    job_id: str,
+    manager: ConversionJobManager = Depends(get_job_manager),
+):
+    job = manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"job not found: {job_id}")
+    return ConversionJobResponse(**job.to_dict())
@@ -1,4 +1,14 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+
+from src.infrastructure.storage.conversion_cache import (
+    ConversionCache,
+    get_conversion_cache,
+)
+from src.infrastructure.storage.geometry_cache import (
+    GeometryCache,
+    get_geometry_cache,
+)
+from src.infrastructure.storage.minio_client import MinioClient, get_storage_client
 
 router = APIRouter()
 
@@ -6,3 +16,29 @@ router = APIRouter()
 @router.get("/")
 def health_check():
     return {"status": "ok"}
+
+
+@router.get("/storage")
+def storage_connections(storage: MinioClient = Depends(get_storage_client)):
+    # MinIO 接続プールの再利用状況
+    return storage.connection_stats()
+
+
+@router.get("/cache")
+def conversion_cache_stats(
+    cache: ConversionCache | None = Depends(get_conversion_cache),
+):
+    # 変換結果キャッシュのヒット・ミス数と使用量
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+
+@router.get("/geometry-cache")
+def geometry_cache_stats(
+    cache: GeometryCache | None = Depends(get_geometry_cache),
+):
+    # ジオメトリキャッシュ（MTL だけの再変換で OBJ の解析を省く）のヒット・ミス数と使用量
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
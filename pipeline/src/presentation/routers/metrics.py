@@ -0,0 +1,10 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+router = APIRouter()
+
+
+@router.get("/metrics")
+def prometheus_metrics():
+    # 変換段階ごとの所要時間・バイト数などのヒストグラム（Prometheus 形式）
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
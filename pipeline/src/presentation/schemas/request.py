@@ -1,12 +1,49 @@
-from pydantic import BaseModel
+from typing import Any, Literal
+
+from pydantic import AnyHttpUrl, BaseModel
 
 
 class ConversionRequest(BaseModel):
     storage_path: str
-    output_format: str = "glb"
+    # 出力できるのは GLB のみ（それ以外は 422 を返す）
+    output_format: Literal["glb"] = "glb"
+
+
+class LodLevel(BaseModel):
+    level: int
+    path: str
+    triangles: int
 
 
 class ConversionResponse(BaseModel):
+    # 変換中のメモリ: 初回は OBJ を解析する間メッシュ全体がメモリに載る（上限は
+    # 入力の大きさに比例）。GLB の書き出しと、ジオメトリキャッシュにある OBJ の
+    # 再変換は .mesh の memmap からブロック単位で行う
     original_path: str
     converted_path: str
     format: str
+    # LOD を生成した場合は level 0（converted_path）から詳細度の高い順
+    # LOD を生成しない場合は変換経路（ストリーム・ファイル）によらず空
+    lods: list[LodLevel] = []
+    # 段階ごとの所要時間（秒）・バイト数と、変換中に増えた RSS の最大値
+    metrics: dict[str, Any] | None = None
+
+
+class ConversionJobRequest(ConversionRequest):
+    # 完了（成功・失敗）時にジョブ状態を POST する URL
+    callback_url: AnyHttpUrl | None = None
+
+
+class ConversionJobResponse(BaseModel):
+    job_id: str
+    status: str
+    stage: str | None = None
+    progress: float
+    original_path: str
+    converted_path: str | None = None
+    format: str
+    lods: list[LodLevel] = []
+    metrics: dict[str, Any] | None = None
+    error: str | None = None
+    created_at: float
+    finished_at: float | None = None
@@ -1,6 +1,19 @@
+import threading
+
 from fastapi.testclient import TestClient
 from unittest.mock import patch
 from src.main import app
+from src.application.services.conversion_executor import (
+    ConversionExecutor,
+    get_conversion_executor,
+)
+from src.application.services.job_manager import (
+    ConversionJobManager,
+    get_job_manager,
+)
+from src.application.usecases.obj_to_glb_usecase import ConversionResult
+from src.infrastructure.storage.conversion_cache import get_conversion_cache
+from src.infrastructure.storage.geometry_cache import GeometryCache, get_geometry_cache
 
 client = TestClient(app)
 
@@ -11,11 +24,50 @@ def test_health_check():
     assert response.json() == {"status": "ok"}
 
 
+def test_storage_connection_stats():
+    response = client.get("/health/storage")
+    assert response.status_code == 200
+    assert {"requests", "connections", "reused"} <= response.json().keys()
+
+
+def test_prometheus_metrics():
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "conversion_stage_seconds" in response.text
+
+
+def test_conversion_cache_disabled():
+    app.dependency_overrides[get_conversion_cache] = lambda: None
+    try:
+        response = client.get("/health/cache")
+    finally:
+        app.dependency_overrides.clear()
+    assert response.json() == {"enabled": False}
+
+
+def test_geometry_cache_stats(tmp_path):
+    app.dependency_overrides[get_geometry_cache] = lambda: GeometryCache(tmp_path)
+    try:
+        response = client.get("/health/geometry-cache")
+    finally:
+        app.dependency_overrides.clear()
+    assert response.json()["enabled"] is True
+    assert response.json()["entries"] == 0
+
+
 @patch("src.presentation.routers.conversion.ObjToGlbUseCase")
 def test_convert_obj_to_glb(mock_usecase_cls):
     # Setup mock
     mock_instance = mock_usecase_cls.return_value
-    mock_instance.execute.return_value = "path/to/converted.glb"
+    mock_instance.execute.return_value = ConversionResult(
+        "path/to/converted.glb",
+        [
+            {"level": 0, "path": "path/to/converted.glb", "triangles": 100},
+            {"level": 1, "path": "path/to/converted.lod1.glb", "triangles": 50},
+        ],
+        {"total_seconds": 1.5, "peak_rss_growth_bytes": 1024, "stages": {}},
+    )
 
     payload = {"storage_path": "user/test/model.obj", "output_format": "glb"}
 
@@ -28,4 +80,90 @@ def test_convert_obj_to_glb(mock_usecase_cls):
     assert data["original_path"] == "user/test/model.obj"
     assert data["converted_path"] == "path/to/converted.glb"
     assert data["format"] == "glb"
+    assert [lod["triangles"] for lod in data["lods"]] == [100, 50]
+    assert data["lods"][1]["path"] == "path/to/converted.lod1.glb"
+    assert data["metrics"]["total_seconds"] == 1.5
     mock_instance.execute.assert_called_once_with("user/test/model.obj")
+
+
+@patch("src.presentation.routers.conversion.ObjToGlbUseCase")
+def test_conversion_runs_off_event_loop_with_backpressure(mock_usecase_cls):
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_execute(storage_path):
+        started.set()
+        release.wait(timeout=10)
+        return ConversionResult("path/to/converted.glb")
+
+    mock_usecase_cls.return_value.execute.side_effect = slow_execute
+    executor = ConversionExecutor(max_workers=1)
+    app.dependency_overrides[get_conversion_executor] = lambda: executor
+    payload = {"storage_path": "user/test/model.obj"}
+    results = {}
+
+    def convert():
+        results["slow"] = client.post("/conversion/obj2glb", json=payload)
+
+    worker = threading.Thread(target=convert)
+    try:
+        worker.start()
+        assert started.wait(timeout=5)
+
+        # 変換中でもヘルスチェックは応答し、満杯のプールには 503 を返す
+        assert client.get("/health/").status_code == 200
+        busy = client.post("/conversion/obj2glb", json=payload)
+        assert busy.status_code == 503
+        assert "Retry-After" in busy.headers
+    finally:
+        release.set()
+        worker.join(timeout=10)
+        app.dependency_overrides.clear()
+        executor.shutdown()
+
+    assert results["slow"].status_code == 200
+    assert executor.in_flight == 0
+
+
+@patch("src.presentation.routers.conversion.ObjToGlbUseCase")
+def test_conversion_job_submit_and_poll(mock_usecase_cls):
+    release = threading.Event()
+
+    def execute(storage_path, on_progress=None):
+        on_progress("converting", 0.2)
+        release.wait(timeout=10)
+        return ConversionResult("user/test/model.glb")
+
+    mock_usecase_cls.return_value.execute.side_effect = execute
+    executor = ConversionExecutor(max_workers=1)
+    manager = ConversionJobManager(executor)
+    app.dependency_overrides[get_job_manager] = lambda: manager
+    try:
+        # 変換の完了を待たずにジョブ ID を返す
+        response = client.post(
+            "/conversion/jobs", json={"storage_path": "user/test/model.obj"}
+        )
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+        assert response.json()["status"] in ("queued", "running")
+
+        release.set()
+        executor.shutdown()
+        status = client.get(f"/conversion/jobs/{job_id}").json()
+        assert status["status"] == "completed"
+        assert status["progress"] == 1.0
+        assert status["converted_path"] == "user/test/model.glb"
+
+        assert client.get("/conversion/jobs/unknown").status_code == 404
+    finally:
+        release.set()
+        app.dependency_overrides.clear()
+        executor.shutdown()
+
+
+@patch("src.presentation.routers.conversion.ObjToGlbUseCase")
+def test_unsupported_output_format_is_rejected(mock_usecase_cls):
+    payload = {"storage_path": "user/test/model.obj", "output_format": "gltf"}
+    for path in ("/conversion/obj2glb", "/conversion/jobs"):
+        assert client.post(path, json=payload).status_code == 422
+    mock_usecase_cls.return_value.execute.assert_not_called()
@@ -0,0 +1,43 @@
+import tempfile
+import unittest
+
+from benchmarks.datasets import DatasetSpec, triangle_count, write_dataset
+from benchmarks.run_benchmarks import compare
+from src.infrastructure.mesh.obj_parser import build_material_groups, parse_obj
+from src.infrastructure.mesh.simplifier import triangle_count as groups_triangles
+
+
+class TestDatasets(unittest.TestCase):
+    def test_ngons_keep_triangle_count(self):
+        spec = DatasetSpec(2_000, materials=3, ngon_ratio=0.5)
+        with tempfile.TemporaryDirectory() as tmp:
+            obj = parse_obj(write_dataset(tmp, spec))
+
+        groups = build_material_groups(obj)
+        self.assertEqual(groups_triangles(groups), triangle_count(spec))
+        self.assertEqual(list(groups), ["mat0", "mat1", "mat2"])
+        self.assertIn(6, set(obj.face_sizes.tolist()))
+
+
+class TestCompare(unittest.TestCase):
+    @staticmethod
+    def report(triangles_per_second, peak_rss_growth_bytes, output_bytes=100):
+        return {
+            "results": [
+                {
+                    "dataset": {"name": "grid"},
+                    "case": "native",
+                    "triangles_per_second": triangles_per_second,
+                    "peak_rss_growth_bytes": peak_rss_growth_bytes,
+                    "output_bytes": output_bytes,
+                }
+            ]
+        }
+
+    def test_detects_regressions_over_threshold(self):
+        baseline = self.report(1000, 100)
+
+        self.assertEqual(compare(self.report(950, 105), baseline, 0.1), [])
+        regressions = compare(self.report(800, 150), baseline, 0.1)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith("grid [native] triangles_per_second"))
@@ -0,0 +1,116 @@
+import hashlib
+import os
+import tempfile
+import unittest
+
+from src.infrastructure.storage.conversion_cache import ConversionCache
+
+
+class FakeStorage:
+    def __init__(self):
+        self.objects: dict[str, bytes] = {}
+        self.copies = 0
+
+    def put(self, name: str, data: bytes):
+        self.objects[name] = data
+
+    def list_etags(self, prefix: str):
+        return [
+            (name, hashlib.md5(data).hexdigest())
+            for name, data in sorted(self.objects.items())
+            if name.startswith(prefix) and "/" not in name[len(prefix) :]
+        ]
+
+    def sha256(self, name: str) -> str:
+        return hashlib.sha256(self.objects[name]).hexdigest()
+
+    def copy(self, source: str, destination: str) -> int:
+        if source not in self.objects:
+            raise FileNotFoundError(source)
+        self.copies += 1
+        self.objects[destination] = self.objects[source]
+        return len(self.objects[source])
+
+    def remove(self, name: str):
+        self.objects.pop(name, None)
+
+
+class TestConversionCache(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.storage = FakeStorage()
+        self.cache = ConversionCache(
+            self.storage, os.path.join(tmp.name, "index", "cache.sqlite3")
+        )
+        self.addCleanup(self.cache.close)
+        self.storage.put("u1/a/model.obj", b"v 0 0 0\n")
+        self.storage.put("u1/a/model.mtl", b"newmtl A\n")
+        self.options = {"backend": "native", "format": "glb"}
+
+    def test_identical_upload_hits_cache(self):
+        key = self.cache.key_for("u1/a/model.obj", self.options)
+        self.assertIsNone(self.cache.restore(key, "u1/a/model.glb"))
+        self.storage.put("u1/a/model.glb", b"glb")
+        self.cache.store(key, "u1/a/model.glb")
+
+        # 別のアップロード先でも内容が同じなら同じキーになる
+        self.storage.put("u2/b/model.obj", b"v 0 0 0\n")
+        self.storage.put("u2/b/model.mtl", b"newmtl A\n")
+        other = self.cache.key_for("u2/b/model.obj", self.options)
+        self.assertEqual(other, key)
+        self.assertIsNotNone(self.cache.restore(other, "u2/b/model.glb"))
+        self.assertEqual(self.storage.objects["u2/b/model.glb"], b"glb")
+
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual((stats["entries"], stats["bytes"]), (1, 3))
+
+    def test_key_depends_on_materials_and_options(self):
+        key = self.cache.key_for("u1/a/model.obj", self.options)
+        self.storage.put("u1/a/model.mtl", b"newmtl B\n")
+        self.assertNotEqual(self.cache.key_for("u1/a/model.obj", self.options), key)
+        other_options = {**self.options, "backend": "obj2gltf"}
+        self.assertNotEqual(self.cache.key_for("u1/a/model.obj", other_options), key)
+
+    def test_sha256_mode(self):
+        self.cache.hash_mode = "sha256"
+        key = self.cache.key_for("u1/a/model.obj", self.options)
+        self.storage.put("u1/a/model.obj", b"v 1 0 0\n")
+        self.assertNotEqual(self.cache.key_for("u1/a/model.obj", self.options), key)
+
+    def test_missing_cached_object_is_a_miss(self):
+        self.storage.put("u1/a/model.glb", b"glb")
+        self.cache.store("k", "u1/a/model.glb")
+        self.storage.remove("cache/glb/k.glb")
+
+        self.assertIsNone(self.cache.restore("k", "u1/a/model.glb"))
+        self.assertEqual(self.cache.stats()["entries"], 0)
+
+    def test_lod_levels_are_restored_with_triangle_counts(self):
+        lods = [{"level": 0, "triangles": 100}, {"level": 1, "triangles": 50}]
+        self.storage.put("u1/a/model.glb", b"glb")
+        self.storage.put("u1/a/model.lod1.glb", b"lod1")
+        self.cache.store("k", "u1/a/model.glb", lods)
+
+        self.assertEqual(self.cache.restore("k", "u2/b/model.glb"), lods)
+        self.assertEqual(self.storage.objects["u2/b/model.lod1.glb"], b"lod1")
+        self.assertEqual(self.cache.stats()["bytes"], 7)
+
+        # LOD の一部が欠けていてもミスとして作り直す
+        self.storage.remove("cache/glb/k.lod1.glb")
+        self.assertIsNone(self.cache.restore("k", "u3/c/model.glb"))
+
+    def test_lru_eviction_under_byte_budget(self):
+        self.cache.max_bytes = 10
+        for name in ("a", "b", "c"):
+            self.storage.put(f"out/{name}.glb", b"x" * 4)
+        self.cache.store("a", "out/a.glb")
+        self.cache.store("b", "out/b.glb")
+        self.assertIsNotNone(self.cache.restore("a", "out/a2.glb"))
+        self.cache.store("c", "out/c.glb")
+
+        # 最近使われていない b が削除される
+        self.assertNotIn("cache/glb/b.glb", self.storage.objects)
+        self.assertIn("cache/glb/a.glb", self.storage.objects)
+        self.assertEqual(self.cache.stats()["evictions"], 1)
@@ -0,0 +1,111 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+import numpy as np
+
+from src.infrastructure.converters.native_converter import NativeObjConverter
+from src.infrastructure.monitoring.conversion_metrics import (
+    RSS_SAMPLE_INTERVAL,
+    STAGE_SECONDS,
+    ConversionMetrics,
+    collect_metrics,
+    stage,
+    track_process,
+)
+
+HAS_PROC = os.path.exists("/proc/self/statm")
+
+OBJ = """v 0 0 0
+v 1 0 0
+v 1 1 0
+f 1 2 3
+"""
+
+
+class TestConversionMetrics(unittest.TestCase):
+    def test_repeated_stages_are_summed(self):
+        metrics = ConversionMetrics()
+        with metrics.stage("write") as values:
+            values["bytes"] = 100
+        with metrics.stage("write") as values:
+            values["bytes"] = 50
+
+        self.assertEqual(metrics.stages["write"]["bytes"], 150)
+        self.assertGreaterEqual(metrics.stages["write"]["seconds"], 0)
+
+    def test_stage_outside_collection_is_ignored(self):
+        with stage("parse") as values:
+            values["bytes"] = 1
+        with collect_metrics() as metrics:
+            pass
+
+        self.assertEqual(metrics.stages, {})
+
+    def test_finish_observes_histograms(self):
+        before = STAGE_SECONDS.labels("test")._sum.get()
+        metrics = ConversionMetrics()
+        metrics.add("test", seconds=2.0)
+
+        result = metrics.finish()
+
+        self.assertEqual(STAGE_SECONDS.labels("test")._sum.get() - before, 2.0)
+        self.assertEqual(result["stages"], {"test": {"seconds": 2.0}})
+        self.assertEqual(result["peak_rss_growth_bytes"], 0)
+
+    @unittest.skipUnless(HAS_PROC, "/proc is not available")
+    def test_peak_rss_growth_is_measured_during_conversion(self):
+        size = 64 << 20
+        with collect_metrics() as metrics:
+            block = np.ones(size, dtype=np.uint8)
+            # 標本を読む間隔より長く保持する
+            time.sleep(RSS_SAMPLE_INTERVAL * 4)
+            del block
+        peak = metrics.finish()["peak_rss_growth_bytes"]
+
+        # 変換前から使っていた分は含めず、変換中に確保して解放した分は含める
+        self.assertGreaterEqual(peak, size * 0.9)
+        self.assertLess(peak, size * 2)
+
+    @unittest.skipUnless(HAS_PROC, "/proc is not available")
+    def test_tracked_process_growth_is_included(self):
+        size = 64 << 20
+        child = subprocess.Popen(
+            [
+                sys.executable,
+                "-c",
+                "import sys; sys.stdin.readline(); "
+                f"block = bytearray({size}); print(block[0], flush=True); "
+                "sys.stdin.readline()",
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        self.addCleanup(child.wait)
+        self.addCleanup(child.communicate, "\n")
+        with collect_metrics() as metrics:
+            track_process(child.pid)
+            child.stdin.write("\n")
+            child.stdin.flush()
+            child.stdout.readline()
+
+        self.assertGreaterEqual(metrics.memory.peak_growth, size * 0.9)
+
+    def test_converter_records_stages(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            input_path = os.path.join(tmp, "model.obj")
+            with open(input_path, "w") as f:
+                f.write(OBJ)
+            output_path = os.path.join(tmp, "model.glb")
+
+            with collect_metrics() as metrics:
+                NativeObjConverter().convert(input_path, output_path)
+            output_size = os.path.getsize(output_path)
+
+        self.assertEqual(set(metrics.stages), {"parse", "dedupe", "textures", "write"})
+        self.assertEqual(metrics.stages["parse"]["bytes"], len(OBJ.encode()))
+        self.assertEqual(metrics.stages["write"]["bytes"], output_size)
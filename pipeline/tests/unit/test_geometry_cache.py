@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.infrastructure.storage.geometry_cache import GeometryCache
+
+
+def make_groups(count: int) -> dict[str, dict[str, np.ndarray]]:
+    return {
+        "Red": {
+            "vertices": np.arange(count * 3, dtype=np.float32).reshape(-1, 3),
+            "normals": np.empty((0, 3), dtype=np.float32),
+            "texcoords": np.zeros((count, 2), dtype=np.float32),
+            "indices": np.arange(count, dtype=np.uint32),
+        },
+        "Blue": {
+            "vertices": np.ones((3, 3), dtype=np.float32),
+            "normals": np.empty((0, 3), dtype=np.float32),
+            "texcoords": np.empty((0, 2), dtype=np.float32),
+            "indices": np.array([0, 1, 2], dtype=np.uint32),
+        },
+    }
+
+
+class TestGeometryCache(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = os.path.join(tmp.name, "geometry")
+        self.cache = GeometryCache(self.directory)
+
+    def test_store_and_load_as_memmap(self):
+        key = self.cache.key_for("sha", {"optimize": False})
+        self.assertIsNone(self.cache.load(key))
+        levels = [make_groups(6), make_groups(3)]
+        stored = self.cache.store(key, ["model.mtl"], levels)
+        # 保存した配列は memmap で開き直して返す
+        self.assertIsInstance(stored[1]["Blue"]["indices"], np.memmap)
+        np.testing.assert_array_equal(
+            stored[1]["Blue"]["indices"], levels[1]["Blue"]["indices"]
+        )
+
+        mtllibs, loaded = self.cache.load(key)  # type: ignore[misc]
+        self.assertEqual(mtllibs, ["model.mtl"])
+        self.assertEqual(len(loaded), 2)
+        # マテリアルの順序と配列の内容・dtype を保つ
+        self.assertEqual(list(loaded[0]), ["Red", "Blue"])
+        for expected, actual in zip(levels, loaded):
+            for material, group in expected.items():
+                for name, values in group.items():
+                    np.testing.assert_array_equal(actual[material][name], values)
+                    self.assertEqual(actual[material][name].dtype, values.dtype)
+        self.assertIsInstance(loaded[0]["Red"]["vertices"], np.memmap)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        self.assertEqual(self.cache.stats()["misses"], 1)
+        self.assertEqual(self.cache.stats()["entries"], 1)
+
+    def test_key_depends_on_source_and_options(self):
+        key = self.cache.key_for("sha", {"optimize": False})
+        self.assertEqual(key, self.cache.key_for("sha", {"optimize": False}))
+        self.assertNotEqual(key, self.cache.key_for("other", {"optimize": False}))
+        self.assertNotEqual(key, self.cache.key_for("sha", {"optimize": True}))
+
+    def test_store_replaces_entry_without_temporary_files(self):
+        key = self.cache.key_for("sha", {})
+        self.cache.store(key, [], [make_groups(6)])
+        self.cache.store(key, [], [make_groups(6)])
+        self.assertIsNotNone(self.cache.load(key))
+        # 一時ファイルは残らない
+        self.assertEqual(os.listdir(self.directory), [f"{key}.mesh"])
+
+    def test_evicts_least_recently_used(self):
+        first = self.cache.key_for("first", {})
+        self.cache.store(first, [], [make_groups(1000)])
+        entry_bytes = self.cache.stats()["bytes"]
+        self.cache.max_bytes = entry_bytes * 2 - 1
+        os.utime(os.path.join(self.directory, f"{first}.mesh"), (0, 0))
+
+        second = self.cache.key_for("second", {})
+        self.cache.store(second, [], [make_groups(1000)])
+
+        self.assertIsNone(self.cache.load(first))
+        self.assertIsNotNone(self.cache.load(second))
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
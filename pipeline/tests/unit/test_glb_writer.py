@@ -0,0 +1,132 @@
+import json
+import os
+import struct
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from src.infrastructure.mesh.glb_writer import (
+    ARRAY_BUFFER,
+    ELEMENT_ARRAY_BUFFER,
+    GlbWriter,
+    StreamedArray,
+)
+
+
+def read_glb(path: str):
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, length = struct.unpack_from("<III", data, 0)
+    json_length, _ = struct.unpack_from("<II", data, 12)
+    gltf = json.loads(data[20 : 20 + json_length])
+    bin_offset = 20 + json_length
+    bin_length, _ = struct.unpack_from("<II", data, bin_offset)
+    blob = data[bin_offset + 8 : bin_offset + 8 + bin_length]
+    return (magic, version, length, len(data)), gltf, blob
+
+
+class TestGlbWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "out.glb")
+
+    def build(self) -> GlbWriter:
+        writer = GlbWriter({"asset": {"version": "2.0"}, "buffers": []})
+        self.positions = np.array([[0, 1, 2], [-3, 4, 0.5]], dtype=np.float32)
+        self.indices = np.array([0, 1, 1], dtype=np.uint32)
+        self.small = np.array([7, 8, 9], dtype=np.uint8)
+        writer.add_accessor(self.positions, ARRAY_BUFFER, bounds=True)
+        writer.add_accessor(self.small)
+        writer.add_accessor(self.indices, ELEMENT_ARRAY_BUFFER, bounds=True)
+        return writer
+
+    def test_layout_and_contents(self):
+        self.build().write(self.path)
+        (magic, version, length, size), gltf, blob = read_glb(self.path)
+
+        self.assertEqual((magic, version), (0x46546C67, 2))
+        self.assertEqual(length, size)
+        self.assertEqual(size % 4, 0)
+        self.assertEqual(gltf["buffers"], [{"byteLength": 40}])
+
+        position, small, index = gltf["accessors"]
+        self.assertEqual(position["type"], "VEC3")
+        self.assertEqual(position["componentType"], 5126)
+        self.assertEqual(position["min"], [-3, 1, 0.5])
+        self.assertEqual(position["max"], [0, 4, 2])
+        self.assertEqual(small["componentType"], 5121)
+        self.assertNotIn("min", small)
+        self.assertEqual(index["min"], [0])
+        self.assertEqual(index["max"], [1])
+
+        views = gltf["bufferViews"]
+        self.assertEqual([v["byteOffset"] for v in views], [0, 24, 28])
+        self.assertEqual(views[0]["target"], ARRAY_BUFFER)
+        self.assertNotIn("target", views[1])
+        self.assertEqual(blob[0:24], self.positions.tobytes())
+        self.assertEqual(blob[24:27], self.small.tobytes())
+        self.assertEqual(blob[28:40], self.indices.tobytes())
+
+    def test_handles_partial_writev(self):
+        real_writev = os.writev
+
+        def short_writev(fd, buffers):
+            return real_writev(fd, [bytes(buffers[0])[:3]])
+
+        expected_path = os.path.join(self.tmp.name, "expected.glb")
+        self.build().write(expected_path)
+        with patch("os.writev", side_effect=short_writev):
+            self.build().write(self.path)
+
+        with open(expected_path, "rb") as a, open(self.path, "rb") as b:
+            self.assertEqual(a.read(), b.read())
+
+    def test_json_only(self):
+        GlbWriter({"asset": {"version": "2.0"}}).write(self.path)
+        with open(self.path, "rb") as f:
+            data = f.read()
+        self.assertEqual(struct.unpack_from("<I", data, 8)[0], len(data))
+        self.assertNotIn(b"BIN", data)
+
+    def test_streamed_array_matches_materialized(self):
+        # 変換後の配列はブロックごとに作り、min/max もブロックをまたいで求める
+        source = np.arange(-300, 300, dtype=np.float32).reshape(-1, 3)
+
+        def convert(block):
+            quantized = np.zeros((len(block), 4), dtype=np.int16)
+            quantized[:, :3] = block * 2
+            return quantized
+
+        streamed = GlbWriter({"asset": {"version": "2.0"}})
+        array = StreamedArray(source, convert, np.int16, 4, block_size=64)
+        self.assertGreater(len(range(0, len(array), array.block_rows)), 1)
+        streamed.add_accessor(array, ARRAY_BUFFER, bounds=True, components=3)
+        streamed.write(self.path)
+
+        expected_path = os.path.join(self.tmp.name, "expected.glb")
+        materialized = GlbWriter({"asset": {"version": "2.0"}})
+        materialized.add_accessor(
+            convert(source), ARRAY_BUFFER, bounds=True, components=3
+        )
+        materialized.write(expected_path)
+
+        with open(expected_path, "rb") as a, open(self.path, "rb") as b:
+            self.assertEqual(a.read(), b.read())
+        _, gltf, _ = read_glb(self.path)
+        self.assertEqual(gltf["accessors"][0]["min"], [-600, -598, -596])
+        self.assertEqual(gltf["accessors"][0]["max"], [594, 596, 598])
+
+        gltf_path = os.path.join(self.tmp.name, "out.gltf")
+        streamed.write_gltf(gltf_path)
+        with open(gltf_path) as f:
+            self.assertIn("data:application/octet-stream", f.read())
+
+    def test_streamed_array_rejects_unexpected_blocks(self):
+        writer = GlbWriter({"asset": {"version": "2.0"}})
+        source = np.arange(4, dtype=np.uint32)
+        writer.add_accessor(StreamedArray(source, lambda block: block, np.uint16))
+        with self.assertRaises(ValueError):
+            writer.write(self.path)
@@ -0,0 +1,149 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from src.application.services.conversion_executor import (
+    ConversionExecutor,
+    ConversionPoolFullError,
+    get_conversion_executor,
+    shutdown_conversion_executor,
+)
+from src.application.services.job_manager import (
+    ConversionJobManager,
+    get_job_manager,
+    shutdown_job_manager,
+)
+from src.application.usecases.obj_to_glb_usecase import ConversionResult
+
+
+class TestConversionJobManager(unittest.TestCase):
+    def setUp(self):
+        self.executor = ConversionExecutor(max_workers=1)
+        self.manager = ConversionJobManager(self.executor)
+        self.addCleanup(self.executor.shutdown)
+
+    def wait(self, job_id: str):
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            job = self.manager.get(job_id)
+            if job and job.finished_at is not None:
+                return job
+            time.sleep(0.01)
+        self.fail("job did not finish")
+
+    def test_completed_job_reports_progress_and_result(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def task(on_progress):
+            on_progress("converting", 0.5)
+            started.set()
+            release.wait(timeout=5)
+            return ConversionResult("user/model.glb")
+
+        job = self.manager.submit("user/model.obj", task)
+        self.assertTrue(started.wait(timeout=5))
+        running = self.manager.get(job.id)
+        self.assertEqual(
+            (running.status, running.stage, running.progress),
+            ("running", "converting", 0.5),
+        )
+
+        release.set()
+        done = self.wait(job.id)
+        self.assertEqual(done.status, "completed")
+        self.assertEqual(done.progress, 1.0)
+        self.assertEqual(done.converted_path, "user/model.glb")
+
+    def test_failed_job_keeps_error(self):
+        def task(on_progress):
+            raise Exception("native conversion failed: broken")
+
+        job = self.wait(self.manager.submit("user/model.obj", task).id)
+        self.assertEqual(job.status, "failed")
+        self.assertIn("broken", job.error)
+
+    @patch("src.application.services.job_manager.requests.post")
+    def test_callback_receives_final_state(self, mock_post):
+        job = self.manager.submit(
+            "user/model.obj",
+            lambda on_progress: ConversionResult("user/model.glb"),
+            callback_url="http://server/callback",
+        )
+        self.wait(job.id)
+        self.executor.shutdown()
+
+        url = mock_post.call_args.args[0]
+        payload = mock_post.call_args.kwargs["json"]
+        self.assertEqual(url, "http://server/callback")
+        self.assertEqual(payload["job_id"], job.id)
+        self.assertEqual(payload["status"], "completed")
+        self.assertEqual(payload["converted_path"], "user/model.glb")
+
+    def test_full_pool_rejects_without_registering(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        self.manager.submit(
+            "a.obj", lambda on_progress: release.wait(5) and ConversionResult("a")
+        )
+
+        with self.assertRaises(ConversionPoolFullError):
+            self.manager.submit("b.obj", lambda on_progress: ConversionResult("b"))
+        self.assertEqual(len(self.manager._jobs), 1)
+
+    def test_full_job_queue_still_admits_sync_conversions(self):
+        executor = ConversionExecutor(max_workers=1, max_queue=1, max_job_queue=1)
+        self.addCleanup(executor.shutdown)
+        manager = ConversionJobManager(executor)
+        started = threading.Event()
+        release = threading.Event()
+        self.addCleanup(release.set)
+        order = []
+
+        def task(name):
+            def run(on_progress):
+                started.set()
+                release.wait(timeout=5)
+                order.append(name)
+                return ConversionResult(name)
+
+            return run
+
+        manager.submit("a.obj", task("a"))
+        self.assertTrue(started.wait(timeout=5))
+        manager.submit("b.obj", task("b"))
+        with self.assertRaises(ConversionPoolFullError):
+            manager.submit("c.obj", task("c"))
+
+        # ジョブの枠が満杯でも同期 API は受け付け、待機中のジョブより先に実行する
+        future = executor.submit(lambda: order.append("sync") or "done")
+        self.assertEqual(executor.in_flight, 3)
+        release.set()
+        self.assertEqual(future.result(timeout=5), "done")
+        executor.shutdown()
+        self.assertEqual(order, ["a", "sync", "b"])
+
+    def test_sync_queue_limit_is_separate(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        self.executor.submit(release.wait, 5)
+        with self.assertRaises(ConversionPoolFullError):
+            self.executor.submit(release.wait, 5)
+        # 同期 API が満杯でもジョブは自分の枠で受け付ける
+        job = self.manager.submit("a.obj", lambda on_progress: ConversionResult("a"))
+        release.set()
+        self.assertEqual(self.wait(job.id).status, "completed")
+
+    def test_default_manager_uses_shared_executor(self):
+        self.addCleanup(shutdown_conversion_executor)
+        self.addCleanup(shutdown_job_manager)
+        self.assertIs(get_job_manager().executor, get_conversion_executor())
+
+    def test_finished_jobs_expire(self):
+        job = self.wait(
+            self.manager.submit("a.obj", lambda on_progress: ConversionResult("a")).id
+        )
+        self.manager.retention_seconds = 0
+        time.sleep(0.01)
+        self.assertIsNone(self.manager.get(job.id))
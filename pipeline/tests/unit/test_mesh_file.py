@@ -0,0 +1,121 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from src.infrastructure.mesh.mesh_file import (
+    ALIGNMENT,
+    load_mesh,
+    mesh_file_path,
+    read_mesh_file,
+    write_mesh_file,
+)
+from src.infrastructure.mesh.obj_parser import build_material_groups, parse_obj
+
+OBJ = """mtllib model.mtl
+v 0 0 0
+v 1 0 0
+v 1 1 0
+v 0 1 0
+vt 0 0
+vt 1 0
+vt 1 1
+usemtl Red
+f 1/1 2/2 3/3
+usemtl Blue
+f 1 3 4
+"""
+
+
+class TestMeshFile(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+        self.obj_path = os.path.join(self.tmp, "model.obj")
+        with open(self.obj_path, "w") as f:
+            f.write(OBJ)
+
+    def test_round_trip_with_aligned_memmap_views(self):
+        groups = build_material_groups(parse_obj(self.obj_path))
+        path = os.path.join(self.tmp, "model.mesh")
+        write_mesh_file(path, [groups], ["model.mtl"], {"note": "テスト"})
+
+        mesh = read_mesh_file(path)
+        self.assertEqual(mesh.mtllibs, ["model.mtl"])
+        self.assertEqual(mesh.metadata, {"note": "テスト"})
+        self.assertEqual(list(mesh.material_groups), ["Red", "Blue"])
+        for material, group in groups.items():
+            for name, values in group.items():
+                loaded = mesh.material_groups[material][name]
+                np.testing.assert_array_equal(loaded, values)
+                self.assertFalse(loaded.flags.writeable)
+                if loaded.size:
+                    self.assertIsInstance(loaded, np.memmap)
+                    self.assertEqual(loaded.ctypes.data % ALIGNMENT, 0)
+        # Blue は UV を持たないため空の配列になる
+        self.assertEqual(mesh.material_groups["Blue"]["texcoords"].shape, (0, 2))
+
+    def test_arrays_are_stored_as_float32_and_uint32(self):
+        groups = {
+            "A": {
+                "vertices": np.arange(9, dtype=np.float64).reshape(3, 3),
+                "indices": np.array([0, 1, 2], dtype=np.int64),
+            }
+        }
+        path = os.path.join(self.tmp, "a.mesh")
+        write_mesh_file(path, [groups, groups])
+
+        mesh = read_mesh_file(path)
+        self.assertEqual(len(mesh.levels), 2)
+        self.assertEqual(mesh.levels[1]["A"]["vertices"].dtype, np.float32)
+        self.assertEqual(mesh.levels[1]["A"]["indices"].dtype, np.uint32)
+
+    def test_rejects_invalid_files(self):
+        path = os.path.join(self.tmp, "bad.mesh")
+        with open(path, "wb") as f:
+            f.write(b"not a mesh file at all, just text")
+        with self.assertRaises(ValueError):
+            read_mesh_file(path)
+
+        write_mesh_file(path, [build_material_groups(parse_obj(self.obj_path))])
+        with open(path, "r+b") as f:
+            f.truncate(os.path.getsize(path) - 4)
+        with self.assertRaises(ValueError):
+            read_mesh_file(path)
+
+    def test_load_mesh_parses_once(self):
+        first = load_mesh(self.obj_path)
+        self.assertTrue(os.path.exists(mesh_file_path(self.obj_path)))
+        self.assertEqual(first.mtllibs, ["model.mtl"])
+
+        with patch(
+            "src.infrastructure.mesh.mesh_file.parse_obj",
+            side_effect=AssertionError("parsed"),
+        ):
+            second = load_mesh(self.obj_path)
+        np.testing.assert_array_equal(
+            second.material_groups["Red"]["vertices"],
+            first.material_groups["Red"]["vertices"],
+        )
+
+        # OBJ が更新されたら解析し直す
+        with open(self.obj_path, "a") as f:
+            f.write("f 1 2 4\n")
+        updated = load_mesh(self.obj_path)
+        self.assertEqual(len(updated.material_groups["Blue"]["indices"]), 6)
+
+    def test_load_mesh_into_cache_dir(self):
+        cache_dir = os.path.join(self.tmp, "cache")
+        load_mesh(self.obj_path, cache_dir=cache_dir)
+        path = mesh_file_path(self.obj_path, cache_dir)
+        self.assertEqual(os.path.dirname(path), cache_dir)
+        self.assertTrue(path.name.startswith("model-"))
+        self.assertTrue(path.exists())
+        self.assertFalse(os.path.exists(mesh_file_path(self.obj_path)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+
+import numpy as np
+
+from src.infrastructure.mesh.mesh_optimizer import (
+    acmr,
+    optimize_group,
+    optimize_vertex_fetch,
+)
+
+
+def shuffled_grid(side: int, seed: int = 0) -> dict[str, np.ndarray]:
+    ys, xs = np.mgrid[0 : side + 1, 0 : side + 1]
+    vertices = np.column_stack([xs.ravel(), ys.ravel(), np.zeros(xs.size)])
+    a = (np.arange(side)[:, None] * (side + 1) + np.arange(side)).ravel()
+    triangles = np.column_stack(
+        [a, a + 1, a + side + 2, a, a + side + 2, a + side + 1]
+    ).reshape(-1, 3)
+    order = np.random.default_rng(seed).permutation(len(triangles))
+    return {
+        "vertices": vertices.astype(np.float32),
+        "normals": np.tile(np.array([0, 0, 1], dtype=np.float32), (len(vertices), 1)),
+        "texcoords": np.empty((0, 2), dtype=np.float32),
+        "indices": triangles[order].ravel().astype(np.uint32),
+    }
+
+
+def triangle_set(group: dict[str, np.ndarray]) -> set:
+    # 巻き順を保ったまま開始頂点を正規化して比較する
+    result = set()
+    for tri in group["vertices"][group["indices"].reshape(-1, 3)].tolist():
+        tri = [tuple(v) for v in tri]
+        start = tri.index(min(tri))
+        result.add(tuple(tri[start:] + tri[:start]))
+    return result
+
+
+class TestMeshOptimizer(unittest.TestCase):
+    def test_acmr(self):
+        self.assertEqual(acmr(np.uint32([0, 1, 2, 2, 1, 3])), 4 / 2)
+        self.assertEqual(acmr(np.uint32([0, 1, 2, 3, 4, 5]), cache_size=3), 3.0)
+        self.assertEqual(acmr(np.uint32([0, 1, 2, 3, 4, 5, 0, 1, 2]), 3), 3.0)
+
+    def test_optimize_improves_acmr_and_keeps_triangles(self):
+        group = shuffled_grid(40)
+
+        optimized, stats = optimize_group(group)
+
+        self.assertGreater(stats["acmr_before"], 2.0)
+        self.assertLess(stats["acmr_after"], 0.8)
+        self.assertEqual(triangle_set(optimized), triangle_set(group))
+        np.testing.assert_array_equal(optimized["normals"][:, 2], 1)
+        self.assertEqual(optimized["texcoords"].shape, (0, 2))
+
+    def test_vertex_fetch_order_follows_first_use(self):
+        group = {
+            "vertices": np.float32([[0, 0, 0], [1, 0, 0], [2, 0, 0], [3, 0, 0]]),
+            "indices": np.uint32([3, 1, 2, 2, 1, 3]),
+        }
+
+        optimized = optimize_vertex_fetch(group)
+
+        self.assertEqual(optimized["indices"].tolist(), [0, 1, 2, 2, 1, 0])
+        self.assertEqual(optimized["vertices"][:, 0].tolist(), [3, 1, 2])
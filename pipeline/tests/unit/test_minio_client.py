@@ -0,0 +1,95 @@
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+
+from minio.helpers import read_part_data
+
+from src.infrastructure.storage.minio_client import MinioClient, ObjectWriter
+
+
+class FakeMinio:
+    """put_object と同じ読み方（part_size + 1 ずつ）でストリームを消費する。"""
+
+    def __init__(self):
+        self.parts: list[bytes] = []
+        self.aborted = False
+
+    def put_object(self, bucket, name, data, length, part_size, content_type):
+        one_byte = b""
+        try:
+            while True:
+                part = read_part_data(data, part_size + 1, one_byte)
+                if len(part) <= part_size:
+                    self.parts.append(part)
+                    return
+                one_byte = part[-1:]
+                self.parts.append(part[:-1])
+        except Exception:
+            self.aborted = True
+            raise
+
+
+class TestObjectWriter(unittest.TestCase):
+    def test_streams_parts_of_fixed_size(self):
+        client = FakeMinio()
+        writer = ObjectWriter(client, "bucket", "a.glb", "model/gltf-binary", 8)
+        payload = bytes(range(30))
+
+        writer.write(payload[:3])
+        writer.write(memoryview(payload)[3:27])
+        writer.write(payload[27:])
+        writer.close()
+
+        self.assertEqual(b"".join(client.parts), payload)
+        self.assertEqual([len(p) for p in client.parts], [8, 8, 8, 6])
+
+    def test_abort_fails_upload(self):
+        client = FakeMinio()
+        writer = ObjectWriter(client, "bucket", "a.glb", "model/gltf-binary", 8)
+        writer.write(b"x" * 20)
+
+        writer.abort(ValueError("conversion failed"))
+
+        self.assertTrue(client.aborted)
+
+    def test_upload_error_is_raised_to_writer(self):
+        client = MagicMock()
+        client.put_object.side_effect = OSError("connection reset")
+        writer = ObjectWriter(client, "bucket", "a.glb", "model/gltf-binary", 8)
+
+        with self.assertRaises(OSError):
+            for _ in range(10):
+                writer.write(b"x" * 8)
+            writer.close()
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestConnectionStats(unittest.TestCase):
+    def test_connections_are_reused(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        storage = MinioClient()
+        self.addCleanup(storage.close)
+
+        url = f"http://127.0.0.1:{server.server_port}/"
+        for _ in range(3):
+            storage.http_client.request("GET", url)
+        stats = storage.connection_stats()
+
+        self.assertEqual((stats["requests"], stats["connections"]), (3, 1))
+        self.assertEqual(stats["reused"], 2)
@@ -0,0 +1,299 @@
+import io
+import json
+import os
+import struct
+import tempfile
+import unittest
+from contextlib import contextmanager
+from unittest.mock import patch
+
+import numpy as np
+
+from src.infrastructure.converters.factory import create_converter
+from src.infrastructure.converters.native_converter import NativeObjConverter
+from src.infrastructure.converters.obj2gltf_converter import Obj2GltfConverter
+from src.infrastructure.mesh.gltf_builder import build_gltf
+from src.infrastructure.mesh.mesh_file import load_mesh, mesh_file_path
+from src.infrastructure.mesh.obj_transform import model_matrix
+from src.infrastructure.mesh.paths import lod_output_path
+from src.infrastructure.storage.geometry_cache import GeometryCache
+
+OBJ = """mtllib model.mtl
+v 0 0 0
+v 1 0 0
+v 1 1 0
+v 0 1 0
+vt 0 0
+vt 1 0
+vt 1 1
+vt 0 1
+vn 0 0 1
+usemtl Red
+f 1/1/1 2/2/1 3/3/1 4/4/1
+usemtl Missing
+f 1/1/1 3/3/1 4/4/1
+"""
+
+MTL = """newmtl Red
+Kd 1.0 0.0 0.0
+d 0.5
+map_Kd tex.png
+"""
+
+
+def read_glb(path: str) -> tuple[dict, bytes]:
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, _, length = struct.unpack_from("<III", data, 0)
+    assert magic == 0x46546C67 and length == len(data)
+    json_length = struct.unpack_from("<I", data, 12)[0]
+    return json.loads(data[20 : 20 + json_length]), data[28 + json_length :]
+
+
+def read_glb_json(path: str) -> dict:
+    return read_glb(path)[0]
+
+
+class TestNativeObjConverter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.input_path = os.path.join(self.tmp.name, "model.obj")
+        with open(self.input_path, "w", encoding="utf-8") as f:
+            f.write(OBJ)
+        with open(os.path.join(self.tmp.name, "model.mtl"), "w") as f:
+            f.write(MTL)
+        with open(os.path.join(self.tmp.name, "tex.png"), "wb") as f:
+            f.write(b"\x89PNG\r\n\x1a\n")
+
+    def test_convert_binary(self):
+        output_path = os.path.join(self.tmp.name, "model.glb")
+
+        result = NativeObjConverter().convert(self.input_path, output_path)
+
+        self.assertEqual(result, output_path)
+        gltf = read_glb_json(output_path)
+        primitives = gltf["meshes"][0]["primitives"]
+        self.assertEqual(len(primitives), 2)
+        self.assertEqual(
+            set(primitives[0]["attributes"]), {"POSITION", "NORMAL", "TEXCOORD_0"}
+        )
+        red = gltf["materials"][primitives[0]["material"]]
+        self.assertEqual(red["alphaMode"], "BLEND")
+        self.assertEqual(red["pbrMetallicRoughness"]["baseColorTexture"], {"index": 0})
+        self.assertEqual(gltf["images"], [{"bufferView": 0, "mimeType": "image/png"}])
+        # MTL に無いマテリアルにも既定マテリアルが割り当てられる
+        self.assertLess(primitives[1]["material"], len(gltf["materials"]))
+
+    def test_textures_are_stored_in_bin_chunk_once(self):
+        # 同じ内容の画像を別名・複数マテリアルから参照しても 1 つにまとめる
+        with open(os.path.join(self.tmp.name, "model.mtl"), "a") as f:
+            f.write("newmtl Blue\nKd 0 0 1\nmap_Kd copy.png\n")
+            f.write("newmtl Green\nKd 0 1 0\nmap_Kd tex.png\n")
+        with open(os.path.join(self.tmp.name, "copy.png"), "wb") as f:
+            f.write(b"\x89PNG\r\n\x1a\n")
+        output_path = os.path.join(self.tmp.name, "model.glb")
+
+        NativeObjConverter().convert(self.input_path, output_path)
+
+        gltf, binary = read_glb(output_path)
+        self.assertEqual(len(gltf["images"]), 1)
+        self.assertEqual(len(gltf["textures"]), 1)
+        textures = [
+            material["pbrMetallicRoughness"].get("baseColorTexture")
+            for material in gltf["materials"][:3]
+        ]
+        self.assertEqual(textures, [{"index": 0}] * 3)
+        view = gltf["bufferViews"][gltf["images"][0]["bufferView"]]
+        self.assertNotIn("target", view)
+        start = view.get("byteOffset", 0)
+        self.assertEqual(
+            binary[start : start + view["byteLength"]], b"\x89PNG\r\n\x1a\n"
+        )
+
+    def test_convert_gltf(self):
+        output_path = os.path.join(self.tmp.name, "model.gltf")
+
+        NativeObjConverter().convert(self.input_path, output_path, binary=False)
+
+        with open(output_path, encoding="utf-8") as f:
+            gltf = json.load(f)
+        self.assertTrue(
+            gltf["buffers"][0]["uri"].startswith("data:application/octet-stream")
+        )
+
+    def test_convert_stream_matches_file_conversion(self):
+        output_path = os.path.join(self.tmp.name, "model.glb")
+        NativeObjConverter().convert(self.input_path, output_path)
+        objects = {}
+        for name in ("model.mtl", "tex.png"):
+            with open(os.path.join(self.tmp.name, name), "rb") as f:
+                objects[f"user/asset/{name}"] = f.read()
+
+        @contextmanager
+        def opener(name: str):
+            if name not in objects:
+                raise FileNotFoundError(name)
+            yield io.BytesIO(objects[name])
+
+        sink = io.BytesIO()
+        with open(self.input_path, "rb") as source:
+            lods = NativeObjConverter().convert_stream(
+                source, sink, "user/asset", opener
+            )
+
+        with open(output_path, "rb") as f:
+            self.assertEqual(sink.getvalue(), f.read())
+        # LOD を生成しない場合は空
+        self.assertEqual(lods, [])
+
+    def test_lod_outputs(self):
+        # 平面グリッド（800 三角形）を 1/2・1/4 に簡略化して model.lodN.glb に出力する
+        side = 20
+        lines = [f"v {x} {y} 0" for y in range(side + 1) for x in range(side + 1)]
+        for y in range(side):
+            for x in range(side):
+                a = y * (side + 1) + x + 1
+                lines.append(f"f {a} {a + 1} {a + side + 2}")
+                lines.append(f"f {a} {a + side + 2} {a + side + 1}")
+        grid_path = os.path.join(self.tmp.name, "grid.obj")
+        with open(grid_path, "w") as f:
+            f.write("\n".join(lines))
+        converter = NativeObjConverter(lod_ratios=[0.25, 0.5])
+
+        output_path = os.path.join(self.tmp.name, "grid.glb")
+        converter.convert(grid_path, output_path)
+        lod2 = read_glb_json(lod_output_path(output_path, 2))
+        indices = lod2["meshes"][0]["primitives"][0]["indices"]
+        self.assertLessEqual(lod2["accessors"][indices]["count"], 200 * 3)
+
+        sinks: dict[int, io.BytesIO] = {}
+
+        @contextmanager
+        def open_lod(level: int):
+            sinks[level] = io.BytesIO()
+            yield sinks[level]
+
+        with open(grid_path, "rb") as source:
+            lods = converter.convert_stream(
+                source, io.BytesIO(), self.tmp.name, opener=None, open_lod=open_lod
+            )
+        self.assertEqual([lod["level"] for lod in lods], [0, 1, 2])
+        self.assertEqual(lods[0]["triangles"], 800)
+        self.assertEqual([lod["triangles"] for lod in lods[1:]], [400, 200])
+        self.assertEqual(set(sinks), {1, 2})
+        self.assertEqual(lod_output_path("a/model.glb", 1), "a/model.lod1.glb")
+
+        # 三角形数が上限を超える場合は LOD を省いて警告する
+        converter = NativeObjConverter(lod_ratios=[0.5], lod_max_triangles=799)
+        with open(grid_path, "rb") as source:
+            with self.assertLogs(
+                "src.infrastructure.converters.native_converter", "WARNING"
+            ):
+                lods = converter.convert_stream(
+                    source, io.BytesIO(), self.tmp.name, opener=None, open_lod=open_lod
+                )
+        self.assertEqual(lods, [])
+
+    def test_up_axis_and_scale_as_root_matrix(self):
+        plain_path = os.path.join(self.tmp.name, "plain.glb")
+        output_path = os.path.join(self.tmp.name, "model.glb")
+
+        NativeObjConverter(quantize=True).convert(self.input_path, plain_path)
+        NativeObjConverter(quantize=True, transform=model_matrix("Z", 0.001)).convert(
+            self.input_path, output_path
+        )
+        plain, plain_binary = read_glb(plain_path)
+        gltf, binary = read_glb(output_path)
+
+        # 頂点データ・accessor は変換しない
+        self.assertEqual(binary, plain_binary)
+        self.assertEqual(gltf["accessors"], plain["accessors"])
+        root, mesh_node = gltf["nodes"]
+        self.assertEqual(gltf["scenes"], [{"nodes": [0]}])
+        self.assertEqual(root["children"], [1])
+        self.assertEqual(mesh_node, plain["nodes"][0])
+        matrix = np.array(root["matrix"]).reshape(4, 4).T
+        np.testing.assert_allclose(matrix @ [0, 1, 0, 1], [0, 0, -0.001, 1])
+        # シーン全体の範囲は min/max の 8 隅だけを変換して求める
+        bounds = root["extras"]["bounds"]
+        np.testing.assert_allclose(bounds["min"], [0, 0, -0.001], atol=1e-7)
+        np.testing.assert_allclose(bounds["max"], [0.001, 0, 0], atol=1e-7)
+        self.assertIsNone(model_matrix("Y", 1.0))
+
+    def test_material_only_change_reuses_geometry(self):
+        cache = GeometryCache(os.path.join(self.tmp.name, "geometry"))
+        options = {"optimize": True, "lod_ratios": [0.5]}
+        output_path = os.path.join(self.tmp.name, "model.glb")
+        NativeObjConverter(geometry_cache=cache, **options).convert(
+            self.input_path, output_path
+        )
+
+        # MTL だけを変更した再変換では OBJ を解析しない
+        with open(os.path.join(self.tmp.name, "model.mtl"), "w") as f:
+            f.write(MTL.replace("Kd 1.0 0.0 0.0", "Kd 0.0 0.0 1.0"))
+        with patch(
+            "src.infrastructure.converters.native_converter.parse_obj",
+            side_effect=AssertionError("parsed"),
+        ):
+            NativeObjConverter(geometry_cache=cache, **options).convert(
+                self.input_path, output_path
+            )
+        expected_path = os.path.join(self.tmp.name, "expected.glb")
+        NativeObjConverter(**options).convert(self.input_path, expected_path)
+        for level in (0, 1):
+            with open(lod_output_path(output_path, level), "rb") as f:
+                actual = f.read()
+            with open(lod_output_path(expected_path, level), "rb") as f:
+                self.assertEqual(actual, f.read())
+        self.assertEqual(cache.stats()["hits"], 1)
+
+        # ストリーム変換では source_id（ETag 等）が同じなら source を読まない
+        # 初回も解析結果ではなく、保存した .mesh の memmap から GLB を組み立てる
+        converter = NativeObjConverter(geometry_cache=cache)
+        with open(self.input_path, "rb") as source, patch(
+            "src.infrastructure.converters.native_converter.build_gltf",
+            wraps=build_gltf,
+        ) as build:
+            converter.convert_stream(
+                source, io.BytesIO(), self.tmp.name, None, source_id="etag:1"
+            )
+        groups = build.call_args.args[0]
+        self.assertIsInstance(next(iter(groups.values()))["vertices"], np.memmap)
+        unread = io.BytesIO()
+        unread.read = lambda *args: self.fail("source was read")  # type: ignore
+        sink = io.BytesIO()
+        converter.convert_stream(unread, sink, self.tmp.name, None, source_id="etag:1")
+        self.assertTrue(sink.getvalue().startswith(b"glTF"))
+        self.assertEqual(cache.stats()["hits"], 2)
+
+    def test_convert_from_mesh_file(self):
+        # 解析済みの .mesh（memmap）から OBJ と同じ GLB を書き出す
+        load_mesh(self.input_path)
+        converter = NativeObjConverter(quantize=True)
+        expected_path = os.path.join(self.tmp.name, "expected.glb")
+        converter.convert(self.input_path, expected_path)
+        output_path = os.path.join(self.tmp.name, "model.glb")
+        with patch(
+            "src.infrastructure.converters.native_converter.parse_obj",
+            side_effect=AssertionError("parsed"),
+        ):
+            converter.convert(str(mesh_file_path(self.input_path)), output_path)
+
+        with open(expected_path, "rb") as a, open(output_path, "rb") as b:
+            self.assertEqual(a.read(), b.read())
+
+    def test_convert_failure(self):
+        with self.assertRaises(Exception) as context:
+            NativeObjConverter().convert(
+                os.path.join(self.tmp.name, "missing.obj"),
+                os.path.join(self.tmp.name, "out.glb"),
+            )
+
+        self.assertIn("native conversion failed", str(context.exception))
+
+    def test_factory_selects_backend(self):
+        self.assertIsInstance(create_converter("native"), NativeObjConverter)
+        self.assertIsInstance(create_converter("obj2gltf"), Obj2GltfConverter)
+        with self.assertRaises(ValueError):
+            create_converter("unknown")
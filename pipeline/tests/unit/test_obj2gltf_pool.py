@@ -0,0 +1,135 @@
+import os
+import sys
+import tempfile
+import textwrap
+import unittest
+from unittest.mock import MagicMock
+
+from src.infrastructure.converters.obj2gltf_converter import Obj2GltfConverter
+from src.infrastructure.converters.obj2gltf_pool import Obj2GltfWorkerPool
+
+# obj2gltf_worker.js と同じプロトコルを話す Python 製の擬似ワーカー
+FAKE_WORKER = textwrap.dedent("""
+    import json, os, shutil, sys, time
+
+    for line in sys.stdin:
+        job = json.loads(line)
+        if job["input"].endswith("crash.obj"):
+            sys.exit(1)
+        if job["input"].endswith("hang.obj"):
+            time.sleep(60)
+        rss = 10 * 1024 * 1024
+        if job["input"].endswith("huge.obj"):
+            rss = 4096 * 1024 * 1024
+        try:
+            shutil.copyfile(job["input"], job["output"])
+            reply = {"id": job["id"], "ok": True, "pid": os.getpid(), "rss": rss}
+        except OSError as e:
+            reply = {"id": job["id"], "ok": False, "error": str(e), "rss": rss}
+        print(json.dumps(reply), flush=True)
+    """)
+
+
+class TestObj2GltfWorkerPool(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        worker_path = os.path.join(self.tmp.name, "worker.py")
+        with open(worker_path, "w") as f:
+            f.write(FAKE_WORKER)
+        self.command = [sys.executable, worker_path]
+
+    def make_input(self, name: str) -> str:
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w") as f:
+            f.write("v 0 0 0\n")
+        return path
+
+    def make_pool(self, **kwargs) -> Obj2GltfWorkerPool:
+        pool = Obj2GltfWorkerPool(command=self.command, **kwargs)
+        self.addCleanup(pool.close)
+        return pool
+
+    def pids(self, pool: Obj2GltfWorkerPool) -> set[int]:
+        return {worker.process.pid for worker in pool._workers}
+
+    def test_reuses_worker_between_jobs(self):
+        pool = self.make_pool(size=1)
+        input_path = self.make_input("a.obj")
+
+        for i in range(3):
+            output_path = os.path.join(self.tmp.name, f"a{i}.glb")
+            self.assertEqual(pool.convert(input_path, output_path), output_path)
+            self.assertTrue(os.path.exists(output_path))
+
+        self.assertEqual(len(pool._workers), 1)
+        self.assertEqual(next(iter(pool._workers)).jobs, 3)
+
+    def test_restarts_after_max_jobs(self):
+        pool = self.make_pool(size=1, max_jobs_per_worker=2)
+        input_path = self.make_input("a.obj")
+        output_path = os.path.join(self.tmp.name, "a.glb")
+
+        pool.convert(input_path, output_path)
+        first = self.pids(pool)
+        pool.convert(input_path, output_path)
+        self.assertEqual(self.pids(pool), set())
+        pool.convert(input_path, output_path)
+        self.assertNotEqual(self.pids(pool), first)
+
+    def test_restarts_when_over_memory_limit(self):
+        pool = self.make_pool(size=1, max_worker_rss_mb=1024)
+        pool.convert(self.make_input("huge.obj"), os.path.join(self.tmp.name, "h"))
+        self.assertEqual(len(pool._workers), 0)
+
+    def test_crashed_worker_is_replaced(self):
+        pool = self.make_pool(size=1)
+        with self.assertRaises(Exception) as context:
+            pool.convert(self.make_input("crash.obj"), "out.glb")
+        self.assertIn("exited unexpectedly", str(context.exception))
+
+        output_path = os.path.join(self.tmp.name, "ok.glb")
+        self.assertEqual(
+            pool.convert(self.make_input("a.obj"), output_path), output_path
+        )
+
+    def test_hung_worker_is_killed_and_replaced(self):
+        pool = self.make_pool(size=1, job_timeout=0.5)
+        pool.convert(self.make_input("a.obj"), os.path.join(self.tmp.name, "a.glb"))
+        (hung,) = pool._workers
+
+        with self.assertRaises(TimeoutError):
+            pool.convert(self.make_input("hang.obj"), "out.glb")
+        self.assertFalse(hung.is_alive())
+        self.assertEqual(len(pool._workers), 0)
+
+        output_path = os.path.join(self.tmp.name, "ok.glb")
+        self.assertEqual(
+            pool.convert(self.make_input("a.obj"), output_path), output_path
+        )
+
+    def test_spawn_failure_releases_slot(self):
+        pool = Obj2GltfWorkerPool(1, command=[os.path.join(self.tmp.name, "none")])
+        self.addCleanup(pool.close)
+
+        # 枠が返らなければ 2 回目は起動を待ち続ける
+        for _ in range(2):
+            with self.assertRaises(OSError):
+                pool.convert(self.make_input("a.obj"), "out.glb")
+        self.assertEqual(pool._idle.qsize(), 1)
+
+    def test_job_error_is_reported(self):
+        pool = self.make_pool(size=1)
+        with self.assertRaises(Exception) as context:
+            pool.convert(os.path.join(self.tmp.name, "missing.obj"), "out.glb")
+        self.assertIn("obj2gltf failed", str(context.exception))
+        self.assertEqual(len(pool._workers), 1)
+
+    def test_converter_delegates_to_pool(self):
+        pool = MagicMock()
+        pool.convert.return_value = "out.glb"
+
+        result = Obj2GltfConverter(pool).convert("in.obj", "out.glb", binary=False)
+
+        self.assertEqual(result, "out.glb")
+        pool.convert.assert_called_once_with("in.obj", "out.glb", False)
@@ -0,0 +1,303 @@
+import os
+import struct
+import tempfile
+import unittest
+from collections import defaultdict
+
+import numpy as np
+
+from src.infrastructure.mesh.obj_parser import (
+    _dedupe_corners,
+    build_material_groups,
+    load_obj_data,
+    parse_obj,
+    parse_obj_parallel,
+)
+
+SAMPLE_MODELS = {
+    "cube": """# cube
+mtllib cube.mtl
+o Cube
+v 1.000000 1.000000 -1.000000
+v 1.000000 -1.000000 -1.000000
+v 1.000000 1.000000 1.000000
+v 1.000000 -1.000000 1.000000
+v -1.000000 1.000000 -1.000000
+v -1.000000 -1.000000 -1.000000
+v -1.000000 1.000000 1.000000
+v -1.000000 -1.000000 1.000000
+vt 0.625000 0.500000
+vt 0.875000 0.500000
+vt 0.875000 0.750000
+vt 0.625000 0.750000
+vn 0.0000 1.0000 0.0000
+vn 0.0000 0.0000 1.0000
+vn -1.0000 0.0000 0.0000
+usemtl Top
+f 1/1/1 5/2/1 7/3/1 3/4/1
+usemtl Side
+f 4/1/2 3/2/2 7/3/2 8/4/2
+f 8/1/3 7/2/3 5/3/3 6/4/3
+usemtl Top
+f 6/1/1 2/2/1 4/3/1 8/4/1
+""",
+    "mixed": """v 0.1 0.2 0.3
+v 1.5e-1 -2.25 3
+v 4 5 6 1.0
+v -7.125 8 9
+v 10 11 12
+\tvn 0 0 1
+vn 0 1 0
+f 1//1 2//1 3//1
+f 2//1 3//1 4//1 5//1
+usemtl Body
+f 2//2 3//2 4//2 5//2 1//2
+usemtl Plain
+f 1 2 3\r
+f 1 3 4 5
+usemtl Empty
+""",
+    "textured": """mtllib a b.mtl
+v 0 0 0
+v 1 0 0
+v 1 1 0
+v 0 1 0
+vt 0 0
+vt 1 0 0
+vt 1 1
+vt 0 1
+usemtl Mat_1
+f 1/1 2/2 3/3
+f 1/1 3/3 4/4
+usemtl Mat_2
+f 4/4 3/3 2/2 1/1""",
+}
+
+
+# 変更前の scripts/convert_obj_to_glb.py の実装（比較用）
+def legacy_load_obj_data(obj_file):
+    v, vt, vn = [], [], []
+    material_groups = defaultdict(
+        lambda: {
+            "vertices": [],
+            "normals": [],
+            "texcoords": [],
+            "indices": [],
+            "vertex_cache": {},
+        }
+    )
+    current_material = "default"
+
+    with open(obj_file, "r", encoding="utf-8") as file:
+        for line in file:
+            parts = line.strip().split()
+            if not parts:
+                continue
+
+            cmd = parts[0]
+            if cmd == "v":
+                v.append(tuple(map(float, parts[1:4])))
+            elif cmd == "vt":
+                u_coord, v_coord = map(float, parts[1:3])
+                vt.append((u_coord, 1.0 - v_coord))
+            elif cmd == "vn":
+                vn.append(tuple(map(float, parts[1:4])))
+            elif cmd == "usemtl":
+                current_material = parts[1]
+            elif cmd == "f":
+                group = material_groups[current_material]
+                vertex_cache = group["vertex_cache"]
+                face_indices = []
+
+                for part in parts[1:]:
+                    indices = [(int(i) if i else 0) for i in part.split("/")]
+                    key = tuple(indices)
+
+                    if key not in vertex_cache:
+                        v_idx = indices[0]
+                        vt_idx = indices[1] if len(indices) > 1 else 0
+                        vn_idx = indices[2] if len(indices) > 2 else 0
+
+                        group["vertices"].extend(v[v_idx - 1])
+                        if vt_idx > 0:
+                            group["texcoords"].extend(vt[vt_idx - 1])
+                        if vn_idx > 0:
+                            group["normals"].extend(vn[vn_idx - 1])
+
+                        vertex_idx = len(group["vertices"]) // 3 - 1
+                        vertex_cache[key] = vertex_idx
+                        face_indices.append(vertex_idx)
+                    else:
+                        face_indices.append(vertex_cache[key])
+
+                for i in range(1, len(face_indices) - 1):
+                    group["indices"].extend(
+                        [face_indices[0], face_indices[i], face_indices[i + 1]]
+                    )
+
+    for group in material_groups.values():
+        group.pop("vertex_cache", None)
+    return material_groups
+
+
+class TestObjParser(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def write_sample(self, name: str) -> str:
+        path = os.path.join(self.tmp.name, f"{name}.obj")
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            f.write(SAMPLE_MODELS[name])
+        return path
+
+    def test_matches_legacy_parser_byte_for_byte(self):
+        for name in SAMPLE_MODELS:
+            path = self.write_sample(name)
+            expected = legacy_load_obj_data(path)
+            for chunk_size in (7, 64, 1 << 20):
+                with self.subTest(model=name, chunk_size=chunk_size):
+                    actual = build_material_groups(
+                        parse_obj(path, chunk_size=chunk_size)
+                    )
+                    self.assertEqual(list(actual), list(expected))
+                    for mat, group in expected.items():
+                        got = actual[mat]
+                        for key, fmt in (
+                            ("vertices", "f"),
+                            ("normals", "f"),
+                            ("texcoords", "f"),
+                            ("indices", "I"),
+                        ):
+                            packed = struct.pack(
+                                f"<{len(group[key])}{fmt}", *group[key]
+                            )
+                            self.assertEqual(got[key].tobytes(), packed, key)
+
+    def test_arrays_are_typed_and_contiguous(self):
+        obj = parse_obj(self.write_sample("cube"))
+        self.assertEqual(obj.positions.shape, (8, 3))
+        self.assertEqual(obj.positions.dtype.name, "float32")
+        self.assertEqual(obj.corners.dtype.name, "int32")
+        self.assertTrue(obj.positions.flags["C_CONTIGUOUS"])
+        self.assertEqual(obj.face_sizes.tolist(), [4, 4, 4, 4])
+        self.assertEqual(obj.mtllibs, ["cube.mtl"])
+
+    def test_relative_indices(self):
+        path = os.path.join(self.tmp.name, "relative.obj")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("v 0 0 0\nv 1 0 0\nv 0 1 0\nf -3 -2 -1\nv 5 5 5\nf 1 -1 3\n")
+        obj = parse_obj(path, chunk_size=16)
+        self.assertEqual(obj.corners[:, 0].tolist(), [1, 2, 3, 1, 4, 3])
+
+        groups = load_obj_data(path)
+        self.assertEqual(groups["default"]["indices"].tolist(), [0, 1, 2, 0, 3, 2])
+
+    def test_dedupe_numbers_vertices_per_material_in_first_use_order(self):
+        corners = np.array(
+            [[5, 0, 1], [2, 0, 0], [5, 0, 1], [2, 0, 0], [7, 3, 0], [2, 0, 0]],
+            dtype=np.int32,
+        )
+        materials = np.array([1, 1, 0, 0, 1, 1], dtype=np.int32)
+        expected_local = [0, 1, 0, 1, 2, 1]
+
+        for scale in (1, 1 << 30):
+            # 大きなインデックスで int64 に詰められない場合も同じ結果になる
+            with self.subTest(scale=scale):
+                local, firsts = _dedupe_corners(
+                    corners.astype(np.int64) * scale, materials
+                )
+                self.assertEqual(local.tolist(), expected_local)
+                self.assertEqual(firsts[1].tolist(), [0, 1, 4])
+                self.assertEqual(firsts[0].tolist(), [2, 3])
+
+    def test_missing_normals_in_mixed_group_are_unit_z(self):
+        path = os.path.join(self.tmp.name, "mixed.obj")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("v 0 0 0\nv 1 0 0\nv 0 1 0\nvn 1 0 0\nf 1//1 2//1 3\n")
+
+        normals = load_obj_data(path)["default"]["normals"]
+
+        self.assertEqual(normals.tolist(), [[1, 0, 0], [1, 0, 0], [0, 0, 1]])
+        np.testing.assert_allclose(np.linalg.norm(normals, axis=1), 1.0)
+
+    def test_polygons_are_fan_triangulated_by_arity(self):
+        path = os.path.join(self.tmp.name, "ngons.obj")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("".join(f"v {i} {i * i} 0\n" for i in range(8)))
+            f.write("f 1 2 3 4 5\nf 1 2\nf 6 7 8\nf 2 3 4 5\n")
+
+        groups = load_obj_data(path)
+
+        self.assertEqual(
+            groups["default"]["indices"].reshape(-1, 3).tolist(),
+            [[0, 1, 2], [0, 2, 3], [0, 3, 4], [5, 6, 7], [1, 2, 3], [1, 3, 4]],
+        )
+
+    def test_ear_clipping_for_concave_polygons(self):
+        # 凹四角形（頂点 2 が内側に凹む）と、XZ 平面上の L 字六角形
+        path = os.path.join(self.tmp.name, "concave.obj")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("v 0 0 0\nv 2 1 0\nv 4 0 0\nv 2 4 0\n")
+            f.write("v 0 0 0\nv 0 0 -2\nv 1 0 -2\nv 1 0 -1\nv 2 0 -1\nv 2 0 0\n")
+            f.write("usemtl Dart\nf 1 2 3 4\nusemtl L\nf 5 10 9 8 7 6\n")
+        obj = parse_obj(path)
+
+        def signed_areas(group):
+            corners = group["vertices"][group["indices"].reshape(-1, 3)]
+            cross = np.cross(
+                corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0]
+            )
+            return cross @ np.float32([0, 0, 1]) / 2, cross @ np.float32([0, 1, 0]) / 2
+
+        fan = build_material_groups(obj)
+        self.assertTrue((signed_areas(fan["Dart"])[0] < 0).any())
+
+        clipped = build_material_groups(obj, ear_clipping=True)
+        dart = signed_areas(clipped["Dart"])[0]
+        self.assertTrue((dart > 0).all())
+        self.assertAlmostEqual(float(dart.sum()), 6.0)
+        floor = signed_areas(clipped["L"])[1]
+        self.assertEqual(len(floor), 4)
+        self.assertTrue((floor > 0).all())
+        self.assertAlmostEqual(float(floor.sum()), 3.0)
+
+    def test_malformed_record_raises(self):
+        path = os.path.join(self.tmp.name, "broken.obj")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("v 0 0\nf 1 1 1\n")
+        with self.assertRaises(ValueError):
+            parse_obj(path)
+
+    def test_parallel_parse_matches_sequential(self):
+        # 範囲の境界をまたぐ usemtl・負のインデックスが正しく引き継がれる
+        path = os.path.join(self.tmp.name, "parallel.obj")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("mtllib a.mtl\nusemtl A\n")
+            for i in range(60):
+                if i % 25 == 24:
+                    f.write(f"usemtl {'B' if i < 40 else 'A'}\n")
+                f.write(f"v {i} 0 0\nvt {i / 60} 0\nv {i} 1 0\nvn 0 0 1\n")
+                if i:
+                    f.write("f -4/-2/-2 -3/-2/-2 -1/-1/-1 -2/-1/-1\n")
+            f.write("f 1/1/1 2/1/1 3/2/2\n")
+        expected = parse_obj(path)
+
+        for workers in (2, 5):
+            with self.subTest(workers=workers):
+                actual = parse_obj_parallel(path, workers, chunk_size=64)
+                for name in (
+                    "positions",
+                    "texcoords",
+                    "normals",
+                    "corners",
+                    "face_sizes",
+                    "face_materials",
+                ):
+                    self.assertEqual(
+                        getattr(actual, name).tobytes(),
+                        getattr(expected, name).tobytes(),
+                        name,
+                    )
+                self.assertEqual(actual.material_names, expected.material_names)
+                self.assertEqual(actual.mtllibs, ["a.mtl"])
@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.infrastructure.mesh.obj_parser import parse_obj
+from src.infrastructure.mesh.obj_transform import (
+    FLIP_U,
+    rotation_matrix,
+    scale_matrix,
+    transform_obj,
+)
+
+OBJ = """mtllib model.mtl
+v 1 2 3
+v 4 5 6 0.5 0.5 0.5
+vt 0.25 0.5
+vt 0.75 0.125
+vt 0.1 0.2
+vn 0 1 0
+usemtl Screen
+f 1/1/1 2/2/1 1/-1/1
+usemtl Body
+f 1/2/1 2/2/1 2/2/1
+"""
+
+
+class TestTransformObj(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "model.obj")
+        with open(self.path, "w") as f:
+            f.write(OBJ)
+
+    def read(self) -> str:
+        with open(self.path) as f:
+            return f.read()
+
+    def test_matrix_applies_to_positions_and_normals(self):
+        # 小さいブロックで行をまたいでも結果は変わらない
+        for block_size in (16, 1 << 20):
+            with self.subTest(block_size=block_size):
+                self.setUp()
+                matrix = rotation_matrix("x", -90) @ scale_matrix([2, 1, 1])
+
+                stats = transform_obj(self.path, matrix=matrix, block_size=block_size)
+                obj = parse_obj(self.path)
+
+                self.assertEqual(stats["positions"], 2)
+                np.testing.assert_allclose(obj.positions, [[2, 3, -2], [8, 6, -5]])
+                np.testing.assert_allclose(obj.normals, [[0, 0, -1]])
+                self.assertIn("v 8 6 -5 0.5 0.5 0.5\n", self.read())
+                self.assertIn("mtllib model.mtl\nv 2 3 -2\n", self.read())
+
+    def test_uv_transform_only_for_material_texcoords(self):
+        stats = transform_obj(self.path, uv_transforms={"Screen": FLIP_U})
+
+        # vt 1・2（2 は Body からも参照）と相対指定の vt 3 が対象
+        self.assertEqual(stats["texcoords"], 3)
+        self.assertIn("vt 0.75 0.5\nvt 0.25 0.125\nvt 0.9 0.2\n", self.read())
+        self.assertIn("v 1 2 3\n", self.read())
+
+    def test_unchanged_lines_and_missing_newline_are_kept(self):
+        with open(self.path, "wb") as f:
+            f.write(b"# comment\r\no object\nv 1 0 0")
+
+        transform_obj(self.path, uv_transforms={"Other": FLIP_U})
+
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), b"# comment\r\no object\nv 1 0 0")
+
+    def test_backup_and_atomic_replace(self):
+        backup = self.path + ".bak"
+        output = os.path.join(os.path.dirname(self.path), "rotated.obj")
+
+        transform_obj(self.path, output, rotation_matrix("z", 90), backup_path=backup)
+
+        self.assertEqual(self.read(), OBJ)
+        with open(backup) as f:
+            self.assertEqual(f.read(), OBJ)
+        self.assertEqual(
+            sorted(os.listdir(os.path.dirname(self.path))),
+            ["model.obj", "model.obj.bak", "rotated.obj"],
+        )
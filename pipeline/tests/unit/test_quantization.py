@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.infrastructure.mesh.gltf_builder import build_gltf
+from src.infrastructure.mesh.quantization import (
+    PositionQuantization,
+    compact_indices,
+    quantize_normals,
+    texcoords_in_unit_range,
+    unorm16_texcoords,
+)
+
+
+def grid_group(side: int) -> dict[str, np.ndarray]:
+    ys, xs = np.mgrid[0 : side + 1, 0 : side + 1]
+    vertices = np.column_stack([xs.ravel(), ys.ravel(), np.zeros(xs.size)])
+    a = (np.arange(side)[:, None] * (side + 1) + np.arange(side)).ravel()
+    quads = np.column_stack([a, a + 1, a + side + 2, a, a + side + 2, a + side + 1])
+    return {
+        "vertices": (vertices * 0.01 + 100).astype(np.float32),
+        "normals": np.tile(np.array([0, 0, 1], dtype=np.float32), (len(vertices), 1)),
+        "texcoords": (vertices[:, :2] / side).astype(np.float32),
+        "indices": quads.ravel().astype(np.uint32),
+    }
+
+
+class TestQuantization(unittest.TestCase):
+    def test_compact_indices(self):
+        self.assertEqual(compact_indices(np.uint32([0, 254])).dtype, np.uint8)
+        self.assertEqual(compact_indices(np.uint32([0, 255])).dtype, np.uint16)
+        self.assertEqual(compact_indices(np.uint32([65534])).dtype, np.uint16)
+        self.assertEqual(compact_indices(np.uint32([65535])).dtype, np.uint32)
+
+    def test_positions_round_trip_through_node_transform(self):
+        positions = np.float32([[-1.5, 2, 10], [3, 2.25, 12], [0, 0, 11]])
+        quantization = PositionQuantization.fit([positions])
+
+        quantized = quantization.apply(positions)
+        restored = quantized[:, :3] * quantization.scale + quantization.translation
+
+        self.assertEqual(quantized.dtype, np.int16)
+        self.assertEqual(quantized.shape, (3, 4))
+        np.testing.assert_allclose(restored, positions, atol=quantization.scale)
+
+    def test_normals_and_texcoords(self):
+        normals = quantize_normals(np.float32([[0, 0, 1], [0, -1, 0]]))
+        self.assertEqual(normals[:, :3].tolist(), [[0, 0, 127], [0, -127, 0]])
+        texcoords = np.float32([[0, 1], [0.5, 0.25]])
+        self.assertTrue(texcoords_in_unit_range(texcoords))
+        self.assertEqual(
+            unorm16_texcoords(texcoords).tolist(), [[0, 65535], [32768, 16384]]
+        )
+        self.assertFalse(texcoords_in_unit_range(np.float32([[0, 2]])))
+
+    def test_quantized_gltf_is_smaller(self):
+        groups = {"default": grid_group(100)}
+        quantized = build_gltf(groups, {}, quantize=True)
+        plain = build_gltf(groups, {})
+
+        gltf = quantized.gltf
+        self.assertEqual(gltf["extensionsRequired"], ["KHR_mesh_quantization"])
+        self.assertIn("scale", gltf["nodes"][0])
+        primitive = gltf["meshes"][0]["primitives"][0]
+        position = gltf["accessors"][primitive["attributes"]["POSITION"]]
+        self.assertEqual((position["componentType"], position["type"]), (5122, "VEC3"))
+        self.assertEqual(gltf["bufferViews"][position["bufferView"]]["byteStride"], 8)
+        normal = gltf["accessors"][primitive["attributes"]["NORMAL"]]
+        self.assertEqual((normal["componentType"], normal["normalized"]), (5120, True))
+        indices = gltf["accessors"][primitive["indices"]]
+        self.assertEqual(indices["componentType"], 5123)
+        self.assertLess(quantized.byte_length, plain.byte_length * 0.7)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "out.glb")
+            quantized.write(path)
+            self.assertEqual(os.path.getsize(path) % 4, 0)
@@ -0,0 +1,110 @@
+import unittest
+
+import numpy as np
+
+from src.infrastructure.mesh.simplifier import (
+    build_lods,
+    simplify_group,
+    triangle_count,
+)
+
+
+def uv_sphere(rings: int, segments: int) -> dict[str, np.ndarray]:
+    theta = np.linspace(0, np.pi, rings + 1)[1:-1]
+    phi = np.linspace(0, 2 * np.pi, segments, endpoint=False)
+    t, p = np.meshgrid(theta, phi, indexing="ij")
+    ring_points = np.column_stack(
+        [
+            (np.sin(t) * np.cos(p)).ravel(),
+            (np.sin(t) * np.sin(p)).ravel(),
+            np.cos(t).ravel(),
+        ]
+    )
+    vertices = np.vstack([[0, 0, 1], ring_points, [0, 0, -1]])
+    bottom = len(vertices) - 1
+
+    faces = []
+    for s in range(segments):
+        n = (s + 1) % segments
+        faces.append([0, 1 + s, 1 + n])
+        last = 1 + (rings - 2) * segments
+        faces.append([bottom, last + n, last + s])
+    for r in range(rings - 2):
+        for s in range(segments):
+            n = (s + 1) % segments
+            a, b = 1 + r * segments + s, 1 + r * segments + n
+            c, d = a + segments, b + segments
+            faces += [[a, c, d], [a, d, b]]
+    return {
+        "vertices": vertices.astype(np.float32),
+        "normals": vertices.astype(np.float32),
+        "texcoords": np.empty((0, 2), dtype=np.float32),
+        "indices": np.asarray(faces, dtype=np.uint32).ravel(),
+    }
+
+
+def signed_volume(group: dict[str, np.ndarray]) -> float:
+    corners = group["vertices"][group["indices"].reshape(-1, 3)].astype(np.float64)
+    return float(
+        np.einsum(
+            "ij,ij->i", corners[:, 0], np.cross(corners[:, 1], corners[:, 2])
+        ).sum()
+        / 6
+    )
+
+
+def face_normals(group: dict[str, np.ndarray]) -> np.ndarray:
+    corners = group["vertices"][group["indices"].reshape(-1, 3)].astype(np.float64)
+    return np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+
+
+class TestSimplifier(unittest.TestCase):
+    def test_lods_reach_target_triangle_counts(self):
+        sphere = uv_sphere(24, 48)
+        triangles = len(sphere["indices"]) // 3
+
+        lods = simplify_group(sphere, [0.5, 0.25, 0.1])
+
+        for lod, ratio in zip(lods, [0.5, 0.25, 0.1]):
+            count = len(lod["indices"]) // 3
+            self.assertLessEqual(count, int(triangles * ratio))
+            self.assertGreater(count, int(triangles * ratio) - 3)
+            # 形状（体積）と面の向きが保たれる
+            self.assertGreater(signed_volume(lod), 0.85 * signed_volume(sphere))
+            self.assertGreater(signed_volume(lod), 0)
+
+    def test_flat_grid_keeps_boundary_and_orientation(self):
+        side = 20
+        ys, xs = np.mgrid[0 : side + 1, 0 : side + 1]
+        a = (np.arange(side)[:, None] * (side + 1) + np.arange(side)).ravel()
+        grid = {
+            "vertices": np.column_stack(
+                [xs.ravel(), ys.ravel(), np.zeros(xs.size)]
+            ).astype(np.float32),
+            "indices": np.column_stack(
+                [a, a + 1, a + side + 2, a, a + side + 2, a + side + 1]
+            )
+            .ravel()
+            .astype(np.uint32),
+        }
+
+        (lod,) = simplify_group(grid, [0.05])
+
+        normals = face_normals(lod)
+        self.assertTrue((normals[:, 2] > 0).all())
+        # 平面のままなので面積（= 外形）は変わらない
+        self.assertAlmostEqual(normals[:, 2].sum() / 2, side * side, places=3)
+
+    def test_build_lods_drops_unused_vertices(self):
+        groups = {"A": uv_sphere(12, 24), "B": uv_sphere(8, 16)}
+
+        lods = build_lods(groups, [0.5, 0.25])
+
+        self.assertEqual(len(lods), 2)
+        self.assertGreater(triangle_count(groups), triangle_count(lods[0]))
+        self.assertGreater(triangle_count(lods[0]), triangle_count(lods[1]))
+        for level in lods:
+            for group in level.values():
+                used = np.unique(group["indices"])
+                self.assertEqual(len(used), len(group["vertices"]))
+                self.assertEqual(len(group["normals"]), len(group["vertices"]))
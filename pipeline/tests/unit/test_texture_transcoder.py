@@ -0,0 +1,135 @@
+import io
+import json
+import multiprocessing
+import os
+import struct
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import patch
+
+from PIL import Image
+
+from src.infrastructure.converters.native_converter import NativeObjConverter
+from src.infrastructure.mesh.texture_transcoder import (
+    EXT_TEXTURE_WEBP,
+    WEBP,
+    TextureOptions,
+    TextureTranscoder,
+    transcode_image,
+)
+
+OBJ = """mtllib model.mtl
+v 0 0 0
+v 1 0 0
+v 1 1 0
+vt 0 0
+vt 1 0
+vt 1 1
+usemtl Red
+f 1/1 2/2 3/3
+"""
+
+
+def read_glb_json(path: str) -> dict:
+    with open(path, "rb") as f:
+        data = f.read()
+    json_length = struct.unpack_from("<I", data, 12)[0]
+    return json.loads(data[20 : 20 + json_length])
+
+
+def png(width: int, height: int, color=(255, 0, 0)) -> bytes:
+    output = io.BytesIO()
+    Image.new("RGB", (width, height), color).save(output, "PNG")
+    return output.getvalue()
+
+
+def image_size(data: bytes) -> tuple[int, int]:
+    with Image.open(io.BytesIO(data)) as image:
+        return image.size
+
+
+class TestTranscodeImage(unittest.TestCase):
+    def test_resize_to_power_of_two_webp(self):
+        data, mime_type = transcode_image(
+            png(300, 200), "image/png", TextureOptions(max_size=128, format="webp")
+        )
+
+        self.assertEqual(mime_type, WEBP)
+        self.assertEqual(image_size(data), (128, 64))
+
+    def test_resize_keeps_original_format(self):
+        data, mime_type = transcode_image(
+            png(300, 200),
+            "image/png",
+            TextureOptions(max_size=100, power_of_two=False),
+        )
+
+        self.assertEqual(mime_type, "image/png")
+        self.assertEqual(image_size(data), (100, 67))
+
+    def test_small_texture_is_returned_unchanged(self):
+        source = png(64, 32)
+
+        result = transcode_image(source, "image/png", TextureOptions(max_size=128))
+
+        self.assertEqual(result, (source, "image/png"))
+
+    def test_ktx2_falls_back_to_webp_without_encoder(self):
+        with patch("shutil.which", return_value=None):
+            _, mime_type = transcode_image(
+                png(16, 16), "image/png", TextureOptions(format="ktx2")
+            )
+        self.assertEqual(mime_type, WEBP)
+
+
+class TestTextureTranscoder(unittest.TestCase):
+    def test_parallel_transcoding_in_process_pool(self):
+        pool = ProcessPoolExecutor(
+            max_workers=2, mp_context=multiprocessing.get_context("spawn")
+        )
+        self.addCleanup(pool.shutdown)
+        transcoder = TextureTranscoder(TextureOptions(max_size=32), pool)
+        images = [(str(i), png(64, 64, (i * 80, 0, 0)), "image/png") for i in range(3)]
+
+        results = transcoder.transcode_all(images)
+
+        self.assertEqual(
+            [image_size(results[str(i)][0]) for i in range(3)], [(32, 32)] * 3
+        )
+        # 変換済みの画像は再度プールへ送らない
+        with patch.object(pool, "submit") as submit:
+            transcoder.transcode_all(images)
+        submit.assert_not_called()
+
+    def test_invalid_image_is_embedded_as_is(self):
+        transcoder = TextureTranscoder(TextureOptions(format="webp"))
+
+        results = transcoder.transcode_all([("x", b"not an image", "image/png")])
+
+        self.assertEqual(results["x"], (b"not an image", "image/png"))
+
+    def test_converter_embeds_webp_textures(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            input_path = os.path.join(tmp, "model.obj")
+            with open(input_path, "w") as f:
+                f.write(OBJ)
+            with open(os.path.join(tmp, "model.mtl"), "w") as f:
+                f.write("newmtl Red\nKd 1 0 0\nmap_Kd tex.png\n")
+            with open(os.path.join(tmp, "tex.png"), "wb") as f:
+                f.write(png(100, 100))
+            output_path = os.path.join(tmp, "model.glb")
+
+            converter = NativeObjConverter(
+                quantize=True, texture_options=TextureOptions(format="webp")
+            )
+            converter.convert(input_path, output_path)
+            gltf = read_glb_json(output_path)
+
+        self.assertEqual(gltf["images"][0]["mimeType"], WEBP)
+        self.assertEqual(
+            gltf["textures"][0]["extensions"], {EXT_TEXTURE_WEBP: {"source": 0}}
+        )
+        self.assertNotIn("source", gltf["textures"][0])
+        self.assertIn(EXT_TEXTURE_WEBP, gltf["extensionsRequired"])
+        self.assertIn("KHR_mesh_quantization", gltf["extensionsRequired"])
@@ -0,0 +1,252 @@
+#!/usr/bin/env python
+"""ディレクトリ・glob で指定した OBJ をまとめて GLB に変換する。
+
+モデル単位でプロセスプールに分散し、前回のマニフェストと同じオプションで
+変換済みかつ出力が最新のモデルは変換しない。
+結果（モデルごとの処理時間・サイズ）はマニフェスト JSON に書き出す。
+
+使い方:
+    python scripts/batch_convert.py frontend/public/obj -o frontend/public/glb
+    python scripts/batch_convert.py "catalogue/**/*.obj" -o out --workers 8 --quantize
+    python scripts/batch_convert.py cad_models -o out --up-axis Z --scale 0.001
+    python scripts/batch_convert.py frontend/public/obj -o out --geometry-cache .cache/geometry
+"""
+import argparse
+import glob
+import hashlib
+import json
+import mmap
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "pipeline"))
+from src.infrastructure.converters.native_converter import NativeObjConverter  # noqa: E402
+from src.infrastructure.mesh.mtl_parser import load_mtl_file  # noqa: E402
+from src.infrastructure.mesh.obj_transform import model_matrix  # noqa: E402
+from src.infrastructure.mesh.paths import lod_output_path  # noqa: E402
+from src.infrastructure.mesh.texture_transcoder import TextureOptions  # noqa: E402
+from src.infrastructure.monitoring.conversion_metrics import collect_metrics  # noqa: E402
+from src.infrastructure.storage.geometry_cache import GeometryCache  # noqa: E402
+
+
+# -- 設定 ------------------
+MANIFEST_NAME = "manifest.json"
+HASH_CHUNK_SIZE = 1 << 20
+MTLLIB_PATTERN = re.compile(rb"^[ \t]*mtllib[ \t]+(.+?)[ \t]*\r?$", re.MULTILINE)
+
+
+# -- 入力の収集 ------------------
+def find_obj_files(patterns):
+    files = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            files.update(Path(pattern).rglob("*.obj"))
+        else:
+            files.update(Path(path) for path in glob.glob(pattern, recursive=True) if path.lower().endswith(".obj"))
+    return sorted(path.resolve() for path in files)
+
+
+def source_files(obj_file):
+    # 出力に影響するファイル（OBJ・MTL・テクスチャ）
+    files = [obj_file]
+    obj_dir = obj_file.parent
+    if not obj_file.stat().st_size:
+        return files
+    with open(obj_file, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        mtllibs = [match.group(1).decode("utf-8", "replace") for match in MTLLIB_PATTERN.finditer(data)]
+    for mtllib in mtllibs:
+        mtl_file = obj_dir / mtllib
+        if not mtl_file.exists():
+            continue
+        files.append(mtl_file)
+        for props in load_mtl_file(mtl_file, obj_dir).values():
+            texture = props.get("texture_path")
+            if texture and os.path.exists(texture):
+                files.append(Path(texture))
+    return files
+
+
+def source_hash(files):
+    digest = hashlib.sha256()
+    for path in files:
+        digest.update(str(path.name).encode("utf-8"))
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def output_files(output_file, lod_count):
+    return [Path(lod_output_path(str(output_file), level)) for level in range(lod_count + 1)]
+
+
+# -- 最新かどうかの判定 ------------------
+def is_up_to_date(obj_file, output_file, options, previous):
+    # 前回のマニフェストに同じ変換オプションでの変換記録があり、出力が全て揃っていて、
+    # 入力より新しいか、前回と入力の内容が同じなら最新とみなす
+    # （記録が無い出力はどのオプションで作られたか分からないため変換し直す）
+    if previous is None or previous["options"] != options:
+        return False
+    entry = previous["models"].get(str(obj_file))
+    if entry is None or entry.get("status") == "failed":
+        return False
+    outputs = output_files(output_file, len(options["lod_ratios"]))
+    if not all(path.exists() for path in outputs):
+        return False
+    files = source_files(obj_file)
+    oldest_output = min(path.stat().st_mtime for path in outputs)
+    if all(path.stat().st_mtime <= oldest_output for path in files):
+        return True
+    return entry.get("source_hash") == source_hash(files)
+
+
+# -- 1 モデルの変換（ワーカープロセスで実行） ------------------
+def convert_one(obj_file, output_file, options, geometry_cache=None):
+    # geometry_cache: ジオメトリキャッシュのディレクトリ（MTL だけの変更では OBJ を解析しない）
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    converter = NativeObjConverter(
+        quantize=options["quantize"],
+        optimize=options["optimize"],
+        lod_ratios=options["lod_ratios"],
+        texture_options=TextureOptions(**options["textures"]),
+        ear_clipping=options["ear_clipping"],
+        transform=model_matrix(options["up_axis"], options["scale"]),
+        geometry_cache=GeometryCache(geometry_cache) if geometry_cache else None,
+    )
+    start = time.perf_counter()
+    with collect_metrics() as metrics:
+        converter.convert(str(obj_file), str(output_file))
+    seconds = time.perf_counter() - start
+    files = source_files(obj_file)
+    return {
+        "seconds": seconds,
+        "input_bytes": sum(path.stat().st_size for path in files),
+        "output_bytes": sum(path.stat().st_size for path in output_files(output_file, len(options["lod_ratios"]))),
+        "source_hash": source_hash(files),
+        "stages": {name: values["seconds"] for name, values in metrics.stages.items()},
+    }
+
+
+# -- マニフェスト ------------------
+def load_manifest(path):
+    if not path.exists():
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    manifest["models"] = {entry["source"]: entry for entry in manifest.get("models", [])}
+    return manifest
+
+
+def write_manifest(path, options, entries, seconds):
+    statuses = [entry["status"] for entry in entries]
+    manifest = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "options": options,
+        "summary": {
+            "models": len(entries),
+            "converted": statuses.count("converted"),
+            "skipped": statuses.count("skipped"),
+            "failed": statuses.count("failed"),
+            "seconds": seconds,
+        },
+        "models": sorted(entries, key=lambda entry: entry["source"]),
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", nargs="+", help="OBJ を含むディレクトリ、または glob パターン")
+    parser.add_argument("-o", "--output-dir", required=True, type=Path, help="GLB の出力先（入力の階層を保つ）")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="並列に変換するモデル数")
+    parser.add_argument("--manifest", type=Path, help=f"マニフェストの出力先（既定: 出力先/{MANIFEST_NAME}）")
+    parser.add_argument("--force", action="store_true", help="最新の出力も変換し直す")
+    parser.add_argument("--quantize", action="store_true", help="頂点属性を量子化（KHR_mesh_quantization）")
+    parser.add_argument("--optimize", action="store_true", help="頂点キャッシュ・overdraw 最適化")
+    parser.add_argument("--ear-clipping", action="store_true", help="凹多角形を耳刈り法で分割")
+    parser.add_argument("--lod", type=float, nargs="*", default=[], help="LOD の三角形数の倍率（例: 0.5 0.25）")
+    parser.add_argument("--up-axis", choices=["X", "Y", "Z"], default="Y", help="元データの上方向の軸（ルートノードの matrix で Y 軸上に向ける）")
+    parser.add_argument("--scale", type=float, default=1.0, help="単位の倍率（例: mm → m なら 0.001）")
+    parser.add_argument("--geometry-cache", type=Path, help="ジオメトリキャッシュの保存先（MTL・テクスチャだけの変更では OBJ を再解析しない）")
+    parser.add_argument("--texture-max-size", type=int, default=0, help="テクスチャの長辺の上限（0 で縮小しない）")
+    parser.add_argument("--texture-format", choices=["original", "webp", "ktx2"], default="original")
+    return parser.parse_args()
+
+
+# -- メイン処理 ------------------
+def main():
+    args = parse_args()
+    obj_files = find_obj_files(args.inputs)
+    if not obj_files:
+        print("エラー: OBJファイルが見つかりません")
+        sys.exit(1)
+
+    # 入力の共通の親ディレクトリからの相対パスで出力先に配置する
+    root = Path(os.path.commonpath([path.parent for path in obj_files]))
+    manifest_path = args.manifest or args.output_dir / MANIFEST_NAME
+    previous = load_manifest(manifest_path)
+    options = {
+        "quantize": args.quantize,
+        "optimize": args.optimize,
+        "ear_clipping": args.ear_clipping,
+        "lod_ratios": sorted(args.lod, reverse=True),
+        "up_axis": args.up_axis,
+        "scale": args.scale,
+        "textures": {"max_size": args.texture_max_size, "format": args.texture_format},
+    }
+
+    print(f"=== 一括変換開始: {len(obj_files)} モデル（並列数 {args.workers}） ===")
+    start_time = time.time()
+    entries = []
+    pending = []
+    for obj_file in obj_files:
+        output_file = args.output_dir / obj_file.relative_to(root).with_suffix(".glb")
+        entry = {"source": str(obj_file), "output": str(output_file)}
+        if not args.force and is_up_to_date(obj_file, output_file, options, previous):
+            # 前回の計測値を引き継ぐ
+            last = previous["models"][str(obj_file)]
+            entries.append({**last, **entry, "status": "skipped"})
+        else:
+            pending.append((obj_file, output_file, entry))
+    print(f"最新のためスキップ: {len(entries)} モデル / 変換対象: {len(pending)} モデル")
+
+    # 大きいモデルから投入し、最後に 1 つだけ長い変換が残らないようにする
+    pending.sort(key=lambda item: item[0].stat().st_size, reverse=True)
+    done = 0
+    with ProcessPoolExecutor(max_workers=max(args.workers, 1)) as pool:
+        futures = {pool.submit(convert_one, obj_file, output_file, options, args.geometry_cache): entry for obj_file, output_file, entry in pending}
+        for future in as_completed(futures):
+            entry = futures[future]
+            done += 1
+            try:
+                entries.append({**entry, "status": "converted", **future.result()})
+                message = f"{entries[-1]['seconds']:.2f}秒 {entries[-1]['output_bytes'] / 1024**2:.2f} MB"
+            except Exception as e:
+                entries.append({**entry, "status": "failed", "error": str(e)})
+                message = f"失敗: {e}"
+            elapsed = time.time() - start_time
+            remaining = elapsed / done * (len(pending) - done)
+            print(f"[{done}/{len(pending)}] {Path(entry['source']).name} {message}（残り約 {remaining:.0f}秒）", flush=True)
+
+    seconds = time.time() - start_time
+    write_manifest(manifest_path, options, entries, seconds)
+    failed = sum(entry["status"] == "failed" for entry in entries)
+    print(f"\n=== 一括変換完了（処理時間: {seconds:.2f}秒、失敗: {failed}） ===")
+    print(f"マニフェスト: {manifest_path}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,27 +3,22 @@
 
 import os
 import sys
-import json
-import struct
-import base64
 import time
 from pathlib import Path
-from collections import defaultdict
 
+import numpy as np
 
-# -- 画像をBase64データURIにエンコード ------------------
-def image_to_base64_uri(filepath):
-    try:
-        with open(filepath, "rb") as f:
-            encoded_string = base64.b64encode(f.read()).decode('ascii')
-            mime_type = "image/png" if str(filepath).lower().endswith(".png") else "image/jpeg"
-            return f"data:{mime_type};base64,{encoded_string}"
-    except FileNotFoundError:
-        print(f"  [警告] テクスチャファイルが見つかりません: {filepath}")
-        return None
-    except Exception as e:
-        print(f"  [エラー] テクスチャファイルの読み込み中にエラーが発生しました: {e}")
-        return None
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "pipeline"))
+from src.infrastructure.mesh.mesh_file import load_mesh  # noqa: E402
+from src.infrastructure.mesh.glb_writer import GlbWriter, ARRAY_BUFFER, ELEMENT_ARRAY_BUFFER  # noqa: E402
+from src.infrastructure.mesh.quantization import compact_indices  # noqa: E402
+from src.infrastructure.mesh.mesh_optimizer import optimize_material_groups  # noqa: E402
+from src.infrastructure.mesh.gltf_builder import DEFAULT_SAMPLER, TextureTable  # noqa: E402
+
+# True で頂点キャッシュ・overdraw・頂点フェッチ順に並べ替え（GPU 描画の高速化）
+OPTIMIZE_MESH = False
+# 解析結果（.mesh）の保存先。2 回目以降は OBJ を解析せずに開く
+MESH_CACHE_DIR = Path(".cache/mesh")
 
 
 # -- MTLファイル読込み ------------------
@@ -84,195 +79,53 @@ def load_mtl_file(mtl_file, obj_dir):
 # -- OBJファイル読込み ------------------
 def load_obj_data(obj_file):
     print(f"OBJファイル読込み開始: {obj_file}")
-    v, vt, vn = [], [], []
-    material_groups = defaultdict(lambda: {
-        'vertices': [], 'normals': [], 'texcoords': [], 'indices': [], 'vertex_cache': {}
-    })
-    current_material = "default"
-
-    with open(obj_file, 'r', encoding='utf-8') as file:
-        for line in file:
-            parts = line.strip().split()
-            if not parts: continue
-
-            cmd = parts[0]
-            if cmd == 'v':
-                v.append([float(parts[1]), float(parts[2]), float(parts[3])])
-            elif cmd == 'vt':
-                # GLTFではV座標が反転しているので、1.0 - v で反転
-                u = float(parts[1])
-                v_coord = float(parts[2])
-                vt.append([u, 1.0 - v_coord])
-            elif cmd == 'vn':
-                vn.append([float(parts[1]), float(parts[2]), float(parts[3])])
-            elif cmd == 'usemtl':
-                current_material = parts[1]
-            elif cmd == 'f':
-                group = material_groups[current_material]
-                face_vertices = []
-                for vert_str in parts[1:]:
-                    if vert_str in group['vertex_cache']:
-                        face_vertices.append(group['vertex_cache'][vert_str])
-                    else:
-                        v_idx, vt_idx, vn_idx = None, None, None
-                        idx_parts = vert_str.split('/')
-                        if len(idx_parts) >= 1 and idx_parts[0]:
-                            v_idx = int(idx_parts[0]) - 1
-                        if len(idx_parts) >= 2 and idx_parts[1]:
-                            vt_idx = int(idx_parts[1]) - 1
-                        if len(idx_parts) >= 3 and idx_parts[2]:
-                            vn_idx = int(idx_parts[2]) - 1
-
-                        if v_idx is not None and 0 <= v_idx < len(v):
-                            group['vertices'].extend(v[v_idx])
-                        else:
-                            group['vertices'].extend([0, 0, 0])
-
-                        if vn_idx is not None and 0 <= vn_idx < len(vn):
-                            group['normals'].extend(vn[vn_idx])
-                        else:
-                            group['normals'].extend([0, 0, 1])
-
-                        if vt_idx is not None and 0 <= vt_idx < len(vt):
-                            group['texcoords'].extend(vt[vt_idx])
-                        else:
-                            group['texcoords'].extend([0, 0])
+    material_groups = load_mesh(obj_file, cache_dir=MESH_CACHE_DIR).material_groups
 
-                        new_idx = len(group['vertex_cache'])
-                        group['vertex_cache'][vert_str] = new_idx
-                        face_vertices.append(new_idx)
+    for mat, group in material_groups.items():
+        vertex_count = len(group['vertices'])
+        # 法線・UVが無いグループは既定値で埋める（GLB側で常に出力するため）
+        if not group['normals'].size:
+            group['normals'] = np.tile(np.float32([0, 0, 1]), (vertex_count, 1))
+        if not group['texcoords'].size:
+            group['texcoords'] = np.zeros((vertex_count, 2), dtype=np.float32)
 
-                # 三角形分割
-                for i in range(1, len(face_vertices) - 1):
-                    group['indices'].extend([face_vertices[0], face_vertices[i], face_vertices[i+1]])
+    if OPTIMIZE_MESH:
+        material_groups, report = optimize_material_groups(material_groups)
+        print(f"頂点キャッシュ最適化: ACMR {report['acmr_before']:.3f} → {report['acmr_after']:.3f}")
 
     print(f"OBJ読込み完了: {len(material_groups)} マテリアルグループ")
     for mat, group in material_groups.items():
-        vertex_count = len(group['vertices']) // 3
+        vertex_count = len(group['vertices'])
         face_count = len(group['indices']) // 3
         print(f"  {mat}: {vertex_count} vertices, {face_count} faces")
-    
+
     return material_groups
 
 
 # -- GLBファイル生成 ------------------
-def create_glb_file(material_groups, mtl_data, output_glb_file, obj_dir):
+def create_glb_file(material_groups, mtl_data, output_glb_file):
     print(f"\nGLBファイル生成開始: {output_glb_file}")
     
-    binary_data = bytearray()
-    buffer_views = []
-    accessors = []
+    gltf = {
+        "asset": {"version": "2.0", "generator": "Custom OBJ to GLB Converter"},
+        "scene": 0,
+    }
+    writer = GlbWriter(gltf)
+    # テクスチャは BIN チャンクに格納し、同じ画像は 1 回だけ埋め込む
+    texture_table = TextureTable(writer)
     meshes = []
-    textures = []
-    images = []
     materials_gltf = []
     
-    texture_map = {}
-    
     # 各マテリアルグループを処理
     for mat_name, group in material_groups.items():
-        if not group['indices']:
+        if not group['indices'].size:
             continue
         
-        # 頂点データをバイナリに追加
-        vertices_bytes = struct.pack(f'{len(group["vertices"])}f', *group['vertices'])
-        vertex_offset = len(binary_data)
-        binary_data.extend(vertices_bytes)
-        vertex_byte_length = len(vertices_bytes)
-        
-        # 法線データ
-        normals_bytes = struct.pack(f'{len(group["normals"])}f', *group['normals'])
-        normal_offset = len(binary_data)
-        binary_data.extend(normals_bytes)
-        normal_byte_length = len(normals_bytes)
-        
-        # テクスチャ座標
-        texcoords_bytes = struct.pack(f'{len(group["texcoords"])}f', *group['texcoords'])
-        texcoord_offset = len(binary_data)
-        binary_data.extend(texcoords_bytes)
-        texcoord_byte_length = len(texcoords_bytes)
-        
-        # インデックスデータ（unsigned intを使用）
-        indices_bytes = struct.pack(f'{len(group["indices"])}I', *group['indices'])
-        index_offset = len(binary_data)
-        binary_data.extend(indices_bytes)
-        index_byte_length = len(indices_bytes)
-        
-        # BufferView作成
-        vertex_buffer_view_idx = len(buffer_views)
-        buffer_views.append({
-            "buffer": 0,
-            "byteOffset": vertex_offset,
-            "byteLength": vertex_byte_length,
-            "target": 34962
-        })
-        
-        normal_buffer_view_idx = len(buffer_views)
-        buffer_views.append({
-            "buffer": 0,
-            "byteOffset": normal_offset,
-            "byteLength": normal_byte_length,
-            "target": 34962
-        })
-        
-        texcoord_buffer_view_idx = len(buffer_views)
-        buffer_views.append({
-            "buffer": 0,
-            "byteOffset": texcoord_offset,
-            "byteLength": texcoord_byte_length,
-            "target": 34962
-        })
-        
-        index_buffer_view_idx = len(buffer_views)
-        buffer_views.append({
-            "buffer": 0,
-            "byteOffset": index_offset,
-            "byteLength": index_byte_length,
-            "target": 34963
-        })
-        
-        # Accessor作成
-        vertex_count = len(group['vertices']) // 3
-        
-        # 頂点座標のmin/max計算
-        vertices_list = group['vertices']
-        x_coords = [vertices_list[i] for i in range(0, len(vertices_list), 3)]
-        y_coords = [vertices_list[i+1] for i in range(0, len(vertices_list), 3)]
-        z_coords = [vertices_list[i+2] for i in range(0, len(vertices_list), 3)]
-        
-        vertex_accessor_idx = len(accessors)
-        accessors.append({
-            "bufferView": vertex_buffer_view_idx,
-            "componentType": 5126,
-            "count": vertex_count,
-            "type": "VEC3",
-            "max": [max(x_coords), max(y_coords), max(z_coords)],
-            "min": [min(x_coords), min(y_coords), min(z_coords)]
-        })
-        
-        normal_accessor_idx = len(accessors)
-        accessors.append({
-            "bufferView": normal_buffer_view_idx,
-            "componentType": 5126,
-            "count": vertex_count,
-            "type": "VEC3"
-        })
-        
-        texcoord_accessor_idx = len(accessors)
-        accessors.append({
-            "bufferView": texcoord_buffer_view_idx,
-            "componentType": 5126,
-            "count": vertex_count,
-            "type": "VEC2"
-        })
-        
-        index_accessor_idx = len(accessors)
-        accessors.append({
-            "bufferView": index_buffer_view_idx,
-            "componentType": 5125,  # UNSIGNED_INT
-            "count": len(group['indices']),
-            "type": "SCALAR"
-        })
+        # 頂点・法線・テクスチャ座標・インデックス（頂点数に応じて uint8/16/32）をバッファに追加
+        vertex_accessor_idx = writer.add_accessor(group['vertices'], ARRAY_BUFFER, bounds=True)
+        normal_accessor_idx = writer.add_accessor(group['normals'], ARRAY_BUFFER)
+        texcoord_accessor_idx = writer.add_accessor(group['texcoords'], ARRAY_BUFFER)
+        index_accessor_idx = writer.add_accessor(compact_indices(group['indices']), ELEMENT_ARRAY_BUFFER)
         
         # マテリアル処理
         material_idx = len(materials_gltf)
@@ -292,18 +145,11 @@ def create_glb_file(material_groups, mtl_data, output_glb_file, obj_dir):
         
         # テクスチャ処理
         if 'texture_path' in mat_def:
-            texture_path = mat_def['texture_path']
-            if texture_path not in texture_map:
-                data_uri = image_to_base64_uri(texture_path)
-                if data_uri:
-                    image_idx = len(images)
-                    images.append({"uri": data_uri})
-                    texture_idx = len(textures)
-                    textures.append({"source": image_idx})
-                    texture_map[texture_path] = texture_idx
-                    gltf_material['pbrMetallicRoughness']['baseColorTexture'] = {"index": texture_idx}
+            texture_idx = texture_table.texture_for(mat_def['texture_path'])
+            if texture_idx is not None:
+                gltf_material['pbrMetallicRoughness']['baseColorTexture'] = {"index": texture_idx}
             else:
-                gltf_material['pbrMetallicRoughness']['baseColorTexture'] = {"index": texture_map[texture_path]}
+                print(f"  [警告] テクスチャファイルを読み込めません: {mat_def['texture_path']}")
         
         materials_gltf.append(gltf_material)
         
@@ -321,49 +167,17 @@ def create_glb_file(material_groups, mtl_data, output_glb_file, obj_dir):
         meshes.append({"primitives": [primitive]})
     
     # glTF JSONの組み立て
-    gltf = {
-        "asset": {"version": "2.0", "generator": "Custom OBJ to GLB Converter"},
-        "scene": 0,
-        "scenes": [{"nodes": list(range(len(meshes)))}],
-        "nodes": [{"mesh": i} for i in range(len(meshes))],
-        "meshes": meshes,
-        "accessors": accessors,
-        "bufferViews": buffer_views,
-        "buffers": [{"byteLength": len(binary_data)}]
-    }
+    gltf["scenes"] = [{"nodes": list(range(len(meshes)))}]
+    gltf["nodes"] = [{"mesh": i} for i in range(len(meshes))]
+    gltf["meshes"] = meshes
     
     if materials_gltf:
         gltf["materials"] = materials_gltf
-    if textures:
-        gltf["textures"] = textures
-    if images:
-        gltf["images"] = images
+    if "textures" in gltf:
+        gltf["samplers"] = [DEFAULT_SAMPLER.copy()]
     
     # GLBファイル書き込み
-    json_data = json.dumps(gltf, separators=(',', ':'))
-    json_bytes = json_data.encode('utf-8')
-    json_padding = (4 - len(json_bytes) % 4) % 4
-    json_bytes += b' ' * json_padding
-    
-    binary_padding = (4 - len(binary_data) % 4) % 4
-    binary_data.extend(b'\x00' * binary_padding)
-    
-    with open(output_glb_file, 'wb') as f:
-        # GLBヘッダー
-        f.write(struct.pack('<I', 0x46546C67))  # magic: 'glTF'
-        f.write(struct.pack('<I', 2))            # version
-        total_length = 12 + 8 + len(json_bytes) + 8 + len(binary_data)
-        f.write(struct.pack('<I', total_length))
-        
-        # JSONチャンク
-        f.write(struct.pack('<I', len(json_bytes)))
-        f.write(struct.pack('<I', 0x4E4F534A))  # 'JSON'
-        f.write(json_bytes)
-        
-        # バイナリチャンク
-        f.write(struct.pack('<I', len(binary_data)))
-        f.write(struct.pack('<I', 0x004E4942))  # 'BIN\0'
-        f.write(binary_data)
+    writer.write(output_glb_file)
     
     print(f"GLB生成完了: {output_glb_file}")
 
@@ -398,7 +212,7 @@ def convert_model(obj_dir_name, obj_filename):
     
     material_groups = load_obj_data(obj_file)
     mtl_data = load_mtl_file(mtl_file, obj_dir) if mtl_file else {}
-    create_glb_file(material_groups, mtl_data, output_file, obj_dir)
+    create_glb_file(material_groups, mtl_data, output_file)
     
     end_time = time.time()
     print(f"\n変換完了（処理時間: {end_time - start_time:.2f}秒）")
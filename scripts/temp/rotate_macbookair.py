@@ -1,60 +1,28 @@
 #!/usr/bin/env python3
 # MacBookAir 13inchのOBJファイルを90度回転させるスクリプト
 
-import os
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "pipeline"))
+from src.infrastructure.mesh.obj_transform import rotation_matrix, transform_obj  # noqa: E402
 
-# 回転関数（X軸周りに-90度回転）
-def rotate_x_90(x, y, z):
-    """X軸周りに-90度回転"""
-    return (x, z, -y)
 
-
-def rotate_normal_x_90(nx, ny, nz):
-    """法線ベクトルもX軸周りに-90度回転"""
-    return (nx, nz, -ny)
-
-
-# OBJファイルを回転させて上書き
+# OBJファイルを回転させて上書き（X軸周りに-90度回転、法線も同じく回転）
 def rotate_obj_file(obj_file):
     print(f"OBJファイル読込み: {obj_file}")
 
-    output_lines = []
-
-    with open(obj_file, 'r', encoding='utf-8') as f:
-        for line in f:
-            parts = line.strip().split()
-            if not parts:
-                output_lines.append(line)
-                continue
-
-            cmd = parts[0]
-
-            if cmd == 'v':
-                x, y, z = map(float, parts[1:4])
-                rx, ry, rz = rotate_x_90(x, y, z)
-                output_lines.append(f"v {rx} {ry} {rz}\n")
-
-            elif cmd == 'vn':
-                nx, ny, nz = map(float, parts[1:4])
-                rnx, rny, rnz = rotate_normal_x_90(nx, ny, nz)
-                output_lines.append(f"vn {rnx} {rny} {rnz}\n")
-
-            else:
-                output_lines.append(line)
-
-    # バックアップを作成
+    # バックアップは初回のみ作成（既にある場合は元のファイルを残す）
     backup_file = obj_file.with_suffix('.obj.bak')
     if not backup_file.exists():
         print(f"バックアップ作成: {backup_file}")
-        os.rename(obj_file, backup_file)
-
-    # 回転後のファイルを書き込み
-    with open(obj_file, 'w', encoding='utf-8') as f:
-        f.writelines(output_lines)
+    stats = transform_obj(
+        obj_file,
+        matrix=rotation_matrix('x', -90),
+        backup_path=None if backup_file.exists() else backup_file,
+    )
 
-    print(f"回転完了: {obj_file}")
+    print(f"回転完了: {obj_file}（頂点 {stats['positions']}、法線 {stats['normals']}）")
     print(f"バックアップ: {backup_file}")
 
 
@@ -51,7 +51,8 @@ export class ConversionController {
         },
         targetFormat: {
           type: 'string',
-          enum: ['glb', 'gltf'],
+          // パイプラインが出力できるのは GLB のみ
+          enum: ['glb'],
           default: 'glb',
         },
       },
@@ -68,10 +69,8 @@ export class ConversionController {
     file: Express.Multer.File,
     @Body('targetFormat') targetFormat: string = 'glb',
   ) {
-    if (targetFormat !== 'glb' && targetFormat !== 'gltf') {
-      throw new BadRequestException(
-        'Invalid target format. Must be glb or gltf',
-      );
+    if (targetFormat !== 'glb') {
+      throw new BadRequestException('Invalid target format. Must be glb');
     }
 
     // 1. Upload Asset (Skip Auto Conversion)
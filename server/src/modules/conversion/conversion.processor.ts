@@ -19,6 +19,15 @@ interface PipelineResponse {
   size?: number;
 }
 
+interface PipelineJobResponse {
+  job_id: string;
+  status: 'queued' | 'running' | 'completed' | 'failed';
+  progress: number;
+  converted_path: string | null;
+  format: string;
+  error: string | null;
+}
+
 @Processor('conversion')
 export class ConversionProcessor extends WorkerHost {
   private readonly logger = new Logger(ConversionProcessor.name);
@@ -49,22 +58,12 @@ export class ConversionProcessor extends WorkerHost {
         'http://pipeline:8000',
       );
 
-      const endpoint =
-        outputFormat === 'gltf'
-          ? '/conversion/obj2gltf'
-          : '/conversion/obj2glb';
-
-      this.logger.debug(`Calling pipeline at ${pipelineUrl}${endpoint}`);
-
-      // Call Pipeline
-      const response = await firstValueFrom(
-        this.httpService.post<PipelineResponse>(`${pipelineUrl}${endpoint}`, {
-          storage_path: storagePath,
-          output_format: outputFormat,
-        }),
-      );
-
-      const result = response.data;
+      // 変換の完了まで HTTP 接続を保持しないよう、ジョブ投入後にポーリングする
+      this.logger.debug(`Submitting pipeline job to ${pipelineUrl}`);
+      const result = await this.runPipelineJob(pipelineUrl, job, {
+        storage_path: storagePath,
+        output_format: outputFormat,
+      });
       this.logger.log(`Conversion successful: ${JSON.stringify(result)}`);
 
       const convertedFileName = result.converted_path.split('/').pop();
@@ -120,4 +119,43 @@ export class ConversionProcessor extends WorkerHost {
       throw error;
     }
   }
+
+  private async runPipelineJob(
+    pipelineUrl: string,
+    job: Job<ConversionJobData>,
+    payload: { storage_path: string; output_format: string },
+  ): Promise<PipelineResponse> {
+    const pollInterval = Number(
+      this.configService.get('PIPELINE_POLL_INTERVAL_MS', 2000),
+    );
+    const timeout = Number(
+      this.configService.get('PIPELINE_JOB_TIMEOUT_MS', 30 * 60 * 1000),
+    );
+
+    const submitted = await firstValueFrom(
+      this.httpService.post<PipelineJobResponse>(
+        `${pipelineUrl}/conversion/jobs`,
+        payload,
+      ),
+    );
+    const jobId = submitted.data.job_id;
+    const deadline = Date.now() + timeout;
+
+    while (Date.now() < deadline) {
+      const { data } = await firstValueFrom(
+        this.httpService.get<PipelineJobResponse>(
+          `${pipelineUrl}/conversion/jobs/${jobId}`,
+        ),
+      );
+      if (data.status === 'completed' && data.converted_path) {
+        return { converted_path: data.converted_path, format: data.format };
+      }
+      if (data.status === 'failed') {
+        throw new Error(data.error ?? `Pipeline job ${jobId} failed`);
+      }
+      await job.updateProgress(Math.round(data.progress * 100));
+      await new Promise((resolve) => setTimeout(resolve, pollInterval));
+    }
+    throw new Error(`Pipeline job ${jobId} timed out`);
+  }
 }